@@ -4,6 +4,12 @@ import matplotlib.font_manager as fm
 import importlib.resources as resources
 from . import bond
 from . import stock
+from . import batch
+from . import backfill
+from . import sink
+from . import warmup
+from .website.comm import tracing
+from .sink import export
 
 os = platform.system()
 
@@ -22,8 +28,14 @@ else:
 plt.rcParams['axes.unicode_minus'] = False
 
 __all__ = [
+    'backfill',
+    'batch',
     'bond',
-    'stock'
+    'export',
+    'sink',
+    'stock',
+    'tracing',
+    'warmup'
 ]
 
 __version__ = '1.0.51.1'
@@ -0,0 +1,136 @@
+"""pykrx 명령행 도구
+
+    $ python -m pykrx warmup --datasets ohlcv,cap --cache ~/.cache/pykrx/responses.sqlite
+    $ python -m pykrx cache stats
+    $ python -m pykrx cache list --dataset 전종목시세 --from 20240101
+    $ python -m pykrx cache invalidate --dataset MDCSTAT01501 --stored-after "2024-01-05 09:00"
+"""
+import argparse
+import json
+import sys
+
+
+def _split(value: str) -> list:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _warmup(args) -> int:
+    from pykrx import warmup
+
+    summary = warmup.run(
+        _split(args.datasets) if args.datasets else None,
+        args.date,
+        markets=_split(args.markets),
+        cache=args.cache,
+        max_workers=args.workers,
+        rate=args.rate,
+        timeout=args.timeout,
+    )
+    print(json.dumps(summary, ensure_ascii=False, indent=2, default=str))
+    return 1 if summary["failed"] else 0
+
+
+def _open_cache(path):
+    import os
+
+    from pykrx.website.krx.cache import KrxResponseCache
+
+    return KrxResponseCache(path or os.getenv("PYKRX_RESPONSE_CACHE"))
+
+
+def _filters(args) -> dict:
+    params = dict(p.split("=", 1) for p in args.param or [])
+    return dict(dataset=args.dataset, fromdate=args.fromdate,
+                todate=args.todate, ticker=args.ticker, params=params or None,
+                stored_after=args.stored_after,
+                stored_before=args.stored_before)
+
+
+def _cache_stats(args) -> int:
+    cache = _open_cache(args.cache)
+    stats = cache.stats()
+    for name in ("hits", "misses", "stores", "hit_ratio"):
+        # 이 명령의 프로세스에서 센 값은 의미가 없다
+        stats.pop(name)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    df = cache.endpoint_stats()
+    if not df.empty:
+        print(df.to_string())
+    return 0
+
+
+def _cache_list(args) -> int:
+    df = _open_cache(args.cache).list_entries(**_filters(args), limit=args.limit)
+    print(df.drop(columns=["key", "digest"]).to_string())
+    return 0
+
+
+def _cache_invalidate(args) -> int:
+    count = _open_cache(args.cache).invalidate(**_filters(args))
+    print(f"{count} entries removed")
+    return 0
+
+
+def _cache_clear(args) -> int:
+    _open_cache(args.cache).clear()
+    print("cache cleared")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="pykrx")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser(
+        "warmup", help="prefetch trading-day snapshots into the response cache")
+    p.add_argument("--datasets", default=None,
+                   help="comma separated datasets "
+                        "(ohlcv,cap,fundamental,shorting,investor,etf,index)")
+    p.add_argument("--date", default=None,
+                   help="YYYYMMDD (default: previous trading day)")
+    p.add_argument("--markets", default="KOSPI,KOSDAQ",
+                   help="comma separated markets (default: KOSPI,KOSDAQ)")
+    p.add_argument("--cache", default=None,
+                   help="response cache path (default: PYKRX_RESPONSE_CACHE "
+                        "or ~/.cache/pykrx/responses.sqlite)")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--rate", type=float, default=None,
+                   help="calls started per second")
+    p.add_argument("--timeout", type=float, default=None,
+                   help="per-call timeout in seconds")
+    p.set_defaults(func=_warmup)
+
+    p = commands.add_parser("cache", help="inspect or invalidate the response cache")
+    actions = p.add_subparsers(dest="action", required=True)
+    for name, func, help in (
+            ("stats", _cache_stats, "size, compression and per-endpoint hit ratio"),
+            ("list", _cache_list, "list cached responses"),
+            ("invalidate", _cache_invalidate, "remove matching responses"),
+            ("clear", _cache_clear, "remove every response")):
+        a = actions.add_parser(name, help=help)
+        a.add_argument("--cache", default=None,
+                       help="response cache path (default: PYKRX_RESPONSE_CACHE "
+                            "or ~/.cache/pykrx/responses.sqlite)")
+        if name in ("list", "invalidate"):
+            a.add_argument("--dataset", default=None,
+                           help="bld, bld suffix (MDCSTAT01501) or class name")
+            a.add_argument("--from", dest="fromdate", default=None,
+                           help="YYYYMMDD")
+            a.add_argument("--to", dest="todate", default=None, help="YYYYMMDD")
+            a.add_argument("--ticker", default=None)
+            a.add_argument("--param", action="append",
+                           help="request parameter NAME=VALUE (repeatable)")
+            a.add_argument("--stored-after", default=None,
+                           help="ISO datetime, e.g. '2024-01-05 09:00'")
+            a.add_argument("--stored-before", default=None,
+                           help="ISO datetime")
+        if name == "list":
+            a.add_argument("--limit", type=int, default=100)
+        a.set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""SQLite에 진행 상태를 기록하는 재개 가능한 대량 수집(backfill) 작업
+
+수집 명세(데이터셋 × 티커 × 기간)를 작업 단위로 나누고, 각 단위의 상태와 결과를
+로컬 SQLite(WAL) 데이터베이스에 저장한다. 프로세스가 중간에 종료되거나 세션 만료,
+네트워크 오류로 일부 단위가 실패해도 같은 명세로 다시 실행하면 끝나지 않은 단위만
+이어서 수집한다. 결과는 index와 dtype을 보존하는 Arrow IPC 형식으로 저장하므로
+pyarrow가 필요하다 (pip install pykrx[export]).
+
+같은 데이터베이스를 여러 프로세스가 함께 수집할 수 있다. 각 실행은 단위를 하나의
+트랜잭션에서 가져가며(claim) 자신의 worker id와 lease 만료 시각을 기록한다. lease가
+만료된 running 단위만 다른 실행이 다시 가져가므로 실행 중인 단위를 중복 수집하지
+않는다. 실패한 단위는 시도 횟수에 따라 늘어나는 대기 시간(backoff)이 지난 뒤 다시
+시도한다.
+
+작업 단위는 데이터셋 함수의 형태에 따라 만들어진다.
+
+- tickers를 지정하면 티커별로 기간을 chunk_days 단위로 나누어
+  func(fromdate, todate, ticker, **kwargs)를 호출한다.
+  (예: get_market_ohlcv_by_date)
+- tickers를 생략하면 기간 내 영업일마다 func(date, **kwargs)를 호출한다.
+  (예: get_market_ohlcv_by_ticker)
+
+    >> from pykrx import backfill
+    >> job = backfill.BackfillJob("ohlcv.db", "get_market_ohlcv_by_date",
+    ..                            "20150101", "20241231",
+    ..                            tickers=["005930", "000660"])
+    >> job.run(max_workers=4, rate=2, progress=print)
+    {'total': 20, 'done': 1, 'failed': 0, 'pending': 19, 'eta_seconds': 38.2, ...}
+    >> df = job.load()
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx import stock
+from pykrx.website import krx
+from pykrx.website.comm.util import dataframe_from_arrow, dataframe_to_arrow
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.krx.throttle import request_priority
+
+__all__ = ["BackfillJob"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id         TEXT PRIMARY KEY,
+    spec       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    job_id     TEXT    NOT NULL,
+    seq        INTEGER NOT NULL,
+    ticker     TEXT,
+    fromdate   TEXT    NOT NULL,
+    todate     TEXT    NOT NULL,
+    status     TEXT    NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT,
+    result     BLOB,
+    elapsed    REAL,
+    updated_at REAL,
+    worker     TEXT,
+    lease_until REAL,
+    retry_at   REAL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (job_id, status);
+"""
+
+# 이전 버전의 데이터베이스에 추가할 column
+_COLUMNS = {"worker": "TEXT", "lease_until": "REAL", "retry_at": "REAL"}
+
+
+def _date_chunks(fromdate: str, todate: str, chunk_days: int) -> list:
+    start, end = pd.to_datetime(fromdate), pd.to_datetime(todate)
+    chunks = []
+    while start <= end:
+        stop = min(start + pd.Timedelta(days=chunk_days - 1), end)
+        chunks.append((start.strftime("%Y%m%d"), stop.strftime("%Y%m%d")))
+        start = stop + pd.Timedelta(days=1)
+    return chunks
+
+
+class BackfillJob:
+    """재개 가능한 backfill 작업
+
+    같은 데이터베이스와 같은 명세로 다시 만들면 기존 작업을 이어서 사용한다.
+
+    Args:
+        db_path      (str           ): SQLite 데이터베이스 경로
+        dataset      (str           ): pykrx.stock 함수 이름
+        fromdate     (str           ): 수집 시작 일자 (YYYYMMDD)
+        todate       (str           ): 수집 종료 일자 (YYYYMMDD)
+        tickers      (list, optional): 티커 목록. 생략하면 영업일별 스냅샷을 수집
+        kwargs       (dict, optional): 데이터셋 함수에 전달할 keyword 인자
+        chunk_days   (int,  optional): 티커별 수집 시 한 번에 조회할 기간 (일)
+        max_attempts (int,  optional): 단위별 최대 시도 횟수
+        retry_backoff (float, optional): 실패한 단위를 다시 시도하기까지의 대기
+                                         시간 (초). 시도할 때마다 두 배로 늘어난다.
+        lease_seconds (float, optional): 가져간 단위를 다른 실행이 다시 가져갈 수
+                                         없는 시간 (초). 단위 하나의 수집 시간보다
+                                         길어야 한다.
+    """
+
+    def __init__(self, db_path, dataset: str, fromdate: str, todate: str,
+                 tickers: list = None, kwargs: dict = None,
+                 chunk_days: int = 365, max_attempts: int = 3,
+                 retry_backoff: float = 5.0, lease_seconds: float = 600.0):
+        if dataset.startswith("_") or not callable(getattr(stock, dataset, None)):
+            raise ValueError(f"pykrx.stock has no function '{dataset}'")
+
+        self.dataset = dataset
+        self.fromdate = fromdate.replace("-", "")
+        self.todate = todate.replace("-", "")
+        self.tickers = list(tickers) if tickers is not None else None
+        self.kwargs = dict(kwargs or {})
+        self.chunk_days = chunk_days
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease_seconds = lease_seconds
+        self.worker_id = (f"{socket.gethostname()}:{os.getpid()}:"
+                          f"{uuid.uuid4().hex[:8]}")
+        self.spec = {
+            "dataset": dataset, "fromdate": self.fromdate,
+            "todate": self.todate, "tickers": self.tickers,
+            "kwargs": self.kwargs, "chunk_days": chunk_days,
+        }
+        spec_json = json.dumps(self.spec, sort_keys=True, ensure_ascii=False)
+        self.job_id = hashlib.sha1(spec_json.encode("utf-8")).hexdigest()[:16]
+
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._init_job(spec_json)
+        self._started = None
+        self._completed = 0
+
+    # -- units ----------------------------------------------------------------
+    def _expand(self) -> list:
+        if self.tickers is None:
+            days = krx.get_trading_days(self.fromdate, self.todate)
+            return [(None, d, d) for d in days]
+        chunks = _date_chunks(self.fromdate, self.todate, self.chunk_days)
+        return [(t, s, e) for t in self.tickers for s, e in chunks]
+
+    def _migrate(self):
+        with self._lock:
+            columns = {row[1] for row in self._conn.execute(
+                "PRAGMA table_info(units)")}
+            for name, kind in _COLUMNS.items():
+                if name not in columns:
+                    self._conn.execute(
+                        f"ALTER TABLE units ADD COLUMN {name} {kind}")
+
+    def _init_job(self, spec_json: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM jobs WHERE id = ?", (self.job_id,)).fetchone()
+        if row is not None:
+            return
+
+        units = self._expand()
+        if not units:
+            raise ValueError("backfill spec expands to no work units")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs VALUES (?, ?, ?)",
+                    (self.job_id, spec_json, time.time()))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO units "
+                    "(job_id, seq, ticker, fromdate, todate) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(self.job_id, i, *u) for i, u in enumerate(units)])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _call(self, ticker, fromdate, todate):
+        func = getattr(stock, self.dataset)
+        if ticker is None:
+            return func(fromdate, **self.kwargs)
+        return func(fromdate, todate, ticker, **self.kwargs)
+
+    def _claim(self):
+        """수집할 단위 하나를 가져간다. 없으면 None
+
+        대기 시간이 지난 pending 단위와 lease가 만료된 running 단위 중 가장 앞선
+        단위를 하나의 트랜잭션에서 running으로 바꾸고 이 실행의 worker id와 lease
+        만료 시각을 기록한다.
+        """
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                unit = self._conn.execute(
+                    "SELECT seq, ticker, fromdate, todate, attempts FROM units "
+                    "WHERE job_id = ? AND ("
+                    "(status = 'pending' AND COALESCE(retry_at, 0) <= ?) OR "
+                    "(status = 'running' AND COALESCE(lease_until, 0) < ?)) "
+                    "ORDER BY seq LIMIT 1",
+                    (self.job_id, now, now)).fetchone()
+                if unit is not None:
+                    self._conn.execute(
+                        "UPDATE units SET status = 'running', worker = ?, "
+                        "lease_until = ?, updated_at = ? "
+                        "WHERE job_id = ? AND seq = ?",
+                        (self.worker_id, now + self.lease_seconds, now,
+                         self.job_id, unit[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return unit
+
+    def _next_retry_delay(self):
+        """backoff 중인 단위가 다시 시도 가능해질 때까지의 시간 (초). 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(COALESCE(retry_at, 0)) FROM units "
+                "WHERE job_id = ? AND status = 'pending'",
+                (self.job_id,)).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0)
+
+    def _record(self, seq: int, status: str, *, error=None, result=None,
+                elapsed=None, retry_at=None):
+        # lease가 만료되어 다른 실행이 가져간 단위의 결과는 기록하지 않는다
+        with self._lock:
+            self._conn.execute(
+                "UPDATE units SET status = ?, attempts = attempts + 1, "
+                "error = ?, result = ?, elapsed = ?, updated_at = ?, "
+                "retry_at = ?, worker = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND seq = ? AND worker = ?",
+                (status, error, result, elapsed, time.time(), retry_at,
+                 self.job_id, seq, self.worker_id))
+
+    def _retry_at(self, attempts: int) -> float:
+        return time.time() + self.retry_backoff * 2 ** attempts
+
+    def _run_unit(self, unit, limiter, priority):
+        seq, ticker, fromdate, todate, attempts = unit
+        if limiter is not None:
+            limiter.acquire()
+        started = time.monotonic()
+        try:
+            with request_priority(priority):
+                df = self._call(ticker, fromdate, todate)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if attempts + 1 >= self.max_attempts:
+                self._record(seq, "failed", error=error)
+            else:
+                self._record(seq, "pending", error=error,
+                             retry_at=self._retry_at(attempts))
+            return False
+
+        elapsed = time.monotonic() - started
+        # 빈 결과는 일시적인 조회 실패일 수 있어 시도 횟수가 남았다면 다시 수집한다
+        if getattr(df, "empty", False) and attempts + 1 < self.max_attempts:
+            self._record(seq, "pending", error="empty result", elapsed=elapsed,
+                         retry_at=self._retry_at(attempts))
+            return False
+
+        if df is None:
+            df = DataFrame()
+        blob = dataframe_to_arrow(df)
+        self._record(seq, "done", result=sqlite3.Binary(blob), elapsed=elapsed)
+        return True
+
+    # -- public ---------------------------------------------------------------
+    def progress(self) -> dict:
+        """진행 상황
+
+        Returns:
+            dict: total, done, failed, pending (단위 수), units_per_second
+                  (이번 실행의 처리 속도), eta_seconds (남은 예상 시간)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM units WHERE job_id = ? "
+                "GROUP BY status", (self.job_id,)).fetchall()
+        counts = dict(rows)
+        done, failed = counts.get("done", 0), counts.get("failed", 0)
+        pending = counts.get("pending", 0) + counts.get("running", 0)
+
+        speed = eta = None
+        if self._started is not None and self._completed:
+            speed = self._completed / (time.monotonic() - self._started)
+            eta = pending / speed
+        return {"total": done + failed + pending, "done": done,
+                "failed": failed, "pending": pending,
+                "units_per_second": speed, "eta_seconds": eta}
+
+    def run(self, max_workers: int = 4, rate: float = None,
+            progress=None, priority: str = "low") -> dict:
+        """끝나지 않은 단위를 수집한다.
+
+        Args:
+            max_workers (int,      optional): 동시에 수집할 단위 수
+            rate        (float,    optional): 초당 시작할 수 있는 최대 조회 수
+            progress    (callable, optional): 단위가 끝날 때마다 progress()의
+                                              결과로 호출된다.
+            priority    (str,      optional): 요청 dispatcher를 사용할 때의
+                                              우선순위 (high/normal/low)
+
+        Returns:
+            dict: 실행 후의 progress()
+        """
+        limiter = RateLimiter(rate) if rate else None
+        self._started, self._completed = time.monotonic(), 0
+        max_workers = max(max_workers, 1)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = set()
+            while True:
+                # 실행 중인 단위만 lease를 잡고 있도록 빈 worker 수만큼만 가져간다
+                while len(running) < max_workers:
+                    unit = self._claim()
+                    if unit is None:
+                        break
+                    running.add(executor.submit(self._run_unit, unit, limiter,
+                                                priority))
+                if not running:
+                    # 남은 단위가 backoff 중이면 다시 시도할 수 있을 때까지 기다린다
+                    delay = self._next_retry_delay()
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+                    continue
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    f.result()
+                    self._completed += 1
+                    if progress is not None:
+                        progress(self.progress())
+        return self.progress()
+
+    def failures(self) -> DataFrame:
+        """실패한 단위와 마지막 오류"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, fromdate, todate, attempts, error FROM units "
+                "WHERE job_id = ? AND status = 'failed' ORDER BY seq",
+                (self.job_id,)).fetchall()
+        return DataFrame(rows, columns=["티커", "시작일", "종료일", "시도", "오류"])
+
+    def reset_failed(self):
+        """실패한 단위를 다시 수집하도록 되돌린다."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE units SET status = 'pending', attempts = 0, "
+                "retry_at = NULL WHERE job_id = ? AND status = 'failed'",
+                (self.job_id,))
+
+    def load(self) -> DataFrame:
+        """완료된 단위의 결과를 하나의 DataFrame으로 합친다.
+
+        Returns:
+            DataFrame: 티커별 수집은 (티커, 원래 index), 영업일별 수집은
+                       (날짜, 원래 index) MultiIndex
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, fromdate, result FROM units "
+                "WHERE job_id = ? AND status = 'done' ORDER BY seq",
+                (self.job_id,)).fetchall()
+
+        frames = {}
+        for ticker, fromdate, blob in rows:
+            df = dataframe_from_arrow(blob)
+            if df.empty:
+                continue
+            key = ticker if self.tickers is not None else fromdate
+            frames.setdefault(key, []).append(df)
+        if not frames:
+            return DataFrame()
+
+        frames = {k: pd.concat(v) for k, v in frames.items()}
+        if self.tickers is not None:
+            return pd.concat(frames, names=["티커"])
+        df = pd.concat(frames.values(), keys=pd.to_datetime(list(frames)),
+                       names=["날짜"])
+        return df
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
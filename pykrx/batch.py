@@ -0,0 +1,326 @@
+"""여러 pykrx.stock 호출을 동시에 수행하는 batch 실행기
+
+호출은 (함수 이름, 인자...) 형태의 call spec으로 지정한다. 마지막 원소가 dict이면
+keyword 인자로 사용한다.
+
+    >> from pykrx import batch
+    >> results = batch.run([
+    ..     ("get_market_ohlcv_by_ticker", "20220902", "ALL"),
+    ..     ("get_market_ohlcv_by_ticker", "20220905", "ALL"),
+    ..     ("get_market_cap", "20220902", {"market": "KOSDAQ"}),
+    .. ], max_workers=4, rate=2)
+    >> [r.ok for r in results]
+    [True, True, True]
+
+결과는 입력 순서대로 반환되며, 실패한 호출은 예외를 error에 담는다. 호출을 제출한
+시점의 세션 바인딩(use_http_session)은 worker 스레드에도 그대로 적용된다.
+
+전종목/장기간 조회처럼 응답 파싱(정규식 replace, astype)이 병목인 작업은
+mode="process"로 여러 프로세스에서 실행할 수 있다. KRX 요청은 부모 프로세스가
+세션, 동시성 제어, hook, 로그인 복구를 거쳐 보내고 worker에는 응답 JSON만 전달하므로
+worker는 파싱만 한다. 결과 DataFrame의 배열은 pickle 대신 공유 메모리로 전달된다.
+
+    >> batch.run(calls, max_workers=8, mode="process")
+"""
+import contextvars
+import importlib
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, ThreadPoolExecutor,
+    wait
+)
+
+from pykrx import stock
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.shm import (
+    export_shared, import_shared, start_resource_tracker
+)
+
+__all__ = ["BatchResult", "BatchExecutor", "run"]
+
+
+def _parse_spec(spec):
+    if isinstance(spec, str) or callable(spec):
+        spec = (spec,)
+    spec = tuple(spec)
+    if not spec:
+        raise ValueError("empty call spec")
+
+    func, args, kwargs = spec[0], spec[1:], {}
+    if args and isinstance(args[-1], dict):
+        args, kwargs = args[:-1], dict(args[-1])
+    return func, args, kwargs
+
+
+def _resolve(func, module):
+    if callable(func):
+        return func
+    if not isinstance(func, str) or func.startswith("_"):
+        raise ValueError(f"invalid function name: {func!r}")
+    target = getattr(module, func, None)
+    if not callable(target):
+        raise ValueError(f"{module.__name__} has no function '{func}'")
+    return target
+
+
+def _init_process_worker():
+    # worker는 KRX 요청을 보내지 않는다. 세션 바인딩과 세션 파일 cache를 비워
+    # 부모의 세션을 사용하지 않게 한다.
+    from pykrx.website.comm.webio import set_http_session
+    from pykrx.website.krx import krxio
+
+    set_http_session(None)
+    krxio._reset_session_file_cache()
+
+
+def _run_in_process(module_name: str, func, args, kwargs, channel):
+    from pykrx.website.krx import krxio
+
+    requests, responses = channel
+
+    def read(io, params):
+        # 부모 프로세스의 _serve_reads()가 조회한 구간별 응답을 받는다
+        requests.put((io, params))
+        windows, error = responses.get()
+        if error is not None:
+            raise error
+        return windows
+
+    krxio._REMOTE_READER = read
+    try:
+        if isinstance(func, str):
+            func = _resolve(func, importlib.import_module(module_name))
+        return export_shared(func(*args, **kwargs))
+    finally:
+        krxio._REMOTE_READER = None
+        # 호출이 끝났음을 알린다
+        requests.put(None)
+
+
+def _serve_reads(future, channel, cancelled):
+    """worker의 KRX 조회를 호출한 쪽의 context에서 대신 수행한다."""
+    requests, responses = channel
+    while True:
+        try:
+            message = requests.get(timeout=0.5)
+        except queue.Empty:
+            if future.done():
+                # worker 프로세스가 비정상 종료된 경우
+                return
+            if cancelled.is_set():
+                # 취소/시간 초과로 결과를 버리는 호출은 더 이상 대신 조회하지 않는다
+                raise CancelledError()
+            continue
+        if message is None:
+            return
+
+        io, params = message
+        try:
+            if cancelled.is_set():
+                raise CancelledError()
+            reply = list(io.iter_read(**params)), None
+        except Exception as e:
+            reply = None, e
+        responses.put(reply)
+
+
+class BatchResult:
+    """call spec 하나의 실행 결과
+
+    Attributes:
+        spec    : 입력한 call spec
+        value   : 반환값 (실패 시 None)
+        error   : 발생한 예외 (TimeoutError / CancelledError 포함, 성공 시 None)
+        elapsed : 실행 시간 (초). 시작하지 못한 호출은 None
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.value = None
+        self.error = None
+        self.elapsed = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else type(self.error).__name__
+        return f"BatchResult({self.spec!r}, {state})"
+
+
+class BatchExecutor:
+    """call spec 목록을 제한된 동시성과 호출 빈도로 실행
+
+    Args:
+        calls       (list           ): call spec 목록
+        max_workers (int,   optional): 동시에 실행할 최대 호출 수
+        rate        (float, optional): 초당 시작할 수 있는 최대 호출 수
+        timeout     (float, optional): 호출 하나의 제한 시간 (초). 초과하면 결과를
+                                       기다리지 않고 TimeoutError로 기록한다.
+        module      (optional       ): 함수 이름을 찾을 모듈 (기본값: pykrx.stock)
+        mode        (str,   optional): thread / process. process이면 호출을 worker
+                                       프로세스에서 실행하고 결과를 공유 메모리로
+                                       받는다. KRX 요청은 이 프로세스에서 보낸다.
+                                       함수는 이름 또는 pickle 가능한 callable
+                                       이어야 한다.
+    """
+
+    def __init__(self, calls, *, max_workers: int = 4, rate: float = None,
+                 timeout: float = None, module=stock, mode: str = "thread"):
+        if mode not in ("thread", "process"):
+            raise ValueError("mode must be 'thread' or 'process'")
+        self.mode = mode
+        self.module = module
+        self.specs = list(calls)
+        self._calls = [_parse_spec(spec) for spec in self.specs]
+        self._funcs = [_resolve(func, module) for func, _, _ in self._calls]
+        self.max_workers = max(int(max_workers), 1)
+        self.timeout = timeout
+        self._limiter = RateLimiter(rate) if rate else None
+        self._cancelled = threading.Event()
+        self._executor = None
+        self._process_pool = None
+        self._manager = None
+        self._futures = []
+        self._started = {}
+        self.results = [BatchResult(spec) for spec in self.specs]
+
+    def _call(self, i: int):
+        if self._limiter is not None:
+            while not self._limiter.acquire(timeout=0.1):
+                if self._cancelled.is_set():
+                    raise CancelledError()
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+        func, args, kwargs = self._calls[i]
+        self._started[i] = time.monotonic()
+        try:
+            if self._process_pool is None:
+                return self._funcs[i](*args, **kwargs)
+            # 스레드는 호출 빈도/취소/시간 초과와 KRX 요청을 맡고, 응답 파싱은
+            # worker 프로세스에서
+            channel = self._manager.Queue(), self._manager.Queue()
+            future = self._process_pool.submit(
+                _run_in_process, self.module.__name__, func, args, kwargs,
+                channel)
+            _serve_reads(future, channel, self._cancelled)
+            return import_shared(future.result())
+        finally:
+            self.results[i].elapsed = time.monotonic() - self._started[i]
+
+    def start(self):
+        """백그라운드에서 실행을 시작한다."""
+        if self._executor is not None:
+            return self
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        if self.mode == "process":
+            # worker가 만든 공유 메모리 블록을 이 프로세스가 가져가기 전까지
+            # 같은 resource tracker가 관리하도록 worker보다 먼저 시작한다
+            start_resource_tracker()
+            # fork는 부모의 스레드(세션 refresher, 다른 batch의 worker 스레드)가 잡고
+            # 있던 lock과 curl handle까지 복제하므로 spawn으로 worker를 만든다
+            mp_context = multiprocessing.get_context("spawn")
+            self._manager = mp_context.Manager()
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=mp_context,
+                initializer=_init_process_worker)
+        for i in range(len(self._calls)):
+            # 호출한 쪽의 context(세션 바인딩 등)를 worker에서도 사용한다
+            ctx = contextvars.copy_context()
+            self._futures.append(self._executor.submit(ctx.run, self._call, i))
+        return self
+
+    def cancel(self):
+        """아직 시작하지 않은 호출을 취소한다. 실행 중인 호출의 결과는 버린다."""
+        self._cancelled.set()
+        for f in self._futures:
+            f.cancel()
+
+    def _collect(self, i: int, future):
+        result = self.results[i]
+        if future.cancelled():
+            result.error = CancelledError()
+            return
+        error = future.exception()
+        if error is None:
+            result.value = future.result()
+        else:
+            result.error = error
+
+    def _expired(self, i: int, now: float) -> bool:
+        started = self._started.get(i)
+        return (self.timeout is not None and started is not None
+                and now - started >= self.timeout)
+
+    def wait(self) -> list:
+        """모든 호출이 끝날 때까지 기다린 뒤 입력 순서대로 BatchResult 목록을 반환"""
+        self.start()
+        pending = dict(enumerate(self._futures))
+        try:
+            while pending:
+                if self._cancelled.is_set():
+                    for i in list(pending):
+                        if not pending[i].done():
+                            self.results[i].error = CancelledError()
+                            del pending[i]
+
+                poll = 0.1 if self.timeout is not None else 0.5
+                done, _ = wait(list(pending.values()), timeout=poll,
+                               return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for i, f in list(pending.items()):
+                    if f in done:
+                        self._collect(i, f)
+                        del pending[i]
+                    elif self._expired(i, now):
+                        self.results[i].error = TimeoutError(
+                            f"call timed out after {self.timeout} seconds")
+                        del pending[i]
+        except KeyboardInterrupt:
+            self.cancel()
+            raise
+        finally:
+            if self._process_pool is None:
+                # 시간 초과/취소된 호출이 끝나기를 기다리지 않는다
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                # 시간 초과된 호출의 스레드가 아직 worker의 조회를 대신하고 있을 수
+                # 있다. manager를 닫기 전에 멈추게 하고 끝날 때까지 기다린다.
+                self._cancelled.set()
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._manager.shutdown()
+        return self.results
+
+    def run(self) -> list:
+        return self.start().wait()
+
+
+def run(calls, *, max_workers: int = 4, rate: float = None,
+        timeout: float = None, raise_on_error: bool = False,
+        mode: str = "thread") -> list:
+    """call spec 목록을 동시에 실행하고 입력 순서대로 결과를 반환
+
+    Args:
+        calls          (list           ): call spec 목록
+        max_workers    (int,   optional): 동시에 실행할 최대 호출 수
+        rate           (float, optional): 초당 시작할 수 있는 최대 호출 수
+        timeout        (float, optional): 호출 하나의 제한 시간 (초)
+        raise_on_error (bool,  optional): True이면 가장 앞선 실패의 예외를 전파
+        mode           (str,   optional): thread / process
+
+    Returns:
+        list: BatchResult 목록
+    """
+    results = BatchExecutor(calls, max_workers=max_workers, rate=rate,
+                            timeout=timeout, mode=mode).run()
+    if raise_on_error:
+        for r in results:
+            if r.error is not None:
+                raise r.error
+    return results
@@ -1 +1 @@
-from .bond import *
\ No newline at end of file
+from .bond import *
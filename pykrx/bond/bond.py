@@ -1,5 +1,7 @@
+import datetime
 from sqlite3 import NotSupportedError
 from pykrx.website import krx
+from pykrx.website.comm import tracing
 from pandas import DataFrame
 
 
@@ -73,6 +75,45 @@ def get_otc_treasury_yields(*args) -> DataFrame:
     return df
 
 
+def get_otc_treasury_yield_curve(fromdate: str, todate: str,
+                                 max_workers: int = 4) -> DataFrame:
+    """기간 내 국고채 장외 수익률 곡선
+
+    Args:
+        fromdate    (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str          ): 조회 종료 일자 (YYYYMMDD)
+        max_workers (int, optional): 동시에 조회할 만기 수
+
+    Returns:
+        DataFrame: 일자 index, 만기(년) column의 수익률 (float)
+
+        > get_otc_treasury_yield_curve("20220104", "20220106")
+
+            만기         1.0    2.0    3.0    5.0   10.0   20.0   30.0
+            일자
+            2022-01-04  1.375  1.717  1.884  2.119  2.358  2.383  2.309
+            2022-01-05  1.410  1.791  1.975  2.205  2.431  2.445  2.363
+            2022-01-06  1.434  1.878  2.056  2.277  2.477  2.480  2.397
+
+        만기 사이의 수익률은 column 방향 보간으로 구할 수 있다.
+
+        > df = get_otc_treasury_yield_curve("20220104", "20220106")
+        > df.reindex(columns=[1, 2, 3, 4, 5, 7, 10]).interpolate(axis=1)
+    """
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+    return krx.bond.get_otc_treasury_yield_curve(
+        fromdate, todate, max_workers=max_workers)
+
+
+tracing.trace_module(globals(), "api")
+
+
 if __name__ == "__main__":
     # df = get_otc_treasury_yields("20220204")
     # print(df)
@@ -0,0 +1,337 @@
+"""조회 결과를 구간(chunk) 단위로 바로 파일에 기록하는 export sink
+
+장기간/다종목 데이터를 DataFrame으로 모두 모아 concat한 뒤 저장하면 최대 메모리
+사용량이 결과 크기의 몇 배가 된다. sink는 chunk가 도착할 때마다 파일에 추가하므로
+조회 기간과 관계없이 chunk 하나 크기의 메모리만 사용한다.
+
+    >> from pykrx import export, stock
+    >> export(stock.iter_market_ohlcv_by_date("19950101", "20241231", "005930"),
+    ..        "005930.parquet")
+
+    >> export([("get_market_ohlcv_by_ticker", "20220902", "ALL"),
+    ..         ("get_market_ohlcv_by_ticker", "20220905", "ALL")],
+    ..        "ohlcv.csv", key_column="날짜")
+
+형식은 확장자로 정한다.
+
+- .parquet, .pq     : Parquet (chunk마다 row group 하나)
+- .arrow, .feather  : Arrow IPC file (Feather V2). pyarrow.ipc.open_file,
+                      pyarrow.feather.read_table로 읽는다
+- .arrows           : Arrow IPC stream. pyarrow.ipc.open_stream으로 읽는다
+- .csv              : CSV
+
+Parquet과 Arrow IPC는 pyarrow가 필요하다 (pip install pykrx[export]).
+
+SCHEMAS에 등록된 함수(endpoint)는 정해진 column 순서와 dtype으로 기록하므로 같은
+endpoint를 내보낸 파일은 조회 일자와 관계없이 schema가 같다. 등록되지 않은 결과는
+첫 chunk의 column과 dtype이 파일의 schema가 된다. 이후 chunk는 schema의 column
+순서와 dtype으로 변환해 기록하며, column이 다르면 ValueError가 발생한다.
+"""
+import csv
+import inspect
+import os
+
+import numpy as np
+from pandas import DataFrame
+
+from pykrx.website.comm.util import import_pyarrow
+
+__all__ = ["SCHEMAS", "CsvSink", "ParquetSink", "ArrowIpcSink",
+           "ArrowIpcStreamSink", "open_sink", "export"]
+
+# endpoint(pykrx.stock 함수 이름)별 schema. index를 포함한 column 순서와 dtype
+SCHEMAS = {
+    "iter_market_ohlcv_by_date": {
+        "날짜": "datetime64[ns]", "시가": "int32", "고가": "int32",
+        "저가": "int32", "종가": "int32", "거래량": "int32",
+        "거래대금": "int64", "등락률": "float32",
+    },
+    "iter_index_ohlcv_by_date": {
+        "날짜": "datetime64[ns]", "시가": "float64", "고가": "float64",
+        "저가": "float64", "종가": "float64", "거래량": "int64",
+        "거래대금": "int64", "상장시가총액": "int64",
+    },
+    "get_market_ohlcv_by_ticker": {
+        "티커": "object", "시가": "int32", "고가": "int32", "저가": "int32",
+        "종가": "int32", "거래량": "int32", "거래대금": "int64",
+        "등락률": "float32", "시가총액": "int64",
+    },
+    "get_market_cap_by_ticker": {
+        "티커": "object", "종가": "int64", "시가총액": "int64",
+        "거래량": "int64", "거래대금": "int64", "상장주식수": "int64",
+    },
+    "get_market_fundamental_by_ticker": {
+        "티커": "object", "BPS": "int32", "PER": "float64", "PBR": "float64",
+        "EPS": "int32", "DIV": "float64", "DPS": "int32",
+    },
+}
+
+
+def _resolve_schema(schema, key_column: str = None):
+    """endpoint 이름 또는 {column: dtype}을 schema dict로 변환한다."""
+    if schema is None:
+        return None
+    if isinstance(schema, str):
+        if schema not in SCHEMAS:
+            raise ValueError(f"unknown endpoint schema: {schema!r}")
+        schema = SCHEMAS[schema]
+    schema = dict(schema)
+    if key_column is not None and key_column not in schema:
+        schema[key_column] = "object"
+    return schema
+
+
+class _Sink:
+    """chunk를 순서대로 기록하는 sink의 공통 동작
+
+    Args:
+        path       (str           ): 저장할 파일 경로
+        index      (bool, optional): DataFrame의 index를 column으로 기록할지 여부
+        schema     (str,  optional): SCHEMAS의 endpoint 이름 또는 {column: dtype}.
+                                     생략하면 첫 chunk의 column과 dtype을 사용
+    """
+
+    def __init__(self, path, index: bool = True, schema=None):
+        self.path = os.fspath(path)
+        self.index = index
+        self.schema = _resolve_schema(schema)
+        self.columns = None
+        self.dtypes = None
+        self.rows = 0
+        self.chunks = 0
+        self._closed = False
+
+    def _conform(self, df: DataFrame) -> DataFrame:
+        if self.index:
+            df = df.reset_index()
+        if self.columns is None:
+            if self.schema is None:
+                self.columns = list(df.columns)
+                self.dtypes = df.dtypes.to_dict()
+                return df
+            self.columns = list(self.schema)
+            self.dtypes = dict(self.schema)
+
+        if set(df.columns) != set(self.columns):
+            raise ValueError(
+                f"chunk columns {list(df.columns)} do not match "
+                f"the sink schema {self.columns}")
+        return df[self.columns].astype(self.dtypes)
+
+    def write(self, df: DataFrame):
+        """chunk 하나를 기록한다. 빈 DataFrame은 건너뛴다."""
+        if self._closed:
+            raise ValueError("sink is closed")
+        if df is None or df.empty:
+            return
+        df = self._conform(df)
+        self._write(df)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._close()
+
+    def _write(self, df: DataFrame):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(_Sink):
+    """chunk를 CSV 파일에 이어서 기록한다. header는 첫 chunk에서 한 번만 쓴다."""
+
+    def __init__(self, path, index: bool = True, schema=None,
+                 encoding: str = "utf-8-sig"):
+        super().__init__(path, index, schema)
+        self._file = open(self.path, "w", newline="", encoding=encoding)
+
+    def _write(self, df: DataFrame):
+        df.to_csv(self._file, header=self.chunks == 0, index=False,
+                  quoting=csv.QUOTE_MINIMAL)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class _ArrowSink(_Sink):
+    def __init__(self, path, index: bool = True, schema=None):
+        super().__init__(path, index, schema)
+        self._pa = import_pyarrow()
+        self._writer = None
+        self._schema = None
+
+    def _open(self, schema):
+        raise NotImplementedError
+
+    def _write(self, df: DataFrame):
+        pa = self._pa
+        if self._schema is None:
+            self._schema = self._arrow_schema(df)
+            self._writer = self._open(self._schema)
+        table = pa.Table.from_pandas(df, schema=self._schema,
+                                     preserve_index=False)
+        self._writer.write_table(table)
+
+    def _arrow_schema(self, df: DataFrame):
+        pa = self._pa
+        if self.schema is None:
+            return pa.Schema.from_pandas(df, preserve_index=False)
+        fields = []
+        for name, dtype in self.schema.items():
+            dtype = np.dtype(dtype)
+            fields.append((name, pa.string() if dtype == object
+                           else pa.from_numpy_dtype(dtype)))
+        return pa.schema(fields)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+        elif self._schema is None:
+            # chunk가 하나도 없으면 빈 파일을 남기지 않는다
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class ParquetSink(_ArrowSink):
+    """chunk 하나를 Parquet row group 하나로 기록한다.
+
+    Args:
+        path        (str           ): 저장할 파일 경로
+        index       (bool, optional): index를 column으로 기록할지 여부
+        compression (str,  optional): snappy / zstd / gzip / none
+    """
+
+    def __init__(self, path, index: bool = True, schema=None,
+                 compression: str = "snappy"):
+        super().__init__(path, index, schema)
+        self.compression = compression
+
+    def _open(self, schema):
+        return self._pa.parquet.ParquetWriter(
+            self.path, schema, compression=self.compression)
+
+
+class ArrowIpcSink(_ArrowSink):
+    """chunk를 Arrow IPC file(Feather V2)의 record batch로 기록한다."""
+
+    def _open(self, schema):
+        return self._pa.ipc.new_file(self.path, schema)
+
+
+class ArrowIpcStreamSink(_ArrowSink):
+    """chunk를 Arrow IPC stream의 record batch로 기록한다."""
+
+    def _open(self, schema):
+        return self._pa.ipc.new_stream(self.path, schema)
+
+
+_SINKS = {
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+    "arrow": ArrowIpcSink,
+    "arrows": ArrowIpcStreamSink,
+}
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".arrows": "arrows",
+    ".feather": "arrow",
+}
+
+
+def open_sink(path, format: str = None, **kwargs) -> _Sink:
+    """경로(또는 format)에 맞는 sink를 연다
+
+    Args:
+        path   (str          ): 저장할 파일 경로
+        format (str, optional): csv / parquet / arrow / arrows. 생략하면 확장자로
+                                정한다.
+
+    Returns:
+        sink: write(df) / close()를 제공하는 sink 객체
+    """
+    if format is None:
+        ext = os.path.splitext(os.fspath(path))[1].lower()
+        format = _EXTENSIONS.get(ext)
+        if format is None:
+            raise ValueError(f"cannot infer export format from '{path}'")
+    if format not in _SINKS:
+        raise ValueError(f"unsupported export format: {format!r}")
+    return _SINKS[format](path, **kwargs)
+
+
+def _iter_chunks(source, module, key_column):
+    from pykrx.batch import _parse_spec, _resolve
+
+    for item in source:
+        if item is None or isinstance(item, DataFrame):
+            yield None, item
+            continue
+
+        func, args, kwargs = _parse_spec(item)
+        value = _resolve(func, module)(*args, **kwargs)
+        chunks = value if inspect.isgenerator(value) else [value]
+        for df in chunks:
+            if key_column is not None and df is not None and not df.empty:
+                # 여러 호출의 결과를 한 파일에 쓸 때 호출을 구분하는 column
+                df = df.assign(**{key_column: args[0] if args else func})
+            yield (func if isinstance(func, str)
+                   else getattr(func, "__name__", None)), df
+
+
+def export(source, path, format: str = None, *, key_column: str = None,
+           module=None, schema=None, **kwargs) -> dict:
+    """chunk를 받는 대로 파일에 기록한다
+
+    Args:
+        source     (iterable      ): DataFrame을 반환하는 iterable
+                                     (예: stock.iter_market_ohlcv_by_date(...)) 또는
+                                     pykrx.batch와 같은 형식의 call spec 목록.
+                                     call이 generator를 반환하면 chunk마다 기록한다.
+        path       (str           ): 저장할 파일 경로
+        format     (str, optional ): csv / parquet / arrow / arrows
+                                     (기본값: 확장자로 결정)
+        key_column (str, optional ): call spec을 사용할 때 첫 번째 인자(일자/티커)를
+                                     기록할 column 이름
+        module     (optional      ): 함수 이름을 찾을 모듈 (기본값: pykrx.stock)
+        schema     (optional      ): SCHEMAS의 endpoint 이름 또는 {column: dtype}.
+                                     생략하면 첫 call spec의 함수 이름으로 찾고,
+                                     없으면 첫 chunk의 schema를 사용한다.
+        kwargs                     : sink에 전달할 옵션 (index, compression 등)
+
+    Returns:
+        dict: 기록한 chunk/row 수와 경로
+
+        >> export(stock.iter_index_ohlcv_by_date("20000101", "20241231", "1001"),
+        ..        "1001.arrow", schema="iter_index_ohlcv_by_date")
+        {'path': '1001.arrow', 'format': 'arrow', 'chunks': 13, 'rows': 6141}
+    """
+    if module is None:
+        from pykrx import stock as module
+
+    sink = open_sink(path, format, schema=_resolve_schema(schema, key_column),
+                     **kwargs)
+    with sink:
+        for name, df in _iter_chunks(source, module, key_column):
+            if sink.columns is None and sink.schema is None \
+                    and name in SCHEMAS:
+                sink.schema = _resolve_schema(name, key_column)
+            sink.write(df)
+
+    format = next(k for k, v in _SINKS.items() if type(sink) is v)
+    return {"path": sink.path, "format": format, "chunks": sink.chunks,
+            "rows": sink.rows}
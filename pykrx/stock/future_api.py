@@ -1,4 +1,5 @@
 from pykrx.website import krx
+from pykrx.website.comm import tracing
 import datetime
 from pandas import DataFrame
 import re
@@ -97,6 +98,68 @@ def get_future_ohlcv_by_ticker(date: str, prod: str, alternative: bool = False,
     return df
 
 
+def get_future_ohlcv_snapshot(date: str, prods: list = None,
+                              max_workers: int = 4) -> DataFrame:
+    """전체 파생상품의 특정 일자 OHLCV
+
+    Args:
+        date        (str           ): 조회 일자 (YYYYMMDD)
+        prods       (list, optional): 조회할 상품 목록. 생략하면 전체 상품
+        max_workers (int,  optional): 동시에 조회할 상품 수
+
+    Returns:
+        DataFrame: (상품, 종목코드) MultiIndex
+
+        >> get_future_ohlcv_snapshot("20220902")
+
+                                                    종목명     종가  대비  ...
+        상품        종목코드
+        KRDRVFUK2I  101S9000      코스피200 F 202209 (주간)  313.85 -0.65  ...
+                    101SC000      코스피200 F 202212 (주간)  314.75 -0.75  ...
+    """
+    if isinstance(date, datetime.datetime):
+        date = krx.datetime2string(date)
+
+    date = date.replace("-", "")
+    return krx.get_future_ohlcv_snapshot(date, prods, max_workers=max_workers)
+
+
+def get_future_ohlcv_snapshot_by_date(fromdate: str, todate: str,
+                                      prods: list = None,
+                                      max_workers: int = 4) -> DataFrame:
+    """기간 내 영업일별 전체 파생상품 OHLCV
+
+    Args:
+        fromdate    (str           ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str           ): 조회 종료 일자 (YYYYMMDD)
+        prods       (list, optional): 조회할 상품 목록. 생략하면 전체 상품
+        max_workers (int,  optional): 동시에 수행할 조회 수
+
+    Returns:
+        DataFrame: (날짜, 상품, 종목코드) MultiIndex
+
+        >> df = get_future_ohlcv_snapshot_by_date("20220901", "20220902", ["KRDRVFUK2I"])
+        >> df['종가'].unstack('종목코드')
+
+                               101S9000  101SC000  101T3000  ...
+        날짜        상품
+        2022-09-01  KRDRVFUK2I   314.50    315.50    312.70  ...
+        2022-09-02  KRDRVFUK2I   313.85    314.75    311.25  ...
+    """  # pylint: disable=line-too-long # noqa: E501
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+    return krx.get_future_ohlcv_snapshot_by_date(fromdate, todate, prods,
+                                                 max_workers=max_workers)
+
+
+tracing.trace_module(globals(), "api")
+
+
 if __name__ == "__main__":
     # tickers = get_future_ticker_list()
     # print(tickers)
@@ -11,6 +11,8 @@ from multipledispatch import dispatch
 from pandas import DataFrame
 
 from pykrx.website import krx, naver
+from pykrx.website.comm import tracing
+from pykrx.website.comm.negcache import NegativeCache, is_past_date
 from pykrx.website.comm.util import PykrxRequestError
 
 regex_yymmdd = re.compile(r"\d{4}[-/]?\d{2}[-/]?\d{2}")
@@ -20,9 +22,11 @@ def krx_login(*args, **kwargs):
     return krx.login(*args, **kwargs)
 
 def enable_auto_login_on_failure(
-    enabled: bool = True, *, allow_dup_login: bool = False
+    enabled: bool = True, *, allow_dup_login: bool = False,
+    cross_process: bool = False
 ):
-    return krx.enable_auto_login_on_failure(enabled, allow_dup_login=allow_dup_login)
+    return krx.enable_auto_login_on_failure(enabled, allow_dup_login=allow_dup_login,
+                                            cross_process=cross_process)
 
 
 def clear_session_file():
@@ -209,6 +213,93 @@ def get_nearest_business_day_in_a_week(date: str = None, prev: bool = True) -> s
     return krx.get_nearest_business_day_in_a_week(date, prev)
 
 
+# 휴일을 대신할 이전 영업일 (날짜만 기억하므로 넉넉하게)
+_NEGATIVE_CACHE = NegativeCache()
+# 휴일 snapshot과 대체 영업일의 snapshot. 전종목 DataFrame을 복사해 보관하므로
+# 최근에 조회한 몇 개만 기억한다
+_SNAPSHOT_CACHE = NegativeCache(maxsize=16)
+
+
+def _is_holiday(date: str) -> bool:
+    """과거의 date가 휴일인지 확인. 이전 영업일이 date 자신이 아니면 휴일이다.
+
+    오늘 이후의 날짜이거나 이전 영업일을 확인하지 못하면 False
+    """
+    if not is_past_date(date):
+        return False
+    try:
+        return _get_previous_business_day(date) != date
+    except (PykrxRequestError, IndexError):
+        return False
+
+
+def _get_empty_snapshot(key: tuple, date: str):
+    """기억해 둔 휴일 snapshot. 없거나 오늘 이후의 날짜이면 None"""
+    if not is_past_date(date):
+        return None
+    return _SNAPSHOT_CACHE.get(("empty",) + key)
+
+
+def _put_empty_snapshot(key: tuple, date: str, value):
+    """date가 휴일로 확인된 경우에만 빈 snapshot을 기억한다.
+
+    영업일의 빈 결과(일시적인 오류, 아직 공개되지 않은 데이터)는 기억하지 않는다.
+    """
+    if _is_holiday(date):
+        _SNAPSHOT_CACHE.put(("empty",) + key, value)
+
+
+def _get_alternative_snapshot(key: tuple, date: str, fetch) -> tuple:
+    """휴일 date를 대신할 이전 영업일과 그 날의 snapshot (fetch(target_date)의 결과)
+
+    과거의 휴일이면 결과를 휴일의 key로 기억해 두고, 같은 휴일을 다시 조회할 때는
+    이전 영업일의 snapshot을 다시 받지 않는다. 빈 결과는 기억하지 않는다.
+    """
+    key = ("alternative",) + key
+    if is_past_date(date):
+        cached = _SNAPSHOT_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    target_date = _get_previous_business_day(date)
+    value = fetch(target_date)
+    if is_past_date(date) and target_date != date and len(value) != 0:
+        _SNAPSHOT_CACHE.put(key, (target_date, value))
+    return target_date, value
+
+
+def _get_previous_business_day(date: str) -> str:
+    """휴일 date를 대신할 이전 영업일. 과거 날짜의 결과는 기억해 두고 재사용한다."""
+    key = ("previous_business_day", date)
+    if is_past_date(date):
+        target_date = _NEGATIVE_CACHE.get(key)
+        if target_date is not None:
+            return target_date
+
+    target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
+    if is_past_date(date):
+        _NEGATIVE_CACHE.put(key, target_date)
+    return target_date
+
+
+def clear_negative_cache():
+    """기억해 둔 휴일 snapshot과 대체 영업일을 모두 지운다."""
+    _NEGATIVE_CACHE.clear()
+    _SNAPSHOT_CACHE.clear()
+
+
+def get_negative_cache_stats() -> dict:
+    """휴일 snapshot cache의 항목 수와 hit/miss 횟수
+
+    Returns:
+        dict: {'entries': 12, 'hits': 30, 'misses': 12}
+    """
+    stats = _NEGATIVE_CACHE.stats()
+    for name, value in _SNAPSHOT_CACHE.stats().items():
+        stats[name] += value
+    return stats
+
+
 def get_market_ticker_list(date: str = None, market: str = "KOSPI") -> list:
     """티커 목록 조회
 
@@ -392,6 +483,46 @@ def get_market_ohlcv_by_date(
     return resample_ohlcv(df, freq, how)
 
 
+def iter_market_ohlcv_by_date(
+    fromdate: str,
+    todate: str,
+    ticker: str,
+    adjusted: bool = True,
+):
+    """특정 종목의 일자별 OHLCV를 KRX 응답 구간(2년) 단위로 나누어 조회
+
+    get_market_ohlcv_by_date()는 전체 기간의 응답을 모은 뒤 DataFrame 하나를
+    반환한다. 이 함수는 구간의 응답이 도착하는 대로 DataFrame을 반환하므로 장기간
+    데이터를 파일에 나누어 쓰거나 처리할 때 메모리를 적게 사용한다.
+
+    Args:
+        fromdate     (str           ): 조회 시작 일자 (YYYYMMDD)
+        todate       (str           ): 조회 종료 일자 (YYYYMMDD)
+        ticker       (str           ): 조회할 종목의 티커
+        adjusted     (bool, optional): 수정 종가 여부 (True/False)
+
+    Yields:
+        DataFrame: 구간별 OHLCV
+
+            >> for df in iter_market_ohlcv_by_date("19950101", "20221231", "005930"):
+            ..     print(df.index[0], len(df))
+            1995-01-03 00:00:00 497
+            1997-01-03 00:00:00 493
+            ...
+    """  # pylint: disable=line-too-long # noqa: E501
+
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+
+    yield from krx.iter_market_ohlcv_by_date(fromdate, todate, ticker, adjusted)
+
+
 @market_valid_check()
 def get_market_ohlcv_by_ticker(
     date, market: str = "KOSPI", alternative: bool = False
@@ -433,11 +564,16 @@ def get_market_ohlcv_by_ticker(
 
     date = date.replace("-", "")
 
-    df = krx.get_market_ohlcv_by_ticker(date, market)
+    key = ("get_market_ohlcv_by_ticker", date, market)
+    df = _get_empty_snapshot(key, date)
+    if df is None:
+        df = krx.get_market_ohlcv_by_ticker(date, market)
     holiday = (df[["시가", "고가", "저가", "종가"]] == 0).all(axis=None)
+    if holiday:
+        _put_empty_snapshot(key, date, df)
     if holiday and alternative:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
-        df = krx.get_market_ohlcv_by_ticker(target_date, market)
+        _, df = _get_alternative_snapshot(
+            key, date, lambda d: krx.get_market_ohlcv_by_ticker(d, market))
     return df
 
 
@@ -561,11 +697,17 @@ def get_market_cap_by_ticker(
 
     date = date.replace("-", "")
 
-    df = krx.get_market_cap_by_ticker(date, market, acending)
+    key = ("get_market_cap_by_ticker", date, market, acending)
+    df = _get_empty_snapshot(key, date)
+    if df is None:
+        df = krx.get_market_cap_by_ticker(date, market, acending)
     holiday = (df[["종가", "시가총액", "거래량", "거래대금"]] == 0).all(axis=None)
+    if holiday:
+        _put_empty_snapshot(key, date, df)
     if holiday and alternative:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
-        df = krx.get_market_cap_by_ticker(target_date, market, acending)
+        _, df = _get_alternative_snapshot(
+            key, date,
+            lambda d: krx.get_market_cap_by_ticker(d, market, acending))
     return df
 
 
@@ -912,11 +1054,17 @@ def get_market_fundamental_by_ticker(
 
     date = date.replace("-", "")
 
-    df = krx.get_market_fundamental_by_ticker(date, market)
+    key = ("get_market_fundamental_by_ticker", date, market)
+    df = _get_empty_snapshot(key, date)
+    if df is None:
+        df = krx.get_market_fundamental_by_ticker(date, market)
     holiday = (df[["BPS", "PER", "PBR", "EPS", "DIV", "DPS"]] == 0).all(axis=None)
+    if holiday:
+        _put_empty_snapshot(key, date, df)
     if holiday and alternative:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
-        df = krx.get_market_fundamental_by_ticker(target_date, market)
+        _, df = _get_alternative_snapshot(
+            key, date,
+            lambda d: krx.get_market_fundamental_by_ticker(d, market))
     return df
 
 
@@ -1462,18 +1610,24 @@ def get_index_portfolio_deposit_file(
 
     target_date = target_date.replace("-", "")
 
-    try:
-        pdf = krx.get_index_portfolio_deposit_file(target_date, ticker)
-    except PykrxRequestError:
-        if not fallback:
-            raise
-        return []
+    key = ("get_index_portfolio_deposit_file", target_date, ticker)
+    pdf = _get_empty_snapshot(key, target_date)
+    if pdf is None:
+        try:
+            pdf = krx.get_index_portfolio_deposit_file(target_date, ticker)
+        except PykrxRequestError:
+            if not fallback:
+                raise
+            return []
+        if len(pdf) == 0:
+            _put_empty_snapshot(key, target_date, pdf)
     # 주말 or 비영업일 여부를 확인하는 것 자체가 상대적으로 오랜 시간 걸려 lazy 판단
     # - 결과가 없으면 과거의 가장 가까운 영업일로 조회
     if len(pdf) == 0 and alternative:
-        target_date = get_nearest_business_day_in_a_week(target_date)
         try:
-            pdf = krx.get_index_portfolio_deposit_file(target_date, ticker)
+            target_date, pdf = _get_alternative_snapshot(
+                key, target_date,
+                lambda d: krx.get_index_portfolio_deposit_file(d, ticker))
         except PykrxRequestError:
             if not fallback:
                 raise
@@ -1486,6 +1640,41 @@ def get_index_portfolio_deposit_file(
     return pdf
 
 
+def get_index_constituent_history(
+    ticker: str, fromdate: str, todate: str, step: int = 20, max_workers: int = 4
+):
+    """기간 내 지수 구성 종목 이력 조회
+
+    Args:
+        ticker      (str          ): 조회 인덱스
+        fromdate    (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str          ): 조회 종료 일자 (YYYYMMDD)
+        step        (int, optional): 스냅샷 간격 (영업일)
+        max_workers (int, optional): 동시에 조회할 일자 수
+
+    NOTE: 2014년 5월 2일 까지만 조회 가능
+
+    Returns:
+        IndexConstituentHistory: (티커, 편입일, 편출일) 구간으로 저장된 이력
+
+            >> h = get_index_constituent_history("1028", "20210104", "20211230")
+            >> h.get("20210615")      # 특정 일자의 구성 종목 (네트워크 조회 없음)
+            >> h.changes()            # 편입/편출 내역
+    """
+
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+
+    return krx.get_index_constituent_history(
+        fromdate, todate, ticker, step=step, max_workers=max_workers
+    )
+
+
 def get_index_ohlcv(*args, **kwargs):
     """특정 종목의 지정된 기간 OHLCV 조회
     Args:
@@ -1576,8 +1765,11 @@ def get_index_ohlcv_by_ticker(
 
     date = date.replace("-", "")
 
+    key = ("get_index_ohlcv_by_ticker", date, market)
     try:
-        df = krx.get_index_ohlcv_by_ticker(date, market)
+        df = _get_empty_snapshot(key, date)
+        if df is None:
+            df = krx.get_index_ohlcv_by_ticker(date, market)
     except PykrxRequestError:
         if not fallback:
             raise
@@ -1609,10 +1801,12 @@ def get_index_ohlcv_by_ticker(
         ).set_index("지수명")
         return out[["시가", "고가", "저가", "종가", "거래량", "거래대금"]]
     holiday = (df[["시가", "고가", "저가", "종가"]] == 0).all(axis=None)
+    if holiday:
+        _put_empty_snapshot(key, date, df)
     if holiday and alternative:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
         try:
-            df = krx.get_index_ohlcv_by_ticker(target_date, market)
+            _, df = _get_alternative_snapshot(
+                key, date, lambda d: krx.get_index_ohlcv_by_ticker(d, market))
         except PykrxRequestError:
             if not fallback:
                 raise
@@ -1694,6 +1888,33 @@ def get_index_ohlcv_by_date(
     return resample_ohlcv(df, freq, how)
 
 
+def iter_index_ohlcv_by_date(fromdate: str, todate: str, ticker: str):
+    """인덱스의 일자별 OHLCV를 KRX 응답 구간(2년) 단위로 나누어 조회
+
+    Args:
+        fromdate     (str           ): 조회 시작 일자 (YYYYMMDD)
+        todate       (str           ): 조회 종료 일자 (YYYYMMDD)
+        ticker       (str           ): 조회 인덱스 티커
+
+    Yields:
+        DataFrame: 구간별 인덱스 OHLCV
+
+            >> for df in iter_index_ohlcv_by_date("20000101", "20221231", "1001"):
+            ..     df.to_csv("1001.csv", mode="a", header=False)
+    """
+
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+
+    yield from krx.iter_index_ohlcv_by_date(fromdate, todate, ticker)
+
+
 def get_index_fundamental(*args, **kwargs):
     """종목의 PER/PBR/배당수익률 조회
 
@@ -1777,8 +1998,11 @@ def get_index_fundamental_by_ticker(
 
     date = date.replace("-", "")
 
+    key = ("get_index_fundamental_by_ticker", date, market)
     try:
-        df = krx.get_index_fundamental_by_ticker(date, market)
+        df = _get_empty_snapshot(key, date)
+        if df is None:
+            df = krx.get_index_fundamental_by_ticker(date, market)
     except PykrxRequestError:
         if not fallback:
             raise
@@ -1811,10 +2035,13 @@ def get_index_fundamental_by_ticker(
     holiday = (df[["종가", "등락률", "PER", "선행PER", "PBR", "배당수익률"]] == 0).all(
         axis=None
     )
+    if holiday:
+        _put_empty_snapshot(key, date, df)
     if holiday and alternative:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
         try:
-            df = krx.get_index_fundamental_by_ticker(target_date, market)
+            _, df = _get_alternative_snapshot(
+                key, date,
+                lambda d: krx.get_index_fundamental_by_ticker(d, market))
         except PykrxRequestError:
             if not fallback:
                 raise
@@ -2102,12 +2329,18 @@ def get_shorting_value_by_ticker(
     if include is None:
         include = ["주식"]
 
-    df = krx.get_shorting_trading_value_and_volume_by_ticker(date, market, include)
-    if df.empty:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
+    key = ("get_shorting_trading_value_and_volume_by_ticker", date, market,
+           tuple(include))
+    df = _get_empty_snapshot(key, date)
+    if df is None:
         df = krx.get_shorting_trading_value_and_volume_by_ticker(
-            target_date, market, include
-        )
+            date, market, include)
+    if df.empty:
+        _put_empty_snapshot(key, date, df)
+        _, df = _get_alternative_snapshot(
+            key, date,
+            lambda d: krx.get_shorting_trading_value_and_volume_by_ticker(
+                d, market, include))
         if not alternative:
             df.loc[:] = 0
         return df["거래대금"]
@@ -2151,12 +2384,18 @@ def get_shorting_volume_by_ticker(
     if include is None:
         include = ["주식"]
 
-    df = krx.get_shorting_trading_value_and_volume_by_ticker(date, market, include)
-    if df.empty:
-        target_date = get_nearest_business_day_in_a_week(date=date, prev=True)
+    key = ("get_shorting_trading_value_and_volume_by_ticker", date, market,
+           tuple(include))
+    df = _get_empty_snapshot(key, date)
+    if df is None:
         df = krx.get_shorting_trading_value_and_volume_by_ticker(
-            target_date, market, include
-        )
+            date, market, include)
+    if df.empty:
+        _put_empty_snapshot(key, date, df)
+        _, df = _get_alternative_snapshot(
+            key, date,
+            lambda d: krx.get_shorting_trading_value_and_volume_by_ticker(
+                d, market, include))
         if not alternative:
             df.loc[:] = 0
         return df["거래량"]
@@ -2497,6 +2736,54 @@ def get_shorting_balance_by_date(fromdate: str, todate: str, ticker: str) -> Dat
     return krx.get_shorting_balance_by_date(fromdate, todate, ticker)
 
 
+@market_valid_check(["KOSPI", "KOSDAQ", "KONEX"])
+def get_shorting_balance_panel(
+    fromdate: str,
+    todate: str,
+    market: str = "KOSPI",
+    cache_dir: str = None,
+    max_workers: int = 4,
+) -> dict:
+    """일자 × 티커로 정리된 전종목 공매도 잔고/거래 현황
+
+    Args:
+        fromdate    (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str          ): 조회 종료 일자 (YYYYMMDD)
+        market      (str          ): 조회 시장 (KOSPI/KOSDAQ/KONEX)
+        cache_dir   (str, optional): 일자별 결과를 저장할 디렉터리. 지정하면
+                                     중단된 조회를 이어서 수행한다.
+                                     (Arrow IPC로 저장하므로 pyarrow 필요)
+        max_workers (int, optional): 동시에 조회할 일자 수
+
+    Returns:
+        dict: 필드별 (일자 × 티커) DataFrame
+
+            >> panel = get_shorting_balance_panel("20210125", "20210129")
+            >> panel["공매도잔고"]
+
+            티커         000020  000040  000050  000060  000070  ...
+            날짜
+            2021-01-25  10521.0     0.0   157.0  6711.0   402.0  ...
+            2021-01-26  10521.0     0.0   157.0  6533.0   402.0  ...
+            2021-01-27  10390.0     0.0   157.0  6551.0   392.0  ...
+
+            필드: 공매도잔고, 상장주식수, 공매도금액, 시가총액, 비중,
+                  공매도거래량, 공매도거래대금, 거래량비중, 거래대금비중
+    """  # pylint: disable=line-too-long # noqa: E501
+
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+
+    return krx.get_shorting_balance_panel(
+        fromdate, todate, market, cache_dir=cache_dir, max_workers=max_workers
+    )
+
+
 # -----------------------------------------------------------------------------
 # ETX API
 # -----------------------------------------------------------------------------
@@ -2826,6 +3113,47 @@ def get_etf_portfolio_deposit_file(ticker: str, date: str = None) -> DataFrame:
     return krx.get_etf_portfolio_deposit_file(date, ticker)
 
 
+def get_etf_portfolio_deposit_file_history(
+    ticker: str,
+    fromdate: str,
+    todate: str,
+    keyframe_interval: int = 20,
+    max_workers: int = 4,
+):
+    """기간 내 PDF 변경 이력 조회
+
+    Args:
+        ticker            (str          ): 조회 종목 티커
+        fromdate          (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate            (str          ): 조회 종료 일자 (YYYYMMDD)
+        keyframe_interval (int, optional): 전체 PDF를 저장할 영업일 간격
+        max_workers       (int, optional): 동시에 조회할 일자 수
+
+    Returns:
+        PortfolioDepositFileHistory: 일자별 PDF를 keyframe과 변경분으로 저장한 객체
+
+            >> h = get_etf_portfolio_deposit_file_history("152100", "20210104", "20211230")
+            >> h.get("20210615")          # 특정 일자의 PDF
+            >> h.changes("20210615")      # 전일 대비 추가/삭제/변경 종목
+    """  # pylint: disable=line-too-long # noqa: E501
+
+    if isinstance(fromdate, datetime.datetime):
+        fromdate = krx.datetime2string(fromdate)
+    if isinstance(todate, datetime.datetime):
+        todate = krx.datetime2string(todate)
+
+    fromdate = fromdate.replace("-", "")
+    todate = todate.replace("-", "")
+
+    return krx.get_etf_portfolio_deposit_file_history(
+        fromdate,
+        todate,
+        ticker,
+        keyframe_interval=keyframe_interval,
+        max_workers=max_workers,
+    )
+
+
 def get_etf_price_deviation(fromdate: str, todate: str, ticker: str) -> DataFrame:
     """괴리율 조회
 
@@ -3123,6 +3451,9 @@ def get_stock_major_changes(ticker: str) -> DataFrame:
     return krx.get_stock_major_changes(ticker)
 
 
+tracing.trace_module(globals(), "api")
+
+
 if __name__ == "__main__":
     pd.set_option("display.expand_frame_repr", False)
     # print(get_market_price_change_by_ticker(
@@ -0,0 +1,129 @@
+"""직전 영업일 snapshot을 응답 cache에 미리 받아 두는 warmup
+
+여러 작업이 같은 시각에 시작해 같은 전종목 데이터를 내려받는다면, 그 전에 warmup을
+한 번 실행해 응답 cache를 채워 둔다. 같은 cache를 사용하는 다른 프로세스의 pykrx
+호출은 KRX에 요청하지 않고 cache에서 응답을 읽는다.
+
+    >> from pykrx import warmup
+    >> warmup.run(["ohlcv", "cap", "fundamental"],
+    ..            cache="~/.cache/pykrx/responses.sqlite", max_workers=8)
+    {'date': '20240105', 'calls': 6, 'ok': 6, 'failed': [], 'elapsed': 4.1, ...}
+
+    $ python -m pykrx warmup --datasets ohlcv,cap,fundamental --workers 8
+
+다른 프로세스에서는 같은 경로를 krx.enable_response_cache()나 환경변수
+PYKRX_RESPONSE_CACHE로 지정한다.
+
+직전 영업일처럼 장이 끝난 지난 일자의 응답은 만료 없이 저장되므로 warmup 후 몇
+시간 뒤에 시작하는 작업도 cache를 사용한다. 공매도 통계처럼 늦게 공개되는 데이터와
+빈 응답은 cache의 recent_ttl 동안만 저장된다.
+"""
+import datetime
+import time
+
+from pykrx import batch, stock
+from pykrx.website.krx.cache import (
+    KrxResponseCache, get_response_cache, set_response_cache
+)
+
+__all__ = ["DATASETS", "previous_trading_day", "make_calls", "run"]
+
+_MARKETS = ("KOSPI", "KOSDAQ")
+
+# dataset 이름 -> (조회 일자, 시장 목록)의 call spec 목록 (pykrx.batch 형식)
+# NOTE: cache는 요청 파라미터 단위이므로 이후에 조회할 시장과 같은 시장을 받아 둔다.
+DATASETS = {
+    "ohlcv": lambda d, ms: [("get_market_ohlcv_by_ticker", d, m) for m in ms],
+    "cap": lambda d, ms: [("get_market_cap_by_ticker", d, m) for m in ms],
+    "fundamental": lambda d, ms: [("get_market_fundamental_by_ticker", d, m)
+                                  for m in ms],
+    "shorting": lambda d, ms: [("get_shorting_volume_by_ticker", d, m)
+                               for m in ms if m != "ALL"],
+    "investor": lambda d, ms: [("get_market_trading_value_by_investor", d, d, m)
+                               for m in ms],
+    "etf": lambda d, ms: [("get_etf_ohlcv_by_ticker", d)],
+    "index": lambda d, ms: [(name, d, m) for m in ms if m != "ALL"
+                            for name in ("get_index_ohlcv_by_ticker",
+                                         "get_index_fundamental_by_ticker")],
+}
+
+
+def previous_trading_day(date: str = None) -> str:
+    """date(기본값: 오늘) 이전의 가장 가까운 영업일
+
+    Returns:
+        str: 날짜 (YYYYMMDD)
+    """
+    if date is None:
+        today = datetime.date.today()
+    else:
+        today = datetime.datetime.strptime(date, "%Y%m%d").date()
+    yesterday = (today - datetime.timedelta(days=1)).strftime("%Y%m%d")
+    return stock.get_nearest_business_day_in_a_week(yesterday, prev=True)
+
+
+def make_calls(datasets=None, date: str = None, markets=_MARKETS) -> list:
+    """dataset 목록의 call spec 목록
+
+    Args:
+        datasets (list, optional): DATASETS의 이름 목록 (기본값: 전체)
+        date     (str,  optional): 조회 일자 (기본값: 직전 영업일)
+        markets  (list, optional): 조회할 시장 (KOSPI/KOSDAQ/KONEX/ALL)
+    """
+    if datasets is None:
+        datasets = list(DATASETS)
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown:
+        raise ValueError(f"unknown datasets: {unknown}. "
+                         f"choose from {list(DATASETS)}")
+    if date is None:
+        date = previous_trading_day()
+
+    calls = []
+    for name in datasets:
+        calls.extend(DATASETS[name](date, markets))
+    return calls
+
+
+def run(datasets=None, date: str = None, *, markets=_MARKETS, cache=None,
+        max_workers: int = 8, rate: float = None,
+        timeout: float = None) -> dict:
+    """dataset의 snapshot을 동시에 조회해 응답 cache에 저장
+
+    Args:
+        datasets    (list,  optional): DATASETS의 이름 목록 (기본값: 전체)
+        date        (str,   optional): 조회 일자 (기본값: 직전 영업일)
+        markets     (list,  optional): 조회할 시장 (기본값: KOSPI, KOSDAQ)
+        cache       (optional       ): KrxResponseCache 또는 데이터베이스 경로. 생략하면
+                                       설정된 cache(없으면 기본 경로)를 사용한다.
+        max_workers (int,   optional): 동시에 실행할 최대 호출 수
+        rate        (float, optional): 초당 시작할 수 있는 최대 호출 수
+        timeout     (float, optional): 호출 하나의 제한 시간 (초)
+
+    Returns:
+        dict: 조회 일자, 호출 수, 성공 수, 실패한 call spec과 오류, 걸린 시간 (초),
+              cache 통계
+    """
+    if isinstance(cache, KrxResponseCache):
+        set_response_cache(cache)
+    elif cache is not None:
+        set_response_cache(KrxResponseCache(cache))
+    elif get_response_cache() is None:
+        set_response_cache(KrxResponseCache())
+    cache = get_response_cache()
+
+    started = time.monotonic()
+    if date is None:
+        date = previous_trading_day()
+    calls = make_calls(datasets, date, markets)
+    results = batch.run(calls, max_workers=max_workers, rate=rate,
+                        timeout=timeout)
+    failed = [(r.spec, repr(r.error)) for r in results if not r.ok]
+    return {
+        "date": date,
+        "calls": len(results),
+        "ok": len(results) - len(failed),
+        "failed": failed,
+        "elapsed": time.monotonic() - started,
+        "cache": cache.stats(),
+    }
@@ -1,3 +1,6 @@
 from pykrx.website.comm.util import dataframe_empty_handler, singleton, PykrxRequestError
+from pykrx.website.comm.parallel import parallel_map, Checkpoint
+from pykrx.website.comm.ratelimit import RateLimiter
 
-__all__ = ['dataframe_empty_handler', 'singleton', 'PykrxRequestError']
+__all__ = ['dataframe_empty_handler', 'singleton', 'PykrxRequestError',
+           'parallel_map', 'Checkpoint', 'RateLimiter']
@@ -0,0 +1,68 @@
+"""휴일/데이터 없음 결과를 기억하는 negative cache
+
+전종목 snapshot 조회는 휴일이면 0으로 채워진(또는 빈) 결과를 반환한다. 같은 휴일을
+다시 조회할 때 요청을 반복하지 않도록 빈 결과와, 그 날짜를 대신할 영업일 및 그
+영업일의 결과를 기억한다. 오늘 이후의 날짜는 장 시작 전후로 결과가 바뀔 수 있으므로 기억하지
+않는다.
+"""
+import copy
+import datetime
+import threading
+from collections import OrderedDict
+
+
+def is_past_date(date: str) -> bool:
+    """YYYYMMDD 형식의 date가 오늘보다 이전인지 여부"""
+    try:
+        day = datetime.datetime.strptime(date, "%Y%m%d").date()
+    except (TypeError, ValueError):
+        return False
+    return day < datetime.date.today()
+
+
+class NegativeCache:
+    """크기가 제한된 LRU cache
+
+    Args:
+        maxsize (int, optional): 기억할 최대 항목 수
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """기억한 값의 복사본을 반환. 없으면 None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+        # 호출한 쪽에서 결과를 수정해도 cache에 영향이 없도록 복사한다
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "misses": self.misses}
+
+    def __len__(self):
+        return len(self._entries)
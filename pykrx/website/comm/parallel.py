@@ -0,0 +1,75 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pandas import DataFrame
+
+from pykrx.website.comm.util import dataframe_from_arrow, dataframe_to_arrow
+
+
+def parallel_map(func, items, max_workers: int = 4) -> list:
+    """items의 각 원소에 func을 스레드 풀에서 적용하고 입력 순서대로 반환
+
+    Args:
+        func        (callable): 원소 하나를 인자로 받는 함수
+        items       (iterable): 작업 목록
+        max_workers (int     ): 동시에 수행할 최대 작업 수
+
+    NOTE: 작업 중 예외가 발생하면 이미 제출된 작업이 모두 끝난 뒤 가장 앞선
+          작업의 예외가 전파된다.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(x) for x in items]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 호출한 쪽의 context(세션 바인딩, 요청 우선순위, tracing span)를
+        # worker에서도 사용한다
+        futures = [executor.submit(contextvars.copy_context().run, func, x)
+                   for x in items]
+    return [f.result() for f in futures]
+
+
+class Checkpoint:
+    """작업 단위 결과(DataFrame)를 디렉터리에 저장해 중단된 작업을 이어서 수행하도록 한다.
+
+    결과는 key 별로 하나의 Arrow IPC 파일(index와 dtype 포함)에 저장되며, 임시 파일에
+    기록한 뒤 rename 하므로 중간에 프로세스가 종료되어도 깨진 파일이 남지 않는다.
+    pyarrow가 필요하다 (pip install pykrx[export]).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.arrow"
+
+    def __contains__(self, key: str) -> bool:
+        return self._file(key).exists()
+
+    def load(self, key: str) -> DataFrame:
+        return dataframe_from_arrow(self._file(key).read_bytes())
+
+    def save(self, key: str, df: DataFrame):
+        dst = self._file(key)
+        tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(dataframe_to_arrow(df))
+        os.replace(tmp, dst)
+
+    def run(self, key: str, func, *args, **kwargs):
+        """key에 해당하는 결과가 있으면 읽어오고, 없으면 계산 후 저장
+
+        NOTE: 빈 DataFrame은 일시적인 조회 실패일 수 있어 저장하지 않는다.
+        """
+        if key in self:
+            try:
+                return self.load(key)
+            except Exception:
+                # 손상된 체크포인트는 다시 계산한다
+                pass
+        obj = func(*args, **kwargs)
+        if isinstance(obj, DataFrame) and not obj.empty:
+            self.save(key, obj)
+        return obj
@@ -0,0 +1,63 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """token bucket 방식의 호출 빈도 제한 (thread-safe)
+
+    Args:
+        rate  (float): 초당 허용 호출 수
+        burst (int  ): 한 번에 몰아서 허용할 수 있는 최대 호출 수
+
+    Example:
+        limiter = RateLimiter(2)     # 초당 2회
+        with limiter:
+            session.post(...)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate is None or rate <= 0:
+            raise ValueError("rate must be a positive number")
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> bool:
+        """토큰이 있으면 소비하고 True, 없으면 기다리지 않고 False"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: float = None) -> bool:
+        """토큰을 얻을 때까지 대기. timeout 내에 얻지 못하면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                if now >= deadline:
+                    return False
+                wait = min(wait, deadline - now)
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -0,0 +1,63 @@
+"""프로세스 간 결과 전달을 위한 공유 메모리 직렬화
+
+DataFrame의 column 배열은 pickle protocol 5의 out-of-band 버퍼로 분리해
+multiprocessing.shared_memory 블록 하나에 기록하고, 나머지 구조(index, dtype,
+문자열 column 등)만 작은 pickle로 전달한다. 받는 쪽은 블록을 읽어 객체를 복원한 뒤
+블록을 해제한다.
+
+블록은 import_shared()가 해제할 때까지 resource tracker에 등록된 채로 남는다. 받는
+쪽이 가져가지 않은 블록(시간 초과, 취소 등)은 tracker를 공유하는 프로세스가 모두
+종료될 때 tracker가 지운다. 만든 프로세스와 받는 프로세스가 같은 tracker를 쓰도록
+worker 프로세스를 만들기 전에 start_resource_tracker()를 호출한다.
+"""
+import os
+import pickle
+from multiprocessing import resource_tracker, shared_memory
+
+
+def start_resource_tracker():
+    """이후에 만드는 자식 프로세스가 이 프로세스의 resource tracker를 공유하게 한다."""
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+
+
+def export_shared(obj) -> tuple:
+    """obj를 공유 메모리에 기록하고 (header, 블록 이름, 버퍼 크기 목록)을 반환
+
+    NOTE: 블록은 import_shared()가 해제한다.
+    """
+    buffers = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    views = [b.raw() for b in buffers]
+    sizes = [v.nbytes for v in views]
+    if not sizes:
+        return header, None, sizes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        offset = 0
+        for view in views:
+            shm.buf[offset:offset + view.nbytes] = view.cast("B")
+            offset += view.nbytes
+        return header, shm.name, sizes
+    finally:
+        shm.close()
+
+
+def import_shared(handle: tuple):
+    """export_shared()가 반환한 handle로 객체를 복원하고 공유 메모리를 해제"""
+    header, name, sizes = handle
+    if name is None:
+        return pickle.loads(header)
+
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buffers, offset = [], 0
+        for size in sizes:
+            # 블록을 해제한 뒤에도 쓸 수 있도록 복사한다
+            buffers.append(bytearray(shm.buf[offset:offset + size]))
+            offset += size
+        return pickle.loads(header, buffers=buffers)
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,381 @@
+"""공개 API 호출에서 HTTP 요청까지의 tracing span
+
+span은 호출 단계(pykrx.layer)에 따라 중첩된다.
+
+- api   : pykrx.stock 등의 공개 함수 (get_market_price_change_by_ticker)
+- wrap  : website.krx/naver의 wrap 함수
+- core  : KrxWebIo/NaverWebIo 클래스의 fetch (전종목시세.fetch)
+- window: KRX 조회 구간 (2년 단위). 응답 cache를 사용했는지 기록한다
+- http  : 실제 HTTP 요청
+
+기본값은 no-op이며 exporter를 지정하면 끝난 span을 exporter.export([span])으로
+전달한다. span의 id, 시간(ns), status, attribute 이름은 OpenTelemetry 형식을
+따르므로 exporter에서 OpenTelemetry로 그대로 옮길 수 있다.
+
+    >> from pykrx import tracing
+    >> exporter = tracing.enable_tracing()
+    >> stock.get_market_price_change_by_ticker("20240102", "20240105")
+    >> print(exporter.format_tree())
+    get_market_price_change_by_ticker [api] 1520.3ms
+      get_nearest_business_day_in_a_week [api] 310.2ms
+        get_index_ohlcv_by_date [api] 310.0ms
+    ...
+    >> exporter.fan_out(min_count=2)
+    [{'parent': 'get_market_price_change_by_ticker', 'child': '...', 'count': 4, ...}]
+"""
+import contextvars
+import datetime
+import functools
+import inspect
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+LAYERS = ("api", "wrap", "core", "window", "http")
+
+_CURRENT = contextvars.ContextVar("pykrx_current_span", default=None)
+_EXPORTER = None
+
+# attribute 값으로 저장할 인자 문자열의 최대 길이
+_MAX_ARGS_LENGTH = 200
+# pykrx.args에 값을 그대로 기록하는 인자 type. 나머지는 type 이름만 기록한다
+_SCALAR_TYPES = (str, int, float, bool, type(None), datetime.date)
+
+
+class Span:
+    """하나의 호출 구간
+
+    Attributes:
+        name       (str ): span 이름
+        trace_id   (str ): 32자리 16진수
+        span_id    (str ): 16자리 16진수
+        parent_id  (str ): 부모 span의 span_id (최상위 span이면 None)
+        kind       (str ): INTERNAL / CLIENT
+        start_time (int ): 시작 시각 (epoch ns)
+        end_time   (int ): 종료 시각 (epoch ns)
+        status     (str ): UNSET / OK / ERROR
+        attributes (dict): OpenTelemetry attribute
+    """
+
+    def __init__(self, name: str, parent=None, kind: str = "INTERNAL",
+                 attributes: dict = None):
+        self.name = name
+        self.trace_id = (parent.trace_id if parent is not None
+                         else f"{random.getrandbits(128):032x}")
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status = "UNSET"
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        self.status = "ERROR"
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)[:_MAX_ARGS_LENGTH]
+
+    @property
+    def duration(self) -> float:
+        """걸린 시간 (초)"""
+        end = self.end_time if self.end_time is not None else time.time_ns()
+        return (end - self.start_time) / 1e9
+
+    def to_dict(self) -> dict:
+        """OpenTelemetry(OTLP JSON)와 같은 이름의 dict"""
+        return {
+            "name": self.name,
+            "context": {"trace_id": self.trace_id, "span_id": self.span_id},
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "status": {"status_code": self.status},
+            "attributes": dict(self.attributes),
+        }
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration * 1000:.1f}ms)"
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def get_current_span():
+    """현재 context의 span. tracing을 사용하지 않거나 span 밖이면 None"""
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name: str, *, layer: str = None, kind: str = "INTERNAL",
+         **attributes):
+    """with 블록을 하나의 span으로 기록한다. tracing이 꺼져 있으면 아무것도 하지 않는다.
+
+    Args:
+        name       (str): span 이름
+        layer      (str, optional): 호출 단계 (LAYERS). pykrx.layer attribute로 저장
+        kind       (str, optional): INTERNAL / CLIENT
+        attributes      : span attribute
+    """
+    exporter = _EXPORTER
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+
+    if layer is not None:
+        attributes["pykrx.layer"] = layer
+    current = Span(name, _CURRENT.get(), kind, attributes)
+    token = _CURRENT.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    else:
+        if current.status == "UNSET":
+            current.status = "OK"
+    finally:
+        _CURRENT.reset(token)
+        current.end_time = time.time_ns()
+        exporter.export([current])
+
+
+def _format_arg(value) -> str:
+    # DataFrame, list 등은 repr 비용이 크므로 type 이름만 남긴다
+    if isinstance(value, str):
+        return repr(value[:_MAX_ARGS_LENGTH])
+    if isinstance(value, _SCALAR_TYPES):
+        return repr(value)
+    return f"<{type(value).__name__}>"
+
+
+def _format_args(args, kwargs) -> str:
+    text = ", ".join([_format_arg(a) for a in args] +
+                     [f"{k}={_format_arg(v)}" for k, v in kwargs.items()])
+    return text[:_MAX_ARGS_LENGTH]
+
+
+def _traced_generator(func, span_name: str, layer: str, attributes: dict,
+                      method: bool):
+    """generator 함수의 호출을 처음 값을 요청할 때부터 끝날 때까지 하나의 span으로
+    기록한다.
+
+    generator 본문이 실행되는 동안에만 span을 현재 span으로 두므로, 값을 받는 쪽이
+    반복 사이에 호출한 함수는 이 span의 하위로 기록되지 않는다. 끝까지 소비하지 않고
+    닫은 generator의 span도 OK로 기록한다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        exporter = _EXPORTER
+        if exporter is None:
+            return (yield from func(*args, **kwargs))
+
+        shown = args[1:] if method else args
+        current = Span(span_name, _CURRENT.get(), "INTERNAL", dict(
+            attributes, **{"pykrx.layer": layer,
+                           "pykrx.args": _format_args(shown, kwargs)}))
+        gen = func(*args, **kwargs)
+        resume, value = gen.send, None
+        try:
+            while True:
+                token = _CURRENT.set(current)
+                try:
+                    item = resume(value)
+                finally:
+                    _CURRENT.reset(token)
+                try:
+                    resume, value = gen.send, (yield item)
+                except GeneratorExit:
+                    raise
+                except BaseException as e:
+                    # 받는 쪽이 throw()한 예외는 원래 generator에 전달한다
+                    resume, value = gen.throw, e
+        except StopIteration as e:
+            current.status = "OK"
+            return e.value
+        except GeneratorExit:
+            gen.close()
+            current.status = "OK"
+            raise
+        except BaseException as e:
+            current.record_exception(e)
+            raise
+        finally:
+            current.end_time = time.time_ns()
+            exporter.export([current])
+    return wrapper
+
+
+def traced(layer: str, name: str = None, *, method: bool = False):
+    """함수 호출을 span으로 기록하는 decorator
+
+    tracing이 꺼져 있으면 함수를 그대로 호출한다. method이면 첫 인자(self)는
+    pykrx.args attribute에서 제외한다. pykrx.args에는 문자열, 숫자, 날짜 인자만
+    값으로 기록하고 나머지는 type 이름으로 기록한다. generator 함수는 반복이
+    끝날 때까지를 하나의 span으로 기록한다.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        attributes = {"code.function": func.__name__,
+                      "code.namespace": func.__module__}
+        if inspect.isgeneratorfunction(func):
+            wrapper = _traced_generator(func, span_name, layer, attributes,
+                                        method)
+            wrapper.__traced__ = True
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _EXPORTER is None:
+                return func(*args, **kwargs)
+            shown = args[1:] if method else args
+            with span(span_name, layer=layer, **attributes,
+                      **{"pykrx.args": _format_args(shown, kwargs)}):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def trace_module(namespace: dict, layer: str):
+    """모듈에서 정의한 공개 함수를 모두 traced()로 감싼다.
+
+    모듈의 마지막에 trace_module(globals(), "api")처럼 호출한다. 모듈 안에서 다른
+    공개 함수를 호출하는 경우도 전역 이름을 통하므로 하위 span으로 기록된다.
+    generator 함수(iter_*)는 반복이 끝날 때까지를 하나의 span으로 기록한다.
+    """
+    module = namespace["__name__"]
+    for key, value in list(namespace.items()):
+        if (not key.startswith("_") and inspect.isfunction(value)
+                and value.__module__ == module
+                and not getattr(value, "__traced__", False)):
+            namespace[key] = traced(layer)(value)
+
+
+def trace_method(cls, method: str, layer: str):
+    """cls에서 정의한 method를 traced()로 감싼다 (상속한 method는 제외)."""
+    func = cls.__dict__.get(method)
+    if inspect.isfunction(func) and not getattr(func, "__traced__", False):
+        setattr(cls, method,
+                traced(layer, f"{cls.__name__}.{method}", method=True)(func))
+
+
+class InMemorySpanExporter:
+    """끝난 span을 메모리에 모아 두는 exporter
+
+    Args:
+        maxlen (int, optional): 보관할 최대 span 수. 넘으면 오래된 span부터 버린다
+    """
+
+    def __init__(self, maxlen: int = 100_000):
+        self.maxlen = maxlen
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        with self._lock:
+            self._spans.extend(spans)
+            if len(self._spans) > self.maxlen:
+                del self._spans[:len(self._spans) - self.maxlen]
+
+    @property
+    def spans(self) -> list:
+        """끝난 순서의 span 목록"""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans = []
+
+    def find(self, name: str = None, layer: str = None) -> list:
+        return [s for s in self.spans
+                if (name is None or s.name == name)
+                and (layer is None or s.attributes.get("pykrx.layer") == layer)]
+
+    def children(self, parent: Span) -> list:
+        """parent의 직접 하위 span (시작 순서)"""
+        return sorted((s for s in self.spans if s.parent_id == parent.span_id),
+                      key=lambda s: s.start_time)
+
+    def roots(self) -> list:
+        return sorted((s for s in self.spans if s.parent_id is None),
+                      key=lambda s: s.start_time)
+
+    def fan_out(self, min_count: int = 2) -> list:
+        """같은 부모 아래에서 같은 이름의 하위 span이 min_count번 이상 반복된 경우
+
+        한 번의 공개 API 호출이 같은 조회를 여러 번 반복하는 N+1 패턴을 찾는다.
+
+        Returns:
+            list: parent, child (span 이름), count (반복 횟수), seconds (반복된 span의
+                  시간 합계), trace_id의 dict 목록. 반복 횟수가 많은 순서
+        """
+        spans = self.spans
+        by_id = {s.span_id: s for s in spans}
+        groups = {}
+        for s in spans:
+            parent = by_id.get(s.parent_id)
+            if parent is None:
+                continue
+            group = groups.setdefault((parent.span_id, s.name), [parent, 0, 0.0])
+            group[1] += 1
+            group[2] += s.duration
+        result = [{"parent": parent.name, "child": child, "count": count,
+                   "seconds": seconds, "trace_id": parent.trace_id}
+                  for (_, child), (parent, count, seconds) in groups.items()
+                  if count >= min_count]
+        return sorted(result, key=lambda r: (-r["count"], -r["seconds"]))
+
+    def format_tree(self, trace_id: str = None) -> str:
+        """span을 호출 관계에 따라 들여 쓴 문자열"""
+        lines = []
+
+        def visit(s, depth):
+            layer = s.attributes.get("pykrx.layer")
+            label = f" [{layer}]" if layer else ""
+            error = " ERROR" if s.status == "ERROR" else ""
+            lines.append(f"{'  ' * depth}{s.name}{label} "
+                         f"{s.duration * 1000:.1f}ms{error}")
+            for child in self.children(s):
+                visit(child, depth + 1)
+
+        for root in self.roots():
+            if trace_id is None or root.trace_id == trace_id:
+                visit(root, 0)
+        return "\n".join(lines)
+
+
+def set_span_exporter(exporter):
+    """끝난 span을 전달할 exporter (export(spans) 메서드). None이면 tracing을 끈다."""
+    global _EXPORTER
+    _EXPORTER = exporter
+
+
+def get_span_exporter():
+    return _EXPORTER
+
+
+def enable_tracing(exporter=None):
+    """tracing을 켜고 사용하는 exporter를 반환한다.
+
+    Args:
+        exporter (optional): export(spans) 메서드가 있는 객체. 생략하면
+                             InMemorySpanExporter를 사용한다.
+    """
+    if exporter is None:
+        exporter = InMemorySpanExporter()
+    set_span_exporter(exporter)
+    return exporter
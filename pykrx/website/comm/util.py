@@ -1,4 +1,5 @@
 from pandas import DataFrame
+import functools
 import logging
 
 
@@ -7,6 +8,7 @@ class PykrxRequestError(RuntimeError):
 
 
 def dataframe_empty_handler(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
@@ -37,3 +39,37 @@ def singleton(class_):
             self._sealed = True
     class_w.__name__ = class_.__name__
     return class_w
+
+
+def import_pyarrow():
+    """pyarrow를 import한다. 설치되어 있지 않으면 설치 방법을 알려주는 ImportError"""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow IPC export. "
+            "Please install pyarrow (pip install pykrx[export])."
+        ) from e
+    return pyarrow
+
+
+def dataframe_to_arrow(df: DataFrame) -> bytes:
+    """DataFrame을 index, column, dtype을 보존하는 Arrow IPC file 형식으로 변환
+
+    >> dataframe_from_arrow(dataframe_to_arrow(df)).equals(df)
+    True
+    """
+    pa = import_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_arrow(data) -> DataFrame:
+    """dataframe_to_arrow로 변환한 bytes를 DataFrame으로 읽는다."""
+    pa = import_pyarrow()
+    return pa.ipc.open_file(pa.py_buffer(data)).read_all().to_pandas()
@@ -1,20 +1,114 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+
 import requests
 from abc import abstractmethod
 
+from pykrx.website.comm import tracing
+
 
+# 프로세스 기본 세션. use_http_session()으로 context 범위의 세션을 덮어쓸 수 있다.
 _HTTP_SESSION = None
+_CONTEXT_BINDING = contextvars.ContextVar("pykrx_http_session", default=None)
+_THREAD_LOCAL = threading.local()
+
+
+class _SessionBinding:
+    def __init__(self, session):
+        self.session = session
 
 
 def set_http_session(session):
+    """현재 바인딩의 세션을 교체한다.
+
+    use_http_session() 블록 안이라면 그 블록의 세션을, 아니면 프로세스 기본 세션을
+    교체한다. 다른 context/스레드에 바인딩된 세션에는 영향을 주지 않는다.
+    """
     global _HTTP_SESSION
-    _HTTP_SESSION = session
+    binding = _CONTEXT_BINDING.get()
+    if binding is not None:
+        binding.session = session
+    else:
+        _HTTP_SESSION = session
 
 
 def get_http_session():
+    binding = _CONTEXT_BINDING.get()
+    if binding is not None:
+        return binding.session
     return _HTTP_SESSION
 
 
+@contextmanager
+def use_http_session(session):
+    """with 블록(현재 스레드/asyncio task의 context) 안에서만 사용할 세션을 지정
+
+    Example:
+        with use_http_session(session):
+            stock.get_market_ohlcv("20220902")
+    """
+    token = _CONTEXT_BINDING.set(_SessionBinding(session))
+    try:
+        yield session
+    finally:
+        _CONTEXT_BINDING.reset(token)
+
+
+def _is_thread_affine(session) -> bool:
+    # curl handle은 여러 스레드에서 동시에 사용할 수 없다.
+    return type(session).__module__.startswith("curl_cffi")
+
+
+def _clone_session(session):
+    kwargs = {}
+    impersonate = getattr(session, "impersonate", None)
+    if impersonate:
+        kwargs["impersonate"] = impersonate
+    clone = type(session)(**kwargs)
+    clone.headers.update(session.headers)
+    for cookie in list(session.cookies.jar):
+        clone.cookies.jar.set_cookie(cookie)
+    return clone
+
+
+def get_thread_session(session):
+    """현재 스레드에서 사용할 세션
+
+    curl-cffi 세션은 스레드마다 쿠키/헤더를 복사한 세션을 만들어 재사용한다.
+    그 외의 세션(requests, 세션 브로커/풀 등)은 그대로 반환한다.
+    """
+    if session is None or not _is_thread_affine(session):
+        return session
+
+    cache = getattr(_THREAD_LOCAL, "sessions", None)
+    if cache is None:
+        cache = _THREAD_LOCAL.sessions = {}
+    entry = cache.get(id(session))
+    if entry is not None and entry[0] is session:
+        return entry[1]
+
+    if len(cache) >= 8:
+        cache.clear()
+    clone = _clone_session(session)
+    cache[id(session)] = (session, clone)
+    return clone
+
+
+def _traced_request(method: str, url: str, send):
+    with tracing.span(f"HTTP {method}", layer="http", kind="CLIENT",
+                      **{"http.request.method": method, "url.full": url}) as span:
+        resp = send()
+        span.set_attribute("http.response.status_code",
+                           getattr(resp, "status_code", None))
+        return resp
+
+
 class Get:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        tracing.trace_method(cls, "fetch", "core")
+
     def __init__(self):
         self.headers = {
             "User-Agent": "Mozilla/5.0", 
@@ -22,12 +116,12 @@ class Get:
         }
 
     def read(self, **params):
-        session = get_http_session()
+        session = get_thread_session(get_http_session())
         if session is None:
-            resp = requests.get(self.url, headers=self.headers, params=params)
-        else:
-            resp = session.get(self.url, headers=self.headers, params=params)
-        return resp
+            return _traced_request("GET", self.url, lambda: requests.get(
+                self.url, headers=self.headers, params=params))
+        return _traced_request("GET", self.url, lambda: session.get(
+            self.url, headers=self.headers, params=params))
 
     @property
     @abstractmethod
@@ -36,6 +130,10 @@ class Get:
 
 
 class Post:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        tracing.trace_method(cls, "fetch", "core")
+
     def __init__(self, headers=None):
         self.headers = {
             "User-Agent": "Mozilla/5.0",
@@ -45,12 +143,12 @@ class Post:
             self.headers.update(headers)
 
     def read(self, **params):
-        session = get_http_session()
+        session = get_thread_session(get_http_session())
         if session is None:
-            resp = requests.post(self.url, headers=self.headers, data=params)
-        else:
-            resp = session.post(self.url, headers=self.headers, data=params)
-        return resp
+            return _traced_request("POST", self.url, lambda: requests.post(
+                self.url, headers=self.headers, data=params))
+        return _traced_request("POST", self.url, lambda: session.post(
+            self.url, headers=self.headers, data=params))
 
     @property
     @abstractmethod
@@ -1,17 +1,31 @@
 import datetime
 
 from .bond import *
+from .broker import KrxSessionBroker, start_session_broker, use_session_broker
+from .cache import KrxResponseCache, enable_response_cache, set_response_cache
 from .etx import *
 from .future import *
+from .hooks import (
+    MetricsCollector, add_hook, enable_metrics, get_metrics_collector,
+    remove_hook, set_metrics_collector
+)
 from .krxio import (
     clear_session_file,
     enable_auto_login,
+    get_login_metrics,
     is_auto_login_enabled,
     krx_extend_session,
     krx_login,
     krx_start_keepalive,
+    krx_start_session_refresher,
 )
 from .market import *
+from .pool import KrxSessionPool, use_session_pool
+from .throttle import (
+    AdaptiveConcurrencyLimiter, RequestDispatcher, enable_adaptive_concurrency,
+    enable_request_dispatcher, request_priority, set_concurrency_limiter,
+    set_request_dispatcher
+)
 
 
 def login(*args, **kwargs):
@@ -26,10 +40,16 @@ def start_keepalive(*args, **kwargs):
     return krx_start_keepalive(*args, **kwargs)
 
 
+def start_session_refresher(**kwargs):
+    return krx_start_session_refresher(**kwargs)
+
+
 def enable_auto_login_on_failure(
-    enabled: bool = True, *, allow_dup_login: bool = False
+    enabled: bool = True, *, allow_dup_login: bool = False,
+    cross_process: bool = False
 ):
-    return enable_auto_login(enabled, allow_dup_login=allow_dup_login)
+    return enable_auto_login(enabled, allow_dup_login=allow_dup_login,
+                             cross_process=cross_process)
 
 
 def auto_login_on_failure_enabled() -> bool:
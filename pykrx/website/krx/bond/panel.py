@@ -0,0 +1,74 @@
+from pandas import DataFrame
+import pandas as pd
+
+from pykrx.website.comm import parallel_map
+from pykrx.website.comm.negcache import NegativeCache, is_past_date
+from pykrx.website.krx.bond.wrap import get_otc_treasury_yields_by_date
+
+# 국고채 만기 (년)
+TREASURY_TENORS = {
+    "국고채1년": 1.0,
+    "국고채2년": 2.0,
+    "국고채3년": 3.0,
+    "국고채5년": 5.0,
+    "국고채10년": 10.0,
+    "국고채20년": 20.0,
+    "국고채30년": 30.0,
+}
+
+
+# 최근에 조회한 기간의 만기별 결과 (LRU)
+_YIELDS_CACHE = NegativeCache(maxsize=64)
+
+
+def _get_yields_by_date(fromdate: str, todate: str, ticker: str) -> DataFrame:
+    key = (fromdate, todate, ticker)
+    df = _YIELDS_CACHE.get(key)
+    if df is None:
+        df = get_otc_treasury_yields_by_date(fromdate, todate, ticker)
+        # 조회 실패로 비어 있는 결과와 당일 수익률이 바뀔 수 있는 오늘 이후를
+        # 포함한 기간은 캐시하지 않는다
+        if not df.empty and is_past_date(todate):
+            _YIELDS_CACHE.put(key, df)
+    return df
+
+
+def get_otc_treasury_yield_curve(fromdate: str, todate: str,
+                                 max_workers: int = 4) -> DataFrame:
+    """기간 내 국고채 장외 수익률 곡선
+
+    만기별 [14017] 장외 채권수익률 개별추이를 동시에 조회해 (일자 × 만기) 배열로
+    정리한다. 오늘 이전에 끝나는 기간의 만기별 조회 결과는 메모리에 캐시되어 반복
+    호출 시 네트워크 요청이 발생하지 않는다. 개별추이는 영업일만 반환하므로 휴일 보정을
+    위한 추가 조회도 필요 없다.
+
+    Args:
+        fromdate    (str): 조회 시작 일자 (YYYYMMDD)
+        todate      (str): 조회 종료 일자 (YYYYMMDD)
+        max_workers (int): 동시에 조회할 만기 수
+
+    Returns:
+        DataFrame: 일자 index, 만기(년) column의 수익률
+
+            >> get_otc_treasury_yield_curve("20220104", "20220106")
+
+            만기         1.0    2.0    3.0    5.0   10.0   20.0   30.0
+            일자
+            2022-01-04  1.375  1.717  1.884  2.119  2.358  2.383  2.309
+            2022-01-05  1.410  1.791  1.975  2.205  2.431  2.445  2.363
+            2022-01-06  1.434  1.878  2.056  2.277  2.477  2.480  2.397
+    """
+    tickers = list(TREASURY_TENORS)
+    frames = parallel_map(
+        lambda t: _get_yields_by_date(fromdate, todate, t), tickers,
+        max_workers)
+
+    # 수익률은 소수점 셋째 자리까지 공시된다. float32에서 변환하며 생기는 오차를
+    # 반올림으로 없앤다 (1.717 -> 1.7170000076293945 -> 1.717)
+    series = {TREASURY_TENORS[t]: df['수익률'].astype(float).round(3)
+              for t, df in zip(tickers, frames) if not df.empty}
+    if not series:
+        return DataFrame()
+    df = pd.concat(series, axis=1).sort_index()
+    df.columns.name = '만기'
+    return df
@@ -1,4 +1,4 @@
-from pykrx.website.comm import dataframe_empty_handler
+from pykrx.website.comm import dataframe_empty_handler, tracing
 from pykrx.website.krx.bond.core import (
     전종목_장외채권수익률, 개별추이_장외채권수익률
 )
@@ -97,6 +97,9 @@ def get_otc_treasury_yields_by_date(fromdate: str, todate: str, ticker: str) \
     return df.sort_index()
 
 
+tracing.trace_module(globals(), "wrap")
+
+
 if __name__ == "__main__":
     pd.set_option('display.width', None)
     # df = get_otc_treasury_yields_by_ticker("20220204")
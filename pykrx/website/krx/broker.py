@@ -0,0 +1,395 @@
+"""로그인된 KRX 세션을 여러 프로세스가 공유하기 위한 로컬 세션 브로커
+
+브로커 프로세스 하나가 Unix socket을 열고 인증 세션을 소유한다. worker 프로세스는
+직접 로그인하지 않고 요청을 브로커에 전달하며, 브로커는 다음을 담당한다.
+
+- 단일 로그인: 세션 만료(LOGOUT) 시 브로커만 재로그인한다.
+- keepalive: 주기적으로 krx_extend_session을 호출하고 실패하면 재로그인한다.
+- 전역 rate limit: 모든 worker의 요청에 하나의 호출 빈도 제한을 적용한다.
+
+브로커 실행:
+
+    $ python -m pykrx.website.krx.broker --rate 2
+
+worker 설정 (환경변수 또는 API):
+
+    $ export KRX_BROKER_SOCKET=~/.config/krx-session/broker.sock
+
+    >> from pykrx.website import krx
+    >> krx.use_session_broker()
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+
+import pykrx.website.krx.krxio as krxio
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.util import PykrxRequestError
+from pykrx.website.krx.krxio import (
+    _get_session_file_path, _is_logout_response, _load_session_from_file,
+    krx_extend_session, krx_login
+)
+
+_ALLOWED_URL_PREFIXES = ("https://data.krx.co.kr/", "http://data.krx.co.kr/")
+_HEADER = struct.Struct("!I")
+
+
+def get_default_broker_socket_path() -> Path:
+    """세션 파일과 같은 디렉터리의 broker.sock"""
+    return _get_session_file_path().parent / "broker.sock"
+
+
+def _send_message(sock, obj):
+    payload = json.dumps(obj).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("broker connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_message(sock):
+    (n,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, n).decode("utf-8"))
+
+
+class BrokerResponse:
+    """브로커가 전달한 HTTP 응답 (requests.Response의 필요한 부분만 흉내낸다)"""
+
+    def __init__(self, status_code: int, headers: dict, text: str):
+        self.status_code = status_code
+        self.headers = {str(k).lower(): v for k, v in headers.items()}
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class KrxBrokerSession:
+    """브로커에 요청을 전달하는 session 객체
+
+    get/post 인터페이스가 requests/curl-cffi의 Session과 같아 webio의 전역 HTTP
+    세션으로 그대로 주입할 수 있다.
+    """
+
+    # KrxWebIo가 세션 만료 시 전역 세션을 지우지 않고 relogin()을 호출하도록 한다.
+    manages_login = True
+
+    def __init__(self, socket_path=None, timeout: float = 120):
+        if socket_path is None:
+            socket_path = get_default_broker_socket_path()
+        self.socket_path = str(Path(socket_path).expanduser())
+        self.timeout = timeout
+        self.generation = None
+
+    def _call(self, message: dict) -> dict:
+        if not hasattr(socket, "AF_UNIX"):
+            raise PykrxRequestError("KRX session broker requires Unix sockets.")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                _send_message(sock, message)
+                reply = _recv_message(sock)
+        except OSError as e:
+            raise PykrxRequestError(
+                f"KRX session broker is not reachable ({self.socket_path})."
+            ) from e
+
+        if "error" in reply:
+            raise PykrxRequestError(f"KRX session broker error: {reply['error']}")
+        if reply.get("generation") is not None:
+            self.generation = reply["generation"]
+        return reply
+
+    def request(self, method: str, url: str, headers=None, params=None,
+                data=None, timeout=None) -> BrokerResponse:
+        reply = self._call({
+            "op": "request",
+            "method": method,
+            "url": url,
+            "headers": dict(headers or {}),
+            "params": params,
+            "data": data,
+            "timeout": timeout,
+        })
+        return BrokerResponse(reply["status_code"], reply["headers"],
+                              reply["text"])
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        return self.request("GET", url, headers=headers, params=params,
+                            timeout=timeout)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        return self.request("POST", url, headers=headers, data=data,
+                            timeout=timeout)
+
+    def relogin(self):
+        """브로커에 재로그인을 요청한다.
+
+        다른 worker가 이미 재로그인을 유발했다면(세대가 바뀌었다면) 브로커는 다시
+        로그인하지 않는다.
+        """
+        return self._call({"op": "relogin", "generation": self.generation})
+
+    def status(self) -> dict:
+        return self._call({"op": "status"})
+
+
+class _BrokerRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        broker = self.server.broker
+        try:
+            message = _recv_message(self.request)
+        except Exception:
+            return
+        try:
+            reply = broker.dispatch(message)
+        except Exception as e:
+            reply = {"error": str(e)}
+        try:
+            _send_message(self.request, reply)
+        except OSError:
+            pass
+
+
+class _BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class KrxSessionBroker:
+    """로그인된 KRX 세션을 소유하고 worker의 요청을 대신 수행하는 브로커
+
+    Args:
+        socket_path       (str,   optional): Unix socket 경로
+        rate              (float, optional): 전체 worker에 적용할 초당 요청 수
+        keepalive_seconds (int,   optional): 세션 연장 주기 (초)
+        session           (optional       ): 이미 로그인된 세션
+        allow_dup_login   (bool,  optional): 중복 로그인(CD011) 시 강제 로그인.
+                                             생략하면 enable_auto_login 설정을 따른다.
+    """
+
+    def __init__(self, socket_path=None, *, rate: float = None,
+                 keepalive_seconds: int = 25 * 60, session=None,
+                 allow_dup_login: bool = None):
+        if socket_path is None:
+            socket_path = get_default_broker_socket_path()
+        self.socket_path = Path(socket_path).expanduser()
+        self.keepalive_seconds = keepalive_seconds
+        self.allow_dup_login = allow_dup_login
+        self._limiter = RateLimiter(rate, burst=1) if rate else None
+        self._session = session
+        self._generation = 0
+        self._session_lock = threading.Lock()
+        self._login_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+        self._threads = []
+        self.stats = {"requests": 0, "logins": 0, "extends": 0,
+                      "extend_failures": 0}
+
+    # -- session --------------------------------------------------------------
+    def _ensure_session(self):
+        if self._session is None:
+            with self._login_lock:
+                if self._session is None:
+                    session = _load_session_from_file()
+                    if session is None:
+                        session = self._login()
+                    self._session = session
+        return self._session
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _login(self):
+        allow_dup_login = self.allow_dup_login
+        if allow_dup_login is None:
+            allow_dup_login = krxio._AUTO_LOGIN_ALLOW_DUP_LOGIN
+        session, _ = krx_login(set_global_session=False,
+                               save_session_file=False,
+                               allow_dup_login=allow_dup_login)
+        self._count("logins")
+        return session
+
+    def relogin(self, generation=None) -> int:
+        """세션을 새로 로그인한다. generation이 현재와 다르면 건너뛴다."""
+        with self._login_lock:
+            if generation is not None and generation != self._generation:
+                return self._generation
+            self._session = self._login()
+            self._generation += 1
+            return self._generation
+
+    def _perform(self, session, message):
+        method = message.get("method", "POST").upper()
+        kwargs = {"headers": message.get("headers") or {}}
+        if message.get("timeout") is not None:
+            kwargs["timeout"] = message["timeout"]
+        with self._session_lock:
+            if method == "GET":
+                return session.get(message["url"],
+                                   params=message.get("params"), **kwargs)
+            return session.post(message["url"], data=message.get("data"),
+                                **kwargs)
+
+    def _request(self, message: dict) -> dict:
+        url = message.get("url") or ""
+        if not url.startswith(_ALLOWED_URL_PREFIXES):
+            raise PykrxRequestError(f"URL is not allowed: {url}")
+
+        if self._limiter is not None:
+            self._limiter.acquire()
+
+        session = self._ensure_session()
+        generation = self._generation
+        resp = self._perform(session, message)
+        if _is_logout_response(resp):
+            # 이 브로커만 재로그인하고 한 번 더 시도한다.
+            generation = self.relogin(generation)
+            resp = self._perform(self._session, message)
+        self._count("requests")
+
+        headers = getattr(resp, "headers", None) or {}
+        return {
+            "status_code": getattr(resp, "status_code", None),
+            "headers": {k: v for k, v in headers.items()},
+            "text": getattr(resp, "text", "") or "",
+            "generation": generation,
+        }
+
+    def dispatch(self, message: dict) -> dict:
+        op = message.get("op")
+        if op == "request":
+            return self._request(message)
+        if op == "relogin":
+            return {"generation": self.relogin(message.get("generation"))}
+        if op == "status":
+            return {"generation": self._generation,
+                    "logged_in": self._session is not None, **self.stats}
+        raise PykrxRequestError(f"unknown broker op: {op}")
+
+    # -- lifecycle ------------------------------------------------------------
+    def _keepalive(self):
+        while not self._stop.wait(self.keepalive_seconds):
+            if self._session is None:
+                continue
+            try:
+                with self._session_lock:
+                    krx_extend_session(session=self._session)
+                self._count("extends")
+            except Exception:
+                self._count("extend_failures")
+                try:
+                    self.relogin(self._generation)
+                except Exception:
+                    continue
+
+    def start(self):
+        """별도 스레드에서 브로커를 실행한다."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise PykrxRequestError("KRX session broker requires Unix sockets.")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        # socket은 소유자만 접근할 수 있도록 생성한다.
+        umask = os.umask(0o177)
+        try:
+            self._server = _BrokerServer(str(self.socket_path),
+                                         _BrokerRequestHandler)
+        finally:
+            os.umask(umask)
+        self._server.broker = self
+
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._keepalive, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 브로커를 실행한다 (Ctrl+C로 종료)."""
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+
+def start_session_broker(socket_path=None, **kwargs) -> KrxSessionBroker:
+    """현재 프로세스에서 세션 브로커를 백그라운드로 실행"""
+    return KrxSessionBroker(socket_path, **kwargs).start()
+
+
+def get_broker_session():
+    """KRX_BROKER_SOCKET이 설정되어 있고 socket이 존재하면 브로커 세션을 반환"""
+    path = os.getenv("KRX_BROKER_SOCKET")
+    if not path:
+        return None
+    path = Path(path).expanduser()
+    if not path.exists():
+        return None
+    return KrxBrokerSession(path)
+
+
+def use_session_broker(socket_path=None) -> KrxBrokerSession:
+    """이 프로세스의 KRX 요청을 브로커를 통해 수행하도록 설정"""
+    from pykrx.website.comm.webio import set_http_session
+
+    session = KrxBrokerSession(socket_path)
+    set_http_session(session)
+    return session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KRX session broker")
+    parser.add_argument("--socket", default=None,
+                        help="Unix socket path (default: next to session.json)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="global requests per second")
+    parser.add_argument("--keepalive", type=int, default=25 * 60,
+                        help="session extend interval in seconds")
+    parser.add_argument("--allow-dup-login", action="store_true")
+    args = parser.parse_args(argv)
+
+    broker = KrxSessionBroker(args.socket, rate=args.rate,
+                              keepalive_seconds=args.keepalive,
+                              allow_dup_login=args.allow_dup_login)
+    print(f"KRX session broker listening on {broker.socket_path}")
+    broker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
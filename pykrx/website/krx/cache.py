@@ -0,0 +1,708 @@
+"""여러 프로세스가 함께 사용하는 KRX 응답 cache
+
+KrxWebIo의 응답(JSON)을 SQLite 데이터베이스에 압축해 저장한다. WAL 모드를 사용하므로
+여러 프로세스가 동시에 읽고 쓸 수 있고, 한 프로세스가 받은 응답을 다른 프로세스가
+바로 재사용한다. 기간 조회는 2년 단위 구간별로 저장된다.
+
+    >> from pykrx.website import krx
+    >> krx.enable_response_cache("~/.cache/pykrx/responses.sqlite")
+
+환경변수 PYKRX_RESPONSE_CACHE에 경로를 지정하면 코드 수정 없이 모든 프로세스가 같은
+cache를 사용한다.
+
+조회 일자(trdDd/endDd)가 오늘 이전이고 데이터가 있는 응답은 바뀌지 않으므로 만료
+없이 저장한다. KRX가 늦게 공개하는 데이터(late_blds, 기본값은 공매도 통계. 공매도
+잔고는 T+2)는 최근 일자의 응답이 나중에 바뀔 수 있으므로 조회 일자가 settle_days일
+이내이면 recent_ttl(초) 동안만 저장한다. 빈 응답도 너무 일찍 조회했을 수 있으므로
+recent_ttl 동안만 저장한다. 오늘 이후이거나 일자가 없는 응답은 volatile_ttl(초)이
+지정된 경우에만 그 시간 동안 저장한다.
+
+응답 본문은 내용의 hash(sha256)로 한 번만 저장한다. 휴일에 이전 영업일 데이터가
+반환되는 경우처럼 파라미터가 달라도 같은 응답은 공간을 차지하지 않는다. 본문은
+zstandard가 설치되어 있으면 zstd로, 아니면 zlib으로 압축하며, bld별로 충분한 응답이
+모이면 압축 사전을 만들어 반복되는 column 이름/종목 코드를 줄인다.
+"""
+import atexit
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from pandas import DataFrame
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_SCHEMA_VERSION = 3
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    bld      TEXT NOT NULL,
+    params   TEXT NOT NULL,
+    fromdate TEXT,
+    todate   TEXT,
+    ticker   TEXT,
+    digest   TEXT NOT NULL,
+    created  REAL NOT NULL,
+    expires  REAL
+);
+CREATE INDEX IF NOT EXISTS responses_bld ON responses (bld, todate);
+CREATE INDEX IF NOT EXISTS responses_digest ON responses (digest);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest   TEXT PRIMARY KEY,
+    bld      TEXT NOT NULL,
+    codec    TEXT NOT NULL,
+    dict_id  INTEGER,
+    raw_size INTEGER NOT NULL,
+    data     BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_bld ON blobs (bld, dict_id);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id      INTEGER PRIMARY KEY,
+    bld     TEXT NOT NULL UNIQUE,
+    codec   TEXT NOT NULL,
+    data    BLOB NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    bld       TEXT PRIMARY KEY,
+    hits      INTEGER NOT NULL DEFAULT 0,
+    misses    INTEGER NOT NULL DEFAULT 0,
+    stores    INTEGER NOT NULL DEFAULT 0,
+    hit_bytes INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_COUNTERS = ("hits", "misses", "stores", "hit_bytes")
+
+_DECODE_ERRORS = (ValueError, zlib.error)
+if zstandard is not None:
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+# zlib preset dictionary의 최대 크기 (window 크기)
+_ZLIB_DICT_SIZE = 32 * 1024
+_ZSTD_DICT_SIZE = 64 * 1024
+
+# 최근 일자의 응답이 나중에 바뀔 수 있는 (KRX가 늦게 공개하는) bld의 접두어
+LATE_BLDS = ("dbms/MDC/STAT/srt/",)
+
+# cache key와 목록 조회에서 종목을 나타내는 파라미터
+_TICKER_PARAMS = ("isuCd", "indIdx2")
+
+
+def resolve_bld(dataset: str) -> list:
+    """KrxWebIo 클래스 이름(예: 전종목시세)이나 bld를 bld 목록으로 변환
+
+    같은 이름의 클래스가 여러 모듈(주식/ETF/...)에 있으면 모든 bld를 반환한다.
+    클래스 이름이 아니면 [dataset]을 반환하며, 목록/삭제에서 bld의 접미어로도
+    비교한다 (예: MDCSTAT01501).
+    """
+    from pykrx.website import krx  # noqa: F401 - 모든 KrxWebIo 클래스를 등록한다
+    from pykrx.website.krx.krxio import KrxWebIo
+
+    blds, pending = [], list(KrxWebIo.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if cls.__name__ == dataset:
+            blds.append(cls.bld.fget(None))
+    return sorted(set(blds)) or [dataset]
+
+
+def _timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def _default_cache_path() -> Path:
+    return Path("~/.cache/pykrx/responses.sqlite").expanduser()
+
+
+def _is_empty(data) -> bool:
+    """output/OutBlock_1 등의 행 목록이 모두 비어 있는 응답인지 여부"""
+    if not isinstance(data, dict):
+        return not data
+    return not any(v for v in data.values() if isinstance(v, list))
+
+
+def _params_dates(params: dict):
+    if "trdDd" in params:
+        return params["trdDd"], params["trdDd"]
+    return params.get("strtDd"), params.get("endDd")
+
+
+def _params_ticker(params: dict):
+    for name in _TICKER_PARAMS:
+        if params.get(name):
+            if name == "indIdx2":
+                return f"{params.get('indIdx', '')}{params[name]}"
+            return str(params[name])
+    return None
+
+
+def _canonical_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def _compress(codec: str, raw: bytes, dictionary: bytes = None,
+              level: int = None) -> bytes:
+    if codec == "zstd":
+        kwargs = {"level": level or 3}
+        if dictionary is not None:
+            kwargs["dict_data"] = zstandard.ZstdCompressionDict(dictionary)
+        return zstandard.ZstdCompressor(**kwargs).compress(raw)
+
+    kwargs = {"zdict": dictionary} if dictionary is not None else {}
+    c = zlib.compressobj(level or 6, **kwargs)
+    return c.compress(raw) + c.flush()
+
+
+def _decompress(codec: str, data: bytes, dictionary: bytes = None) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        kwargs = {}
+        if dictionary is not None:
+            kwargs["dict_data"] = zstandard.ZstdCompressionDict(dictionary)
+        return zstandard.ZstdDecompressor(**kwargs).decompress(data)
+
+    kwargs = {"zdict": dictionary} if dictionary is not None else {}
+    d = zlib.decompressobj(**kwargs)
+    return d.decompress(data) + d.flush()
+
+
+def _train_dictionary(codec: str, samples: list):
+    if codec == "zstd":
+        try:
+            return zstandard.train_dictionary(_ZSTD_DICT_SIZE, samples).as_bytes()
+        except zstandard.ZstdError:
+            return None
+    # zlib은 사전의 뒤쪽 문자열을 가장 싸게 참조하므로 최근 응답을 뒤에 둔다
+    return b"".join(samples)[-_ZLIB_DICT_SIZE:] or None
+
+
+class KrxResponseCache:
+    """SQLite(WAL) 기반의 KRX 응답 cache
+
+    Args:
+        path               (str,   optional): 데이터베이스 경로
+                                              (기본값: ~/.cache/pykrx/responses.sqlite)
+        volatile_ttl       (float, optional): 오늘 이후 일자/일자가 없는 응답의 보관 시간
+                                              (초). 0이면 저장하지 않는다.
+        settle_days        (int,   optional): late_blds의 응답은 조회 일자가 이 일수
+                                              이내이면 아직 바뀔 수 있는 것으로 본다
+        recent_ttl         (float, optional): 최근 일자(late_blds)/빈 응답의 보관 시간
+                                              (초). 0이면 저장하지 않는다.
+        late_blds          (tuple, optional): 늦게 공개되는 데이터의 bld 접두어
+        timeout            (float, optional): 다른 프로세스의 쓰기를 기다리는 최대 시간 (초)
+        codec              (str,   optional): zstd / zlib (기본값: zstandard가 있으면 zstd)
+        level              (int,   optional): 압축 수준
+        dictionary_samples (int,   optional): bld별 압축 사전을 만들 응답 수. 0이면 사전을
+                                              사용하지 않는다.
+    """
+
+    def __init__(self, path=None, volatile_ttl: float = 0,
+                 settle_days: int = 7, recent_ttl: float = 3600,
+                 late_blds: tuple = LATE_BLDS, timeout: float = 30.0, codec: str = None, level: int = None,
+                 dictionary_samples: int = 32):
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "zlib"
+        if codec not in ("zstd", "zlib"):
+            raise ValueError("codec must be 'zstd' or 'zlib'")
+        if codec == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstandard is required for the zstd codec. "
+                "Please install zstandard.")
+
+        self.path = Path(path).expanduser() if path else _default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.volatile_ttl = volatile_ttl
+        self.settle_days = settle_days
+        self.recent_ttl = recent_ttl
+        self.late_blds = tuple(late_blds)
+        self.timeout = timeout
+        self.codec = codec
+        self.level = level
+        self.dictionary_samples = dictionary_samples
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+        # bld별 조회 횟수는 모아 두었다가 주기적으로 데이터베이스에 더한다
+        self._pending = {}
+        self._flushed_at = time.monotonic()
+        self.flush_seconds = 5.0
+        self._dicts = {}
+        self._dicts_lock = threading.Lock()
+        self._untrainable = set()
+        self._init_schema()
+        atexit.register(self._flush_at_exit)
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = [r[1] for r in conn.execute(
+                "PRAGMA table_info(responses)")]
+            if "payload" in columns:
+                conn.execute("ALTER TABLE responses RENAME TO responses_v1")
+                conn.execute("DROP INDEX IF EXISTS responses_bld")
+            for stmt in _SCHEMA.split(";"):
+                if stmt.strip():
+                    conn.execute(stmt)
+            if "payload" in columns:
+                self._migrate_v1(conn)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _migrate_v1(self, conn):
+        # 응답별 zlib payload를 content-addressed blob으로 옮긴다
+        rows = conn.execute(
+            "SELECT key, bld, params, fromdate, todate, ticker, payload, "
+            "created, expires FROM responses_v1").fetchall()
+        for (key, bld, params, fromdate, todate, ticker, payload, created,
+             expires) in rows:
+            raw = _canonical_json(json.loads(zlib.decompress(payload)))
+            digest = self._store_blob(conn, bld, raw)
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, bld, params, fromdate, todate, ticker, digest, created,
+                 expires))
+        conn.execute("DROP TABLE responses_v1")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite 연결은 스레드/프로세스(fork) 사이에 공유하지 않는다
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name: str, bld: str, nbytes: int = 0):
+        with self._stats_lock:
+            self._stats[name] += 1
+            counters = self._pending.setdefault(bld, dict.fromkeys(_COUNTERS, 0))
+            counters[name] += 1
+            counters["hit_bytes"] += nbytes
+            due = time.monotonic() - self._flushed_at >= self.flush_seconds
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """모아 둔 bld별 조회 횟수를 데이터베이스에 기록한다."""
+        with self._stats_lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        self._connect().executemany(
+            "INSERT INTO counters (bld, hits, misses, stores, hit_bytes) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (bld) DO UPDATE SET "
+            "hits = hits + excluded.hits, misses = misses + excluded.misses, "
+            "stores = stores + excluded.stores, "
+            "hit_bytes = hit_bytes + excluded.hit_bytes",
+            [(bld, *(c[k] for k in _COUNTERS)) for bld, c in pending.items()])
+
+    def _flush_at_exit(self):
+        try:
+            self.flush_stats()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def make_key(url: str, params: dict) -> str:
+        text = json.dumps({"url": url, "params": params}, sort_keys=True,
+                          ensure_ascii=False, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _expires(self, params: dict, data: dict):
+        """저장하지 않을 응답이면 False, 만료가 없으면 None"""
+        _, todate = _params_dates(params)
+        today = datetime.date.today()
+        settled = today - datetime.timedelta(days=self.settle_days)
+        if not todate or str(todate) >= today.strftime("%Y%m%d"):
+            ttl = self.volatile_ttl
+        elif _is_empty(data) or (
+                str(params.get("bld", "")).startswith(self.late_blds)
+                and str(todate) >= settled.strftime("%Y%m%d")):
+            # 너무 일찍 조회한 응답이 계속 사용되지 않도록 만료를 둔다
+            ttl = self.recent_ttl
+        else:
+            return None
+        if ttl and ttl > 0:
+            return time.time() + ttl
+        return False
+
+    def _dictionary(self, conn, dict_id: int):
+        with self._dicts_lock:
+            if dict_id in self._dicts:
+                return self._dicts[dict_id]
+        row = conn.execute(
+            "SELECT bld, codec, data FROM dictionaries WHERE id = ?",
+            (dict_id,)).fetchone()
+        with self._dicts_lock:
+            self._dicts[dict_id] = row
+        return row
+
+    def _bld_dictionary(self, conn, bld: str):
+        """bld의 압축 사전 (id, data). 없으면 충분한 응답이 모였을 때 만든다."""
+        row = conn.execute(
+            "SELECT id, codec, data FROM dictionaries WHERE bld = ?",
+            (bld,)).fetchone()
+        if row is not None:
+            return (row[0], row[2]) if row[1] == self.codec else (None, None)
+        if not self.dictionary_samples or bld in self._untrainable:
+            return None, None
+
+        samples = conn.execute(
+            "SELECT codec, data FROM blobs WHERE bld = ? AND dict_id IS NULL "
+            "ORDER BY rowid DESC LIMIT ?", (bld, self.dictionary_samples)
+        ).fetchall()
+        if len(samples) < self.dictionary_samples:
+            return None, None
+
+        try:
+            raws = [_decompress(codec, data) for codec, data in samples]
+        except _DECODE_ERRORS:
+            raws = []
+        data = _train_dictionary(self.codec, raws) if raws else None
+        if data is None:
+            self._untrainable.add(bld)
+            return None, None
+        # 다른 프로세스가 먼저 만들었으면 그 사전을 사용한다
+        conn.execute(
+            "INSERT OR IGNORE INTO dictionaries (bld, codec, data, created) "
+            "VALUES (?, ?, ?, ?)", (bld, self.codec, data, time.time()))
+        return self._bld_dictionary(conn, bld)
+
+    def _store_blob(self, conn, bld: str, raw: bytes) -> str:
+        digest = hashlib.sha256(raw).hexdigest()
+        exists = conn.execute("SELECT 1 FROM blobs WHERE digest = ?",
+                              (digest,)).fetchone()
+        if exists is None:
+            dict_id, dictionary = self._bld_dictionary(conn, bld)
+            data = _compress(self.codec, raw, dictionary, self.level)
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, bld, codec, dict_id, "
+                "raw_size, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, bld, self.codec, dict_id, len(raw), data))
+        return digest
+
+    def _load_blob(self, conn, digest: str):
+        row = conn.execute(
+            "SELECT codec, dict_id, data FROM blobs WHERE digest = ?",
+            (digest,)).fetchone()
+        if row is None:
+            return None
+        codec, dict_id, data = row
+        dictionary = None
+        if dict_id is not None:
+            entry = self._dictionary(conn, dict_id)
+            if entry is None:
+                return None
+            dictionary = entry[2]
+        try:
+            return json.loads(_decompress(codec, data, dictionary))
+        except _DECODE_ERRORS:
+            # 이 프로세스에서 풀 수 없는 codec(zstandard 미설치)이면 miss로 처리
+            return None
+
+    def get(self, url: str, params: dict):
+        """저장된 응답(dict). 없거나 만료되었으면 None"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT r.digest, r.expires, b.raw_size FROM responses r "
+            "LEFT JOIN blobs b ON b.digest = r.digest WHERE r.key = ?",
+            (self.make_key(url, params),)).fetchone()
+        data = None
+        if row is not None and (row[1] is None or row[1] > time.time()):
+            data = self._load_blob(conn, row[0])
+        if data is None:
+            self._count("misses", params.get("bld", ""))
+        else:
+            self._count("hits", params.get("bld", ""), row[2] or 0)
+        return data
+
+    def put(self, url: str, params: dict, data: dict) -> bool:
+        """응답을 저장한다. 저장 대상이 아니면 False"""
+        expires = self._expires(params, data)
+        if expires is False:
+            return False
+
+        bld = params.get("bld", "")
+        fromdate, todate = _params_dates(params)
+        raw = _canonical_json(data)
+        conn = self._connect()
+        # blob과 응답을 한 transaction으로 기록해 읽는 쪽은 완성된 응답만 본다
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            digest = self._store_blob(conn, bld, raw)
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, bld, params, fromdate, "
+                "todate, ticker, digest, created, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url, params), bld,
+                 json.dumps(params, sort_keys=True, ensure_ascii=False,
+                            default=str),
+                 fromdate, todate, _params_ticker(params), digest, time.time(),
+                 expires))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("stores", bld)
+        return True
+
+    @staticmethod
+    def _where(dataset=None, fromdate=None, todate=None, ticker=None,
+               params=None, stored_after=None, stored_before=None):
+        clauses, args = [], []
+        if dataset is not None:
+            blds = resolve_bld(dataset)
+            clauses.append(
+                "(" + " OR ".join(["r.bld = ? OR r.bld LIKE ?"] * len(blds)) + ")")
+            for bld in blds:
+                args += [bld, f"%{bld}"]
+        if fromdate is not None:
+            # 조회 기간이 [fromdate, todate]와 겹치는 응답
+            clauses.append("r.todate >= ?")
+            args.append(str(fromdate).replace("-", ""))
+        if todate is not None:
+            clauses.append("r.fromdate <= ?")
+            args.append(str(todate).replace("-", ""))
+        if ticker is not None:
+            # 종목은 ISIN(KR7005930003)으로 저장되므로 단축 코드(005930)는 ISIN의
+            # 4~9번째 자리와 비교한다
+            clauses.append("(r.ticker = ? OR (LENGTH(r.ticker) = 12 AND "
+                           "SUBSTR(r.ticker, 4, 6) = ?))")
+            args += [str(ticker), str(ticker)]
+        for name, value in (params or {}).items():
+            clauses.append("json_extract(r.params, ?) = ?")
+            args += [f'$."{name}"', str(value)]
+        if stored_after is not None:
+            clauses.append("r.created >= ?")
+            args.append(_timestamp(stored_after))
+        if stored_before is not None:
+            clauses.append("r.created < ?")
+            args.append(_timestamp(stored_before))
+        return " AND ".join(clauses) or "1", args
+
+    def list_entries(self, dataset: str = None, fromdate: str = None,
+                     todate: str = None, ticker: str = None,
+                     params: dict = None, stored_after=None,
+                     stored_before=None, limit: int = None) -> DataFrame:
+        """저장된 응답 목록
+
+        Args:
+            dataset       (str,  optional): bld, bld의 일부(MDCSTAT01501) 또는
+                                            KrxWebIo 클래스 이름(전종목시세)
+            fromdate      (str,  optional): 조회 기간이 이 날짜 이후와 겹치는 응답
+            todate        (str,  optional): 조회 기간이 이 날짜 이전과 겹치는 응답
+            ticker        (str,  optional): 종목 ISIN/단축 코드 또는 지수 티커
+            params        (dict, optional): 요청 파라미터 값이 같은 응답
+            stored_after  (optional      ): 이 시각 이후에 저장된 응답
+                                            (epoch 초, datetime 또는 ISO 문자열)
+            stored_before (optional      ): 이 시각 이전에 저장된 응답
+            limit         (int,  optional): 최대 개수
+
+        Returns:
+            DataFrame:
+                key  bld  params  fromdate  todate  ticker  digest  raw_size
+                size  created  expires
+        """
+        where, args = self._where(dataset, fromdate, todate, ticker, params,
+                                  stored_after, stored_before)
+        sql = ("SELECT r.key, r.bld, r.params, r.fromdate, r.todate, r.ticker, "
+               "r.digest, b.raw_size, LENGTH(b.data), r.created, r.expires "
+               "FROM responses r LEFT JOIN blobs b ON b.digest = r.digest "
+               f"WHERE {where} ORDER BY r.created DESC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        rows = [
+            row[:9] + tuple(datetime.datetime.fromtimestamp(t)
+                            if t is not None else None for t in row[9:])
+            for row in self._connect().execute(sql, args)
+        ]
+        return DataFrame(rows, columns=[
+            "key", "bld", "params", "fromdate", "todate", "ticker", "digest",
+            "raw_size", "size", "created", "expires"])
+
+    def invalidate(self, dataset: str = None, fromdate: str = None,
+                   todate: str = None, ticker: str = None,
+                   params: dict = None, stored_after=None,
+                   stored_before=None) -> int:
+        """조건에 맞는 응답을 지우고 지운 개수를 반환
+
+        조건은 list_entries()와 같다. 전체를 지우려면 clear()를 사용한다.
+
+        >> cache.invalidate("전종목시세", fromdate="20240105", todate="20240105")
+        2
+        """
+        if all(v is None for v in (dataset, fromdate, todate, ticker,
+                                   stored_after, stored_before)) and not params:
+            raise ValueError("invalidate() requires at least one condition. "
+                             "Use clear() to remove every entry.")
+        where, args = self._where(dataset, fromdate, todate, ticker, params,
+                                  stored_after, stored_before)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                f"(SELECT r.key FROM responses r WHERE {where})", args)
+            conn.execute("DELETE FROM blobs WHERE digest NOT IN "
+                         "(SELECT digest FROM responses)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount
+
+    def clear(self):
+        """모든 응답과 압축 사전, 조회 횟수를 지운다."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("responses", "blobs", "dictionaries", "counters"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._dicts_lock:
+            self._dicts.clear()
+        with self._stats_lock:
+            self._pending = {}
+
+    def endpoint_stats(self) -> DataFrame:
+        """bld별 누적 조회 횟수와 저장된 응답 수 (모든 프로세스 합계)
+
+        Returns:
+            DataFrame:
+                                                 hits  misses  stores  hit_bytes  hit_ratio  entries  stored_bytes
+                bld
+                dbms/MDC/STAT/standard/MDCSTAT01501  120      30      30   41234567        0.8       30        281004
+        """  # pylint: disable=line-too-long # noqa: E501
+        self.flush_stats()
+        conn = self._connect()
+        counters = DataFrame(
+            conn.execute("SELECT bld, hits, misses, stores, hit_bytes "
+                         "FROM counters").fetchall(),
+            columns=["bld", *_COUNTERS]).set_index("bld")
+        stored = DataFrame(
+            conn.execute(
+                "SELECT r.bld, COUNT(*), COALESCE(SUM(LENGTH(b.data)), 0) "
+                "FROM responses r LEFT JOIN blobs b ON b.digest = r.digest "
+                "GROUP BY r.bld").fetchall(),
+            columns=["bld", "entries", "stored_bytes"]).set_index("bld")
+
+        df = counters.join(stored, how="outer").fillna(0).astype("int64")
+        lookups = (df["hits"] + df["misses"]).where(lambda x: x > 0)
+        df.insert(4, "hit_ratio", (df["hits"] / lookups).fillna(0.0))
+        return df.sort_index()
+
+    def prune(self) -> int:
+        """어떤 응답도 참조하지 않는 blob을 지우고 지운 개수를 반환"""
+        cur = self._connect().execute(
+            "DELETE FROM blobs WHERE digest NOT IN "
+            "(SELECT digest FROM responses)")
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        """cache 크기와 이 프로세스의 hit 비율
+
+        Returns:
+            dict:
+                hits / misses / stores : 이 프로세스의 조회/저장 횟수
+                hit_ratio              : hits / (hits + misses)
+                entries                : 저장된 응답 수
+                blobs                  : 중복을 제거한 본문 수
+                raw_bytes              : 본문의 압축 전 크기 합
+                stored_bytes           : 본문의 압축 후 크기 합
+                compression_ratio      : raw_bytes / stored_bytes
+                dictionaries           : bld별 압축 사전 수
+                file_bytes             : 데이터베이스 파일(WAL 포함) 크기
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+
+        conn = self._connect()
+        stats["entries"] = conn.execute(
+            "SELECT COUNT(*) FROM responses").fetchone()[0]
+        blobs, raw, stored = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), "
+            "COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()
+        stats.update(blobs=blobs, raw_bytes=raw, stored_bytes=stored,
+                     compression_ratio=raw / stored if stored else 0.0)
+        stats["dictionaries"] = conn.execute(
+            "SELECT COUNT(*) FROM dictionaries").fetchone()[0]
+        stats["file_bytes"] = sum(
+            os.path.getsize(p) for p in (str(self.path), f"{self.path}-wal")
+            if os.path.exists(p))
+        stats["codec"] = self.codec
+        return stats
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_CACHE = None
+_CACHE_FROM_ENV = True
+
+
+def set_response_cache(cache):
+    """KrxWebIo의 모든 요청에 적용할 응답 cache 설정 (None이면 해제)"""
+    global _CACHE, _CACHE_FROM_ENV
+    _CACHE = cache
+    _CACHE_FROM_ENV = False
+
+
+def get_response_cache():
+    global _CACHE, _CACHE_FROM_ENV
+    if _CACHE is None and _CACHE_FROM_ENV:
+        _CACHE_FROM_ENV = False
+        path = os.getenv("PYKRX_RESPONSE_CACHE")
+        if path:
+            _CACHE = KrxResponseCache(path)
+    return _CACHE
+
+
+def enable_response_cache(path=None, **kwargs) -> KrxResponseCache:
+    """응답 cache를 만들어 KRX 요청에 적용한다.
+
+    Args:
+        path   (str, optional): 데이터베이스 경로
+        kwargs                : KrxResponseCache 옵션 (volatile_ttl 등)
+
+    Returns:
+        KrxResponseCache: stats()로 cache 크기와 hit 비율을 확인한다.
+    """
+    cache = KrxResponseCache(path, **kwargs)
+    set_response_cache(cache)
+    return cache
@@ -1,2 +1,3 @@
 from .wrap import *
-from .ticker import *
\ No newline at end of file
+from .ticker import *
+from .panel import *
@@ -0,0 +1,256 @@
+import bisect
+import json
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx.website.comm import parallel_map
+from pykrx.website.krx.etx.ticker import get_etx_isin
+from pykrx.website.krx.etx.wrap import get_etf_portfolio_deposit_file
+from pykrx.website.krx.market.panel import get_trading_days
+
+
+def diff_portfolio(prev: DataFrame, curr: DataFrame) -> DataFrame:
+    """두 PDF 사이의 변경분
+
+    Args:
+        prev (DataFrame): 이전 PDF
+        curr (DataFrame): 현재 PDF
+
+    Returns:
+        DataFrame: 변경된 티커만 담은 DataFrame. '변경' 컬럼은 추가/삭제/변경
+                   중 하나이며 삭제된 티커의 나머지 값은 NaN이다.
+
+                    계약수       금액       비중  변경
+            티커
+            005930  8180.0  695300000  16.53  변경
+            000990     NaN        NaN    NaN  삭제
+            042700    12.0    1530000   0.04  추가
+    """
+    removed = prev.index.difference(curr.index, sort=False)
+    added = curr.index.difference(prev.index, sort=False)
+    common = curr.index.intersection(prev.index, sort=False)
+
+    a = curr.loc[common]
+    b = prev.loc[common, curr.columns]
+    # 양쪽 모두 NaN인 값은 같은 값으로 본다
+    ne = a.ne(b) & ~(a.isna() & b.isna())
+    changed = common[ne.any(axis=1).to_numpy()]
+
+    delta = pd.concat([
+        curr.loc[changed].assign(변경="변경"),
+        DataFrame(np.nan, index=removed, columns=curr.columns)
+        .assign(변경="삭제"),
+        curr.loc[added].assign(변경="추가"),
+    ])
+    delta.index.name = curr.index.name
+    return delta
+
+
+def apply_portfolio_diff(base: DataFrame, delta: DataFrame) -> DataFrame:
+    """diff_portfolio의 결과를 base에 적용해 다음 일자의 PDF를 복원"""
+    return _apply_portfolio_diffs(base, [delta])
+
+
+def _apply_portfolio_diffs(base: DataFrame, deltas: list) -> DataFrame:
+    """변경분을 차례로 적용한 PDF
+
+    base와 변경분에 나오는 모든 티커의 column 배열을 한 번 만들고 변경분마다 값을
+    덮어쓴다. 삭제된 티커는 행을 지우지 않고 표시만 해 두었다가 마지막에 한 번에
+    골라낸다.
+    """
+    added = [d.index[d['변경'] == "추가"] for d in deltas]
+    index = base.index.append(added).drop_duplicates().rename(base.index.name)
+
+    columns = {}
+    for col in base.columns:
+        values = np.empty(len(index), dtype=base[col].dtype)
+        values[:len(base)] = base[col].to_numpy()
+        columns[col] = values
+    present = np.zeros(len(index), dtype=bool)
+    present[:len(base)] = True
+
+    for delta in deltas:
+        kind = delta['변경'].to_numpy()
+        rows = index.get_indexer(delta.index)
+        # base에 없는 티커의 삭제는 무시한다
+        removed = (kind == "삭제") & (rows >= 0)
+        present[rows[removed]] = False
+        updated = kind != "삭제"
+        for col, values in columns.items():
+            values[rows[updated]] = \
+                delta[col].to_numpy()[updated].astype(values.dtype)
+        present[rows[updated]] = True
+
+    return DataFrame({col: values[present] for col, values in columns.items()},
+                     index=index[present])
+
+
+class PortfolioDepositFileHistory:
+    """ETF PDF 이력
+
+    keyframe_interval 영업일마다 전체 PDF(keyframe)를 저장하고 나머지 일자는
+    전일 대비 변경분만 저장한다. 특정 일자의 PDF는 가장 가까운 이전 keyframe에
+    변경분을 차례로 적용해 네트워크 조회 없이 복원한다.
+    """
+
+    def __init__(self, ticker: str, keyframe_interval: int = 20):
+        self.ticker = ticker
+        self.keyframe_interval = max(int(keyframe_interval), 1)
+        self.dates = []
+        self.keyframes = {}
+        self.deltas = {}
+        self._last = None
+        self._since_keyframe = 0
+
+    def __len__(self):
+        return len(self.dates)
+
+    def append(self, date: str, df: DataFrame):
+        """date의 PDF를 이력에 추가. 일자 순서대로 호출해야 한다."""
+        if self.dates and date <= self.dates[-1]:
+            raise ValueError(f"{date} is not after {self.dates[-1]}")
+
+        df = df[~df.index.duplicated()]
+        if self._last is None or self._since_keyframe >= self.keyframe_interval:
+            self.keyframes[date] = df.copy()
+            self._since_keyframe = 1
+        else:
+            self.deltas[date] = diff_portfolio(self._last, df)
+            self._since_keyframe += 1
+        self.dates.append(date)
+        self._last = df
+
+    def changes(self, date: str) -> DataFrame:
+        """date의 전일 대비 변경분 (keyframe 일자는 전체 종목이 '추가'로 표시)"""
+        if date in self.deltas:
+            return self.deltas[date]
+        if date in self.keyframes:
+            pos = self.dates.index(date)
+            if pos == 0:
+                return self.keyframes[date].assign(변경="추가")
+            return diff_portfolio(self.get(self.dates[pos - 1]),
+                                  self.keyframes[date])
+        raise KeyError(date)
+
+    def get(self, date: str) -> DataFrame:
+        """date 시점의 PDF. date가 휴일이면 직전 영업일의 PDF를 반환한다."""
+        pos = bisect.bisect_right(self.dates, date) - 1
+        if pos < 0:
+            return DataFrame()
+
+        start = pos
+        while self.dates[start] not in self.keyframes:
+            start -= 1
+        df = self.keyframes[self.dates[start]]
+        deltas = [self.deltas[d] for d in self.dates[start + 1:pos + 1]]
+        if not deltas:
+            return df
+        return _apply_portfolio_diffs(df, deltas)
+
+    def save(self, path: str):
+        """이력을 JSON 파일로 저장. 각 PDF의 index와 column dtype을 함께 기록한다."""
+        data = {
+            "ticker": self.ticker,
+            "keyframe_interval": self.keyframe_interval,
+            "dates": self.dates,
+            "since_keyframe": self._since_keyframe,
+            "keyframes": {d: _frame_to_json(df)
+                          for d, df in self.keyframes.items()},
+            "deltas": {d: _frame_to_json(df) for d, df in self.deltas.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, allow_nan=False)
+
+    @staticmethod
+    def load(path: str) -> "PortfolioDepositFileHistory":
+        """save로 저장한 JSON 파일에서 이력을 읽는다."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        history = PortfolioDepositFileHistory(data["ticker"],
+                                              data["keyframe_interval"])
+        history.dates = list(data["dates"])
+        history.keyframes = {d: _frame_from_json(v)
+                             for d, v in data["keyframes"].items()}
+        history.deltas = {d: _frame_from_json(v)
+                          for d, v in data["deltas"].items()}
+        history._since_keyframe = data["since_keyframe"]
+        if history.dates:
+            # 이어서 append할 수 있도록 마지막 PDF를 복원해 둔다
+            history._last = history.get(history.dates[-1])
+        return history
+
+
+def _frame_to_json(df: DataFrame) -> dict:
+    """PDF DataFrame을 JSON으로 저장할 수 있는 dict로 변환 (NaN은 null)"""
+    def values(x):
+        x = x.to_numpy()
+        return [None if v is None or v != v else v for v in x.tolist()]
+
+    return {
+        "index_name": df.index.name,
+        "index": df.index.tolist(),
+        "columns": [[col, str(df[col].dtype), values(df[col])]
+                    for col in df.columns],
+    }
+
+
+def _frame_from_json(data: dict) -> DataFrame:
+    columns = {}
+    for col, dtype, values in data["columns"]:
+        try:
+            dtype = np.dtype(dtype)
+        except TypeError:
+            dtype = None
+        if dtype is None or dtype.kind == "O":
+            # 문자열 column은 pandas가 정하는 dtype을 따른다
+            columns[col] = values
+        else:
+            columns[col] = np.array(
+                [np.nan if v is None else v for v in values], dtype=dtype)
+    index = pd.Index(data["index"], name=data["index_name"])
+    return DataFrame(columns, index=index)
+
+
+def get_etf_portfolio_deposit_file_history(
+        fromdate: str, todate: str, ticker: str, keyframe_interval: int = 20,
+        max_workers: int = 4) -> PortfolioDepositFileHistory:
+    """기간 내 영업일별 ETF PDF 이력
+
+    keyframe 구간 단위로 영업일의 PDF를 동시에 조회하고, 조회가 끝난 구간은
+    바로 변경분으로 압축해 전체 기간의 PDF를 메모리에 동시에 들고 있지 않는다.
+
+    Args:
+        fromdate          (str): 조회 시작 일자 (YYYYMMDD)
+        todate            (str): 조회 종료 일자 (YYYYMMDD)
+        ticker            (str): 조회 종목 티커
+        keyframe_interval (int): 전체 PDF를 저장할 영업일 간격
+        max_workers       (int): 동시에 조회할 일자 수
+
+    Returns:
+        PortfolioDepositFileHistory:
+
+            >> h = get_etf_portfolio_deposit_file_history(
+                "20210104", "20211230", "152100")
+            >> h.get("20210615")
+                     계약수       금액       비중
+            티커
+            005930   8140.0  667480000  31.77
+            000660    968.0  118580000   5.69
+    """
+    # 티커 정보를 먼저 읽어 singleton이 스레드 사이에서 중복 생성되지 않게 한다.
+    get_etx_isin(ticker)
+
+    history = PortfolioDepositFileHistory(ticker, keyframe_interval)
+    days = get_trading_days(fromdate, todate)
+    for i in range(0, len(days), history.keyframe_interval):
+        block = days[i:i + history.keyframe_interval]
+        frames = parallel_map(
+            lambda d: get_etf_portfolio_deposit_file(d, ticker), block,
+            max_workers)
+        for date, df in zip(block, frames):
+            if not df.empty:
+                history.append(date, df)
+    return history
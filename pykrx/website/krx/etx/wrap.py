@@ -1,4 +1,4 @@
-from pykrx.website.comm import dataframe_empty_handler
+from pykrx.website.comm import dataframe_empty_handler, tracing
 from pykrx.website.krx.etx.core import (
     개별종목시세_ETF, 전종목시세_ETF, 전종목등락률_ETF, PDF, 추적오차율추이,
     괴리율추이, ETF_투자자별거래실적_기간합계, ETF_투자자별거래실적_일별추이,
@@ -459,6 +459,9 @@ def get_indivisual_trading_volume_and_value_by_date(
     return df.sort_index()
 
 
+tracing.trace_module(globals(), "wrap")
+
+
 if __name__ == "__main__":
     pd.set_option('display.width', None)
     # print(get_etf_ohlcv_by_date("20200101", "20200401", "295820"))
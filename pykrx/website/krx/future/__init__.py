@@ -1 +1,3 @@
-from .wrap import *
\ No newline at end of file
+from .wrap import *
+from .ticker import *
+from .panel import *
@@ -0,0 +1,84 @@
+import itertools
+
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx.website.comm import parallel_map
+from pykrx.website.krx.future.wrap import (
+    get_future_ohlcv_by_ticker, get_future_ticker_list
+)
+from pykrx.website.krx.market.panel import get_trading_days
+
+
+def _concat_snapshots(keys: list, frames: list, names: list) -> DataFrame:
+    pairs = [(k, df) for k, df in zip(keys, frames) if not df.empty]
+    if not pairs:
+        return DataFrame()
+    keys, frames = zip(*pairs)
+    return pd.concat(frames, keys=list(keys), names=names)
+
+
+def get_future_ohlcv_snapshot(date: str, prods: list = None,
+                              max_workers: int = 4) -> DataFrame:
+    """전체 파생상품의 특정 일자 OHLCV
+
+    상품별 [15001] 전종목 시세를 동시에 조회해 하나의 DataFrame으로 합친다.
+    상품 목록은 처음 한 번만 조회한다.
+
+    Args:
+        date        (str          ): 조회 일자 (YYYYMMDD)
+        prods       (list, optional): 조회할 상품 목록. 생략하면 전체 상품
+        max_workers (int, optional): 동시에 조회할 상품 수
+
+    Returns:
+        DataFrame: (상품, 종목코드) MultiIndex
+
+            >> get_future_ohlcv_snapshot("20220902")
+
+                                                        종목명     종가  대비  ...
+            상품        종목코드
+            KRDRVFUK2I  101S9000      코스피200 F 202209 (주간)  313.85 -0.65  ...
+                        101SC000      코스피200 F 202212 (주간)  314.75 -0.75  ...
+            KRDRVFUMKI  105S9000  미니코스피200 F 202209 (주간)  313.86 -0.62  ...
+    """
+    if prods is None:
+        prods = get_future_ticker_list()
+    frames = parallel_map(lambda p: get_future_ohlcv_by_ticker(date, p),
+                          prods, max_workers)
+    return _concat_snapshots(prods, frames, ['상품', '종목코드'])
+
+
+def get_future_ohlcv_snapshot_by_date(fromdate: str, todate: str,
+                                      prods: list = None,
+                                      max_workers: int = 4) -> DataFrame:
+    """기간 내 영업일별 전체 파생상품 OHLCV
+
+    (영업일, 상품) 조합을 모두 동시에 조회한다. 만기별 종가를 일자마다 비교할
+    수 있어 선물 커브를 만들 때 사용한다.
+
+    Args:
+        fromdate    (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str          ): 조회 종료 일자 (YYYYMMDD)
+        prods       (list, optional): 조회할 상품 목록. 생략하면 전체 상품
+        max_workers (int, optional): 동시에 수행할 조회 수
+
+    Returns:
+        DataFrame: (날짜, 상품, 종목코드) MultiIndex
+
+            >> df = get_future_ohlcv_snapshot_by_date(
+                "20220901", "20220902", ["KRDRVFUK2I"])
+            >> df['종가'].unstack('종목코드')
+
+                                   101S9000  101SC000  101T3000  ...
+            날짜        상품
+            2022-09-01  KRDRVFUK2I   314.50    315.50    312.70  ...
+            2022-09-02  KRDRVFUK2I   313.85    314.75    311.25  ...
+    """
+    if prods is None:
+        prods = get_future_ticker_list()
+    days = get_trading_days(fromdate, todate)
+    keys = list(itertools.product(days, prods))
+    frames = parallel_map(lambda k: get_future_ohlcv_by_ticker(*k), keys,
+                          max_workers)
+    keys = [(pd.Timestamp(d), p) for d, p in keys]
+    return _concat_snapshots(keys, frames, ['날짜', '상품', '종목코드'])
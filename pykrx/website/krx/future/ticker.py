@@ -0,0 +1,28 @@
+import threading
+
+from pykrx.website.comm import singleton
+from pykrx.website.krx.future.core import 파생상품검색
+from pandas import DataFrame
+
+
+@singleton
+class FutureTicker:
+    """파생상품 목록을 한 번만 조회해 보관한다.
+
+    조회에 실패해 목록이 비어 있으면 다음 호출에서 다시 조회한다.
+    """
+
+    def __init__(self):
+        self.df = DataFrame()
+        self._lock = threading.Lock()
+
+    def get(self) -> DataFrame:
+        """파생상품 목록의 복사본. 호출한 쪽에서 수정해도 보관한 목록은 바뀌지 않는다."""
+        with self._lock:
+            if self.df.empty:
+                self.df = 파생상품검색().fetch()
+            return self.df.copy()
+
+    def clear(self):
+        with self._lock:
+            self.df = DataFrame()
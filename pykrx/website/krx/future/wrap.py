@@ -1,17 +1,16 @@
-from pykrx.website.comm import dataframe_empty_handler
-from pykrx.website.krx.future.core import (
-    파생상품검색, 전종목시세
-)
+from pykrx.website.comm import dataframe_empty_handler, tracing
+from pykrx.website.krx.future.core import 전종목시세
+from pykrx.website.krx.future.ticker import FutureTicker
 import numpy as np
 from pandas import DataFrame
 
 
 def get_future_ticker_and_name() -> DataFrame:
-    return 파생상품검색().fetch()
+    return FutureTicker().get()
 
 
-def get_future_ticker_list() -> DataFrame:
-    return 파생상품검색().fetch().index.to_list()
+def get_future_ticker_list() -> list:
+    return FutureTicker().get().index.to_list()
 
 
 @dataframe_empty_handler
@@ -65,6 +64,9 @@ def get_future_ohlcv_by_ticker(date: str, prod: str) -> DataFrame:
     return df
 
 
+tracing.trace_module(globals(), "wrap")
+
+
 if __name__ == "__main__":
     tickers = get_future_ticker_list()
     for t in tickers[:1]:
@@ -0,0 +1,280 @@
+"""KRX 요청의 instrumentation hook과 요청 지표
+
+KrxWebIo는 요청 전후, 재시도, 로그인 시점에 event를 발생시킨다. add_hook()으로
+함수를 등록하면 event 정보(dict의 keyword 인자)를 받는다.
+
+- before_request: bld, dataset (KrxWebIo 클래스 이름), params
+- after_response: bld, dataset, params, status (없으면 None), bytes, elapsed (초),
+                  error (없으면 None)
+- on_retry      : bld, dataset, params, error
+- on_login      : ok, elapsed, error
+
+enable_metrics()는 이 hook으로 bld/클래스별 응답 시간과 크기 histogram, 상태 코드,
+재시도 횟수를 모으는 MetricsCollector를 등록한다.
+
+    >> from pykrx.website import krx
+    >> metrics = krx.enable_metrics()
+    >> stock.get_market_ohlcv("20220902")
+    >> metrics.to_dict()["requests"][0]["dataset"]
+    '전종목시세'
+    >> print(metrics.to_prometheus())
+    # TYPE pykrx_krx_request_duration_seconds histogram
+    pykrx_krx_request_duration_seconds_bucket{bld="dbms/MDC/STAT/standard/MDCSTAT01501",dataset="전종목시세",le="0.25"} 0
+    ...
+"""  # pylint: disable=line-too-long # noqa: E501
+import bisect
+import logging
+import threading
+
+EVENTS = ("before_request", "after_response", "on_retry", "on_login")
+
+_HOOKS = {event: [] for event in EVENTS}
+_HOOKS_LOCK = threading.Lock()
+
+
+def _check_event(event: str):
+    if event not in _HOOKS:
+        raise ValueError(f"event must be one of {EVENTS}")
+
+
+def add_hook(event: str, func):
+    """event가 발생할 때 func(**info)를 호출한다. 등록한 func를 반환한다."""
+    _check_event(event)
+    with _HOOKS_LOCK:
+        # 호출 중인 목록은 바꾸지 않도록 새 목록으로 교체한다
+        _HOOKS[event] = _HOOKS[event] + [func]
+    return func
+
+
+def remove_hook(event: str, func):
+    _check_event(event)
+    with _HOOKS_LOCK:
+        _HOOKS[event] = [f for f in _HOOKS[event] if f != func]
+
+
+def emit(event: str, **info):
+    """등록된 hook을 호출한다. hook의 오류는 기록만 하고 요청에는 영향을 주지 않는다."""
+    for func in _HOOKS[event]:
+        try:
+            func(**info)
+        except Exception:
+            logging.exception("KRX %s hook failed", event)
+
+
+def payload_size(resp) -> int:
+    content = getattr(resp, "content", None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    text = getattr(resp, "text", None)
+    if isinstance(text, str):
+        return len(text.encode("utf-8"))
+    return 0
+
+
+# 초 단위 응답 시간 / byte 단위 응답 크기의 histogram 경계
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20)
+
+
+class _Histogram:
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """(경계, 누적 개수) 목록. 마지막 경계는 +Inf"""
+        total, buckets = 0, []
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            buckets.append((bound, total))
+        return buckets
+
+    def to_dict(self) -> dict:
+        return {"buckets": self.cumulative(), "sum": self.sum,
+                "count": self.count}
+
+
+class _Endpoint:
+    def __init__(self, latency_buckets, size_buckets):
+        self.latency = _Histogram(latency_buckets)
+        self.size = _Histogram(size_buckets)
+        self.status = {}
+        self.errors = 0
+        self.retries = 0
+
+
+def _escape(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class MetricsCollector:
+    """bld/KrxWebIo 클래스별 KRX 요청 지표
+
+    Args:
+        latency_buckets (tuple, optional): 응답 시간 histogram 경계 (초)
+        size_buckets    (tuple, optional): 응답 크기 histogram 경계 (byte)
+    """
+
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS,
+                 size_buckets: tuple = SIZE_BUCKETS):
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.size_buckets = tuple(sorted(size_buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self._logins = {"ok": 0, "failed": 0, "seconds": 0.0}
+
+    def install(self):
+        """hook으로 등록한다."""
+        add_hook("after_response", self.after_response)
+        add_hook("on_retry", self.on_retry)
+        add_hook("on_login", self.on_login)
+        return self
+
+    def uninstall(self):
+        remove_hook("after_response", self.after_response)
+        remove_hook("on_retry", self.on_retry)
+        remove_hook("on_login", self.on_login)
+
+    def _endpoint(self, bld, dataset) -> _Endpoint:
+        key = (bld, dataset)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = _Endpoint(self.latency_buckets, self.size_buckets)
+            self._endpoints[key] = endpoint
+        return endpoint
+
+    def after_response(self, *, bld, dataset, status, bytes, elapsed, error,
+                       **_):
+        with self._lock:
+            endpoint = self._endpoint(bld, dataset)
+            endpoint.latency.observe(elapsed)
+            endpoint.size.observe(bytes)
+            key = "error" if status is None else str(status)
+            endpoint.status[key] = endpoint.status.get(key, 0) + 1
+            if error is not None:
+                endpoint.errors += 1
+
+    def on_retry(self, *, bld, dataset, **_):
+        with self._lock:
+            self._endpoint(bld, dataset).retries += 1
+
+    def on_login(self, *, ok, elapsed, **_):
+        with self._lock:
+            self._logins["ok" if ok else "failed"] += 1
+            self._logins["seconds"] += elapsed
+
+    def to_dict(self) -> dict:
+        """지표를 dict로 반환
+
+        Returns:
+            dict: requests (bld/클래스별 요청 수, 상태 코드, 오류/재시도 수, 응답 시간과
+                  크기 histogram 목록), logins (성공/실패 수, 걸린 시간 합계)
+        """
+        with self._lock:
+            requests = [{
+                "bld": bld,
+                "dataset": dataset,
+                "requests": e.latency.count,
+                "status": dict(e.status),
+                "errors": e.errors,
+                "retries": e.retries,
+                "latency": e.latency.to_dict(),
+                "bytes": e.size.to_dict(),
+            } for (bld, dataset), e in sorted(
+                self._endpoints.items(), key=lambda kv: tuple(map(str, kv[0])))]
+            return {"requests": requests, "logins": dict(self._logins)}
+
+    def to_prometheus(self, prefix: str = "pykrx_krx") -> str:
+        """Prometheus text exposition 형식의 지표"""
+        snapshot = self.to_dict()
+        lines = []
+
+        def histogram(name, help, field):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for r in snapshot["requests"]:
+                h = r[field]
+                for bound, n in h["buckets"]:
+                    labels = _labels(bld=r["bld"], dataset=r["dataset"],
+                                     le=_bound(bound))
+                    lines.append(f"{prefix}_{name}_bucket{{{labels}}} {n}")
+                labels = _labels(bld=r["bld"], dataset=r["dataset"])
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {h['sum']}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {h['count']}")
+
+        def counter(name, help, rows):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in rows:
+                lines.append(f"{prefix}_{name}{{{_labels(**labels)}}} {value}")
+
+        histogram("request_duration_seconds", "KRX request latency", "latency")
+        histogram("response_bytes", "KRX response payload size", "bytes")
+        counter("requests_total", "KRX requests by status code", [
+            (dict(bld=r["bld"], dataset=r["dataset"], status=status), n)
+            for r in snapshot["requests"]
+            for status, n in sorted(r["status"].items())])
+        counter("request_errors_total", "KRX requests that raised an error", [
+            (dict(bld=r["bld"], dataset=r["dataset"]), r["errors"])
+            for r in snapshot["requests"]])
+        counter("retries_total", "KRX requests retried after login", [
+            (dict(bld=r["bld"], dataset=r["dataset"]), r["retries"])
+            for r in snapshot["requests"]])
+        logins = snapshot["logins"]
+        counter("logins_total", "KRX logins",
+                [(dict(result="ok"), logins["ok"]),
+                 (dict(result="failed"), logins["failed"])])
+        lines.append(f"# TYPE {prefix}_login_seconds_total counter")
+        lines.append(f"{prefix}_login_seconds_total {logins['seconds']}")
+        return "\n".join(lines) + "\n"
+
+
+_METRICS = None
+
+
+def set_metrics_collector(collector):
+    """사용할 MetricsCollector를 지정한다. None이면 지표 수집을 끈다."""
+    global _METRICS
+    if _METRICS is not None:
+        _METRICS.uninstall()
+    _METRICS = collector
+    if collector is not None:
+        collector.install()
+
+
+def get_metrics_collector():
+    return _METRICS
+
+
+def enable_metrics(**kwargs) -> MetricsCollector:
+    """MetricsCollector를 만들어 지표 수집을 시작한다.
+
+    Args:
+        kwargs: MetricsCollector의 인자 (latency_buckets, size_buckets)
+
+    Returns:
+        MetricsCollector: 등록된 collector
+    """
+    collector = MetricsCollector(**kwargs)
+    set_metrics_collector(collector)
+    return collector
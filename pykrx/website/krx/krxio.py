@@ -1,7 +1,10 @@
+import functools
 import json
 import os
+import tempfile
 import threading
 import time
+import zlib
 from abc import abstractmethod
 from contextlib import contextmanager
 from datetime import datetime, timedelta
@@ -14,8 +17,12 @@ try:
 except Exception:
     portalocker = None
 
+from pykrx.website.comm import tracing
 from pykrx.website.comm.util import PykrxRequestError
 from pykrx.website.comm.webio import Get, Post, get_http_session, set_http_session
+from pykrx.website.krx import hooks
+from pykrx.website.krx.cache import get_response_cache
+from pykrx.website.krx.throttle import request_slot
 
 
 class KrxFutureIo(Get):
@@ -99,12 +106,25 @@ def _resolve_krx_credentials(mbr_id: str | None, password: str | None):
 
 _AUTO_LOGIN_ENABLED = True
 _AUTO_LOGIN_ALLOW_DUP_LOGIN = False
+_AUTO_LOGIN_CROSS_PROCESS = False
 
 
-def enable_auto_login(enabled: bool = True, *, allow_dup_login: bool = False):
+def enable_auto_login(enabled: bool = True, *, allow_dup_login: bool = False,
+                      cross_process: bool = False):
+    """세션 만료 시 자동 재로그인 설정
+
+    Args:
+        enabled         (bool): 자동 재로그인 사용 여부
+        allow_dup_login (bool): 중복 로그인(CD011) 시 기존 세션을 끊고 로그인
+        cross_process   (bool): 세션 파일 락으로 프로세스 간에도 재로그인을 한 번만
+                                수행한다. 다른 프로세스가 먼저 로그인했다면 그 세션을
+                                세션 파일에서 읽어 사용한다.
+    """
     global _AUTO_LOGIN_ENABLED, _AUTO_LOGIN_ALLOW_DUP_LOGIN
+    global _AUTO_LOGIN_CROSS_PROCESS
     _AUTO_LOGIN_ENABLED = bool(enabled)
     _AUTO_LOGIN_ALLOW_DUP_LOGIN = bool(allow_dup_login)
+    _AUTO_LOGIN_CROSS_PROCESS = bool(cross_process)
 
 
 def is_auto_login_enabled() -> bool:
@@ -159,10 +179,74 @@ def _deserialize_session_cookies(session, cookies_dict):
         pass
 
 
-def _save_session_to_file(session, mbr_no=None, ttl_minutes=30):
-    """Save session to file with file locking."""
+def _use_binary_session_format() -> bool:
+    """KRX_SESSION_FORMAT=binary 이면 세션 파일을 zlib으로 압축한 JSON으로 저장한다.
+
+    읽을 때는 파일 내용으로 형식을 판별하므로 JSON/바이너리 형식을 쓰는 프로세스가
+    같은 세션 파일을 공유할 수 있다. 두 형식 모두 데이터만 담으므로 공유 디렉토리의
+    세션 파일을 읽어도 코드가 실행되지 않는다.
+    """
+    return (os.getenv("KRX_SESSION_FORMAT") or "").lower() == "binary"
+
+
+# 바이너리 세션 파일의 시작 부분
+_BINARY_SESSION_MAGIC = b"PYKRX-SESSION-Z1\n"
+
+
+def _encode_session_data(session_data, binary: bool) -> bytes:
+    if binary:
+        payload = json.dumps(session_data, separators=(",", ":"))
+        return _BINARY_SESSION_MAGIC + zlib.compress(payload.encode("utf-8"))
+    return json.dumps(session_data, indent=2).encode("utf-8")
+
+
+def _decode_session_data(raw: bytes):
+    if raw.startswith(_BINARY_SESSION_MAGIC):
+        raw = zlib.decompress(raw[len(_BINARY_SESSION_MAGIC):])
+    elif raw.lstrip()[:1] != b"{":
+        raise ValueError("unknown session file format")
+    return json.loads(raw.decode("utf-8"))
+
+
+def _write_file_atomic(path: Path, payload: bytes):
+    """임시 파일에 기록한 뒤 rename 하여 읽는 쪽이 쓰다 만 파일을 보지 않게 한다."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.",
+                               suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# 세션 파일의 (경로, inode, mtime, size)가 같으면 파일을 다시 읽지 않는다.
+_SESSION_FILE_CACHE = {"signature": None, "data": None, "session": None}
+_SESSION_FILE_CACHE_LOCK = threading.Lock()
+
+
+def _session_file_signature(session_file: Path):
+    st = session_file.stat()
+    return (str(session_file), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _reset_session_file_cache():
+    with _SESSION_FILE_CACHE_LOCK:
+        _SESSION_FILE_CACHE.update(signature=None, data=None, session=None)
+
+
+def _save_session_to_file(session, mbr_no=None, ttl_minutes=30, binary=None):
+    """Save session to file atomically (write-then-rename)."""
     session_file = _get_session_file_path()
     session_file.parent.mkdir(parents=True, exist_ok=True)
+    if binary is None:
+        binary = _use_binary_session_format()
 
     now = datetime.now()
     expires_at = now + timedelta(minutes=ttl_minutes)
@@ -175,42 +259,58 @@ def _save_session_to_file(session, mbr_no=None, ttl_minutes=30):
         "mbr_no": mbr_no,
         "ttl_minutes": ttl_minutes,
     }
+    payload = _encode_session_data(session_data, binary)
 
-    # Write with file locking
+    # 쓰기끼리만 직렬화한다. 읽기는 rename의 원자성에 의존하므로 락이 필요 없다.
     lock_file = session_file.parent / f"{session_file.name}.lock"
     try:
         with _file_lock(lock_file, shared=False):
-            with open(session_file, "w", encoding="utf-8") as f:
-                json.dump(session_data, f, indent=2)
+            _write_file_atomic(session_file, payload)
     except Exception:
         # Best effort - if locking fails, still try to save
         try:
-            with open(session_file, "w", encoding="utf-8") as f:
-                json.dump(session_data, f, indent=2)
+            _write_file_atomic(session_file, payload)
         except Exception:
-            pass
+            return
+
+    # 방금 저장한 세션은 다시 읽지 않고 그대로 재사용한다.
+    try:
+        signature = _session_file_signature(session_file)
+    except OSError:
+        return
+    with _SESSION_FILE_CACHE_LOCK:
+        _SESSION_FILE_CACHE.update(
+            signature=signature, data=session_data, session=session
+        )
 
 
-def _load_session_from_file():
-    """Load session from file if valid."""
-    session_file = _get_session_file_path()
-    if not session_file.exists():
-        return None
+def _read_session_data(session_file: Path):
+    """Return (signature, data, cached session) of the session file."""
+    signature = _session_file_signature(session_file)
+    with _SESSION_FILE_CACHE_LOCK:
+        if _SESSION_FILE_CACHE["signature"] == signature:
+            return signature, _SESSION_FILE_CACHE["data"], _SESSION_FILE_CACHE["session"]
 
-    lock_file = session_file.parent / f"{session_file.name}.lock"
+    data = _decode_session_data(session_file.read_bytes())
+    if not isinstance(data, dict):
+        raise ValueError("invalid session file")
+    with _SESSION_FILE_CACHE_LOCK:
+        _SESSION_FILE_CACHE.update(signature=signature, data=data, session=None)
+    return signature, data, None
+
+
+def _load_session_from_file():
+    """Load session from file if valid.
 
+    The file is only read; it is never rewritten here. Parsed contents and the
+    restored session are cached in-process and reused until the file's inode,
+    mtime or size changes.
+    """
+    session_file = _get_session_file_path()
     try:
-        # Read with file locking
-        with _file_lock(lock_file, shared=True):
-            with open(session_file, "r", encoding="utf-8") as f:
-                session_data = json.load(f)
+        signature, session_data, session = _read_session_data(session_file)
     except Exception:
-        # Best effort - if locking fails, try to read anyway
-        try:
-            with open(session_file, "r", encoding="utf-8") as f:
-                session_data = json.load(f)
-        except Exception:
-            return None
+        return None
 
     # Check expiration
     expires_at_str = session_data.get("expires_at")
@@ -223,28 +323,26 @@ def _load_session_from_file():
         except Exception:
             return None
 
+    if session is not None:
+        return session
+
     # Restore session
     try:
         session = _create_curl_session()
         cookies_dict = session_data.get("cookies", {})
         _deserialize_session_cookies(session, cookies_dict)
-
-        # Update last_used timestamp
-        session_data["last_used"] = datetime.now().isoformat()
-        try:
-            with _file_lock(lock_file, shared=False):
-                with open(session_file, "w", encoding="utf-8") as f:
-                    json.dump(session_data, f, indent=2)
-        except Exception:
-            pass
-
-        return session
     except Exception:
         return None
 
+    with _SESSION_FILE_CACHE_LOCK:
+        if _SESSION_FILE_CACHE["signature"] == signature:
+            _SESSION_FILE_CACHE["session"] = session
+    return session
+
 
 def clear_session_file():
     """Clear the saved session file."""
+    _reset_session_file_cache()
     session_file = _get_session_file_path()
     if session_file.exists():
         try:
@@ -268,6 +366,23 @@ def _is_logout_response(resp) -> bool:
     return txt.strip() == "LOGOUT"
 
 
+def _emits_login(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            hooks.emit("on_login", ok=False,
+                       elapsed=time.monotonic() - started, error=e)
+            raise
+        hooks.emit("on_login", ok=True, elapsed=time.monotonic() - started,
+                   error=None)
+        return result
+    return wrapper
+
+
+@_emits_login
 def krx_login(
     mbr_id: str | None = None,
     password: str | None = None,
@@ -276,6 +391,7 @@ def krx_login(
     set_global_session: bool = True,
     site: str = "mdc",
     allow_dup_login: bool = False,
+    save_session_file: bool = True,
 ):
     mbr_id, password = _resolve_krx_credentials(mbr_id, password)
     if not mbr_id or not password:
@@ -409,8 +525,10 @@ def krx_login(
     if set_global_session:
         set_http_session(session)
 
-    # Save session to file for cross-process sharing
-    _save_session_to_file(session, mbr_no=mbr_no, ttl_minutes=30)
+    # Save session to file for cross-process sharing. Sessions owned by a
+    # session pool or broker are kept out of the shared session file.
+    if save_session_file:
+        _save_session_to_file(session, mbr_no=mbr_no, ttl_minutes=30)
 
     return session, data
 
@@ -501,6 +619,301 @@ def krx_start_keepalive(
     return ka
 
 
+class _LoginCoordinator:
+    """세션 만료 시의 재로그인을 프로세스 내에서 한 번만 수행한다 (single-flight).
+
+    요청 시작 시점의 generation을 기록해 두고, 실패한 요청은 recover()를 호출한다.
+    그 사이 다른 호출자가 이미 재로그인했다면(generation이 바뀌었다면) 로그인하지
+    않고 바로 재시도하며, 재로그인이 진행 중이면 끝날 때까지 기다린다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._in_flight = False
+        self.generation = 0
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.metrics = {
+            "logins": 0,
+            "login_failures": 0,
+            "session_file_reuses": 0,
+            "joined": 0,
+            "last_recovery_seconds": None,
+            "max_recovery_seconds": 0.0,
+            "total_recovery_seconds": 0.0,
+        }
+
+    def recover(self, generation: int):
+        with self._cond:
+            if generation != self.generation:
+                self.metrics["joined"] += 1
+                return
+            if self._in_flight:
+                self.metrics["joined"] += 1
+                self._cond.wait_for(lambda: not self._in_flight)
+                return
+            self._in_flight = True
+
+        started = time.monotonic()
+        ok = False
+        try:
+            if _AUTO_LOGIN_CROSS_PROCESS:
+                ok = self._login_across_processes()
+            else:
+                self._login()
+                ok = True
+        finally:
+            elapsed = time.monotonic() - started
+            with self._cond:
+                self._in_flight = False
+                if ok:
+                    self.generation += 1
+                    self.metrics["last_recovery_seconds"] = elapsed
+                    self.metrics["max_recovery_seconds"] = max(
+                        self.metrics["max_recovery_seconds"], elapsed)
+                    self.metrics["total_recovery_seconds"] += elapsed
+                else:
+                    self.metrics["login_failures"] += 1
+                self._cond.notify_all()
+
+    def _login(self):
+        krx_login(set_global_session=True,
+                  allow_dup_login=_AUTO_LOGIN_ALLOW_DUP_LOGIN)
+        with self._cond:
+            self.metrics["logins"] += 1
+
+    def _login_across_processes(self) -> bool:
+        session_file = _get_session_file_path()
+        try:
+            before = _session_file_signature(session_file)
+        except OSError:
+            before = None
+
+        lock_file = session_file.parent / f"{session_file.name}.login.lock"
+        with _file_lock(lock_file, shared=False):
+            # 락을 기다리는 동안 다른 프로세스가 로그인해 세션 파일을 갱신했다면
+            # 새로 로그인하지 않고 그 세션을 사용한다.
+            try:
+                after = _session_file_signature(session_file)
+            except OSError:
+                after = None
+            if after is not None and after != before:
+                session = _load_session_from_file()
+                if session is not None:
+                    set_http_session(session)
+                    with self._cond:
+                        self.metrics["session_file_reuses"] += 1
+                    return True
+            self._login()
+        return True
+
+
+_LOGIN_COORDINATOR = _LoginCoordinator()
+
+
+def get_login_metrics() -> dict:
+    """자동 재로그인 지표
+
+    Returns:
+        dict: logins (로그인 수), login_failures, session_file_reuses (다른 프로세스의
+              세션 재사용 수), joined (다른 호출자의 재로그인을 기다려 재사용한 수),
+              last/max/avg_recovery_seconds (재로그인 소요 시간)
+    """
+    with _LOGIN_COORDINATOR._cond:
+        metrics = dict(_LOGIN_COORDINATOR.metrics)
+    recoveries = metrics["logins"] + metrics["session_file_reuses"]
+    metrics["avg_recovery_seconds"] = (
+        metrics["total_recovery_seconds"] / recoveries if recoveries else None)
+    return metrics
+
+
+def reset_login_metrics():
+    with _LOGIN_COORDINATOR._cond:
+        _LOGIN_COORDINATOR._reset_metrics()
+
+
+def _probe_session(session) -> bool:
+    """가벼운 조회(종목 검색)로 세션이 실제로 유효한지 확인한다."""
+    url = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+    headers = {"User-Agent": "Mozilla/5.0", "Referer": "https://data.krx.co.kr/"}
+    data = {"bld": "dbms/comm/finder/finder_stkisu", "locale": "ko_KR",
+            "mktsel": "STK", "searchText": "005930", "typeNo": 0}
+    try:
+        resp = session.post(url, headers=headers, data=data, timeout=30)
+    except TypeError:
+        resp = session.post(url, headers=headers, data=data)
+    if getattr(resp, "status_code", None) != 200 or _is_logout_response(resp):
+        return False
+    try:
+        payload = json.loads(getattr(resp, "text", "") or "")
+    except Exception:
+        return False
+    return isinstance(payload, dict) and "block1" in payload
+
+
+class KrxSessionRefresher:
+    """세션 만료 시각(expires_at)을 추적해 만료 전에 미리 세션을 갱신한다.
+
+    만료 refresh_margin_seconds 전에 krx_extend_session으로 세션을 연장하고 가벼운
+    조회로 연장 결과를 확인한다. 연장이나 확인이 실패하면 백그라운드에서 재로그인하므로
+    긴 수집 작업 중에도 요청 스레드가 로그인 지연을 겪지 않는다.
+
+    Args:
+        session                (optional       ): 갱신할 세션. 생략하면 현재 바인딩된 세션.
+                                                  재로그인은 이 세션 객체에서 수행한다
+        ttl_minutes            (int,  optional): 연장/로그인 후 세션 유효 시간 (분)
+        refresh_margin_seconds (int,  optional): 만료 몇 초 전에 갱신할지
+        retry_seconds          (int,  optional): 갱신 실패 후 재시도 간격 (초)
+        probe                  (bool, optional): 연장 후 조회로 세션을 확인할지 여부
+    """
+
+    def __init__(self, *, session=None, ttl_minutes: int = 30,
+                 refresh_margin_seconds: int = 5 * 60, retry_seconds: int = 30,
+                 probe: bool = True):
+        self._session = session
+        self.ttl = timedelta(minutes=ttl_minutes)
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.retry_seconds = retry_seconds
+        self.probe = probe
+        self.expires_at = None
+        self.last_error = None
+        self.stats = {"extends": 0, "extend_failures": 0, "relogins": 0,
+                      "relogin_failures": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _current_session(self):
+        if self._session is not None:
+            return self._session
+        return get_http_session()
+
+    def _file_session_data(self, session):
+        with _SESSION_FILE_CACHE_LOCK:
+            if (_SESSION_FILE_CACHE["session"] is session
+                    and _SESSION_FILE_CACHE["data"] is not None):
+                return _SESSION_FILE_CACHE["data"]
+        return None
+
+    def _initial_expires_at(self, session):
+        data = self._file_session_data(session)
+        if data is not None and data.get("expires_at"):
+            try:
+                return datetime.fromisoformat(data["expires_at"])
+            except ValueError:
+                pass
+        return datetime.now() + self.ttl
+
+    def _mark_refreshed(self, session):
+        self.expires_at = datetime.now() + self.ttl
+        # 다른 프로세스도 새 만료 시각을 보도록 세션 파일을 갱신한다.
+        data = self._file_session_data(session)
+        if data is not None:
+            _save_session_to_file(session, mbr_no=data.get("mbr_no"),
+                                  ttl_minutes=self.ttl.total_seconds() / 60)
+
+    def seconds_until_refresh(self) -> float:
+        if self.expires_at is None:
+            session = self._current_session()
+            if session is None:
+                return self.retry_seconds
+            self.expires_at = self._initial_expires_at(session)
+        delta = self.expires_at - self.refresh_margin - datetime.now()
+        return max(delta.total_seconds(), 0)
+
+    def refresh_now(self) -> bool:
+        """세션을 연장하고, 실패하면 재로그인한다. 성공하면 True"""
+        session = self._current_session()
+        if session is None or _manages_login(session):
+            return False
+
+        try:
+            krx_extend_session(session=session)
+            if self.probe and not _probe_session(session):
+                raise PykrxRequestError("KRX session probe failed after extend.")
+            self.stats["extends"] += 1
+            self._mark_refreshed(session)
+            return True
+        except Exception as e:
+            self.last_error = e
+            self.stats["extend_failures"] += 1
+
+        try:
+            if self._session is not None:
+                # 직접 전달받은 세션은 호출한 쪽이 계속 사용하므로 객체를 바꾸지 않고
+                # 같은 세션에서 다시 로그인한다
+                cookies = getattr(self._session, "cookies", None)
+                if cookies is not None:
+                    cookies.clear()
+                krx_login(session=self._session, set_global_session=False,
+                          allow_dup_login=_AUTO_LOGIN_ALLOW_DUP_LOGIN)
+            else:
+                _LOGIN_COORDINATOR.recover(_LOGIN_COORDINATOR.generation)
+        except Exception as e:
+            self.last_error = e
+            self.stats["relogin_failures"] += 1
+            return False
+        self.stats["relogins"] += 1
+        self.expires_at = datetime.now() + self.ttl
+        return True
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def _run():
+            while not self._stop.wait(self.seconds_until_refresh()):
+                if not self.refresh_now():
+                    self._stop.wait(self.retry_seconds)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+
+def krx_start_session_refresher(**kwargs) -> KrxSessionRefresher:
+    refresher = KrxSessionRefresher(**kwargs)
+    refresher.start()
+    return refresher
+
+
+def _is_blocked_response(resp) -> bool:
+    """KRX가 요청을 차단하거나 세션을 끊었다고 볼 수 있는 응답인지 여부
+
+    403/429, HTML 등 비JSON 응답, LOGOUT 응답을 차단 신호로 본다.
+    """
+    if getattr(resp, "status_code", None) in (403, 429):
+        return True
+    if _is_logout_response(resp):
+        return True
+    text = (getattr(resp, "text", "") or "").lstrip()
+    return text[:1] == "<"
+
+
+def _manages_login(session) -> bool:
+    """세션 브로커/풀처럼 로그인을 스스로 관리하는 session 객체인지 여부"""
+    return getattr(type(session), "manages_login", False) is True
+
+
+def _handle_logout_response(session):
+    # 다른 스레드가 이미 재로그인해 바인딩을 교체했다면 새 세션은 건드리지 않는다.
+    if not _manages_login(session) and get_http_session() is session:
+        clear_session_file()
+        set_http_session(None)
+    raise PykrxRequestError("KRX returned 'LOGOUT' (expired/invalid session).")
+
+
+# 설정되어 있으면 KrxWebIo.iter_read()는 요청을 보내지 않고 reader(io, params)가
+# 반환하는 구간별 응답을 사용한다. pykrx.batch의 process worker가 부모 프로세스의
+# 세션/동시성 제어/hook을 거친 응답을 받을 때 사용한다.
+_REMOTE_READER = None
+
+
 class KrxWebIo(Post):
     def _raise_for_invalid_response(self, resp):
         if getattr(resp, "status_code", None) != 200:
@@ -581,97 +994,127 @@ class KrxWebIo(Post):
                 f"Payload snippet: {snippet}"
             )
 
-    def read(self, **params):
-        # Try to load session from file if not in memory
-        if get_http_session() is None:
-            file_session = _load_session_from_file()
-            if file_session is not None:
-                set_http_session(file_session)
-
-        def _do_request():
-            params.update(bld=self.bld)
-            if "strtDd" in params and "endDd" in params:
-                dt_s = pd.to_datetime(params["strtDd"])
-                dt_e = pd.to_datetime(params["endDd"])
-                delta = pd.to_timedelta("730 days")
-
-                result = None
-                while dt_s + delta < dt_e:
-                    dt_tmp = dt_s + delta
-                    params["strtDd"] = dt_s.strftime("%Y%m%d")
-                    params["endDd"] = dt_tmp.strftime("%Y%m%d")
-                    dt_s += delta + pd.to_timedelta("1 days")
-                    resp = Post.read(self, **params)
-                    self._raise_for_invalid_response(resp)
-                    if _is_logout_response(resp):
-                        clear_session_file()
-                        set_http_session(None)
-                        raise PykrxRequestError(
-                            "KRX returned 'LOGOUT' (expired/invalid session)."
-                        )
-                    data = self._parse_json(resp)
-                    self._raise_for_error_payload(data)
-                    if result is None:
-                        result = data
-                    else:
-                        result["output"] += data["output"]
-
-                    # 초당 2년 데이터 조회
-                    time.sleep(1)
-
-                if dt_s <= dt_e:
-                    params["strtDd"] = dt_s.strftime("%Y%m%d")
-                    params["endDd"] = dt_e.strftime("%Y%m%d")
-                    resp = Post.read(self, **params)
-                    self._raise_for_invalid_response(resp)
-                    if _is_logout_response(resp):
-                        clear_session_file()
-                        set_http_session(None)
-                        raise PykrxRequestError(
-                            "KRX returned 'LOGOUT' (expired/invalid session)."
-                        )
-
-                    data = self._parse_json(resp)
-                    self._raise_for_error_payload(data)
-
-                    if result is not None:
-                        result["output"] += data["output"]
-                    else:
-                        result = data
-                return result
-            else:
+    def _send(self, **params):
+        # 동시성 제어기/우선순위 dispatcher가 설정되어 있으면 그에 따라 보낸다
+        with request_slot() as slot:
+            info = dict(bld=params.get("bld"), dataset=type(self).__name__,
+                        params=params)
+            hooks.emit("before_request", **info)
+            started = time.monotonic()
+            try:
                 resp = Post.read(self, **params)
-                self._raise_for_invalid_response(resp)
-                if _is_logout_response(resp):
-                    clear_session_file()
-                    set_http_session(None)
-                    raise PykrxRequestError(
-                        "KRX returned 'LOGOUT' (expired/invalid session)."
-                    )
-                data = self._parse_json(resp)
-                self._raise_for_error_payload(data)
-                return data
-
+            except Exception as e:
+                hooks.emit("after_response", **info, status=None, bytes=0,
+                           elapsed=time.monotonic() - started, error=e)
+                raise
+            hooks.emit("after_response", **info,
+                       status=getattr(resp, "status_code", None),
+                       bytes=hooks.payload_size(resp),
+                       elapsed=time.monotonic() - started, error=None)
+            slot.record(blocked=_is_blocked_response(resp))
+            return resp
+
+    @staticmethod
+    def _split_period(params: dict) -> list:
+        """조회 기간을 KRX가 한 번에 응답하는 2년(730일) 단위로 나눈다."""
+        if "strtDd" not in params or "endDd" not in params:
+            return [params]
+
+        dt_s = pd.to_datetime(params["strtDd"])
+        dt_e = pd.to_datetime(params["endDd"])
+        delta = pd.to_timedelta("730 days")
+
+        windows = []
+        while dt_s + delta < dt_e:
+            windows.append((dt_s, dt_s + delta))
+            dt_s += delta + pd.to_timedelta("1 days")
+        if dt_s <= dt_e:
+            windows.append((dt_s, dt_e))
+        return [dict(params, strtDd=s.strftime("%Y%m%d"),
+                     endDd=e.strftime("%Y%m%d")) for s, e in windows]
+
+    def _read_window(self, params: dict):
+        session = get_http_session()
+        resp = self._send(**params)
+        self._raise_for_invalid_response(resp)
+        if _is_logout_response(resp):
+            _handle_logout_response(session)
+        data = self._parse_json(resp)
+        self._raise_for_error_payload(data)
+        return data
+
+    def _read_window_with_login(self, params: dict):
+        login_generation = _LOGIN_COORDINATOR.generation
         try:
-            return _do_request()
-        except PykrxRequestError:
+            return self._read_window(params)
+        except PykrxRequestError as e:
             if not is_auto_login_enabled():
                 raise
 
-            # Avoid infinite retry per instance
-            if getattr(self, "_auto_login_retried", False):
-                raise
+            hooks.emit("on_retry", bld=params.get("bld"),
+                       dataset=type(self).__name__, params=params, error=e)
+            session = get_http_session()
+            if _manages_login(session):
+                # 세션 브로커/풀을 사용 중이면 로그인은 해당 객체에 맡긴다
+                session.relogin()
+            else:
+                # 동시에 실패한 호출들 중 하나만 로그인하고 나머지는 기다린다
+                _LOGIN_COORDINATOR.recover(login_generation)
+
+            # 재시도는 구간당 한 번만 한다
+            return self._read_window(params)
+
+    def iter_read(self, **params):
+        """조회 기간을 2년 단위로 나누어 응답이 도착하는 대로 하나씩 반환한다.
+
+        기간 조회가 아닌 요청은 응답 하나만 반환한다. 전체 기간의 응답을 메모리에
+        모아 두지 않으므로 긴 기간을 조회할 때 사용한다.
+        """
+        reader = _REMOTE_READER
+        if reader is not None:
+            # batch의 process worker: 요청은 부모 프로세스가 보내고 응답만 받는다
+            yield from reader(self, dict(params))
+            return
 
-            try:
-                krx_login(
-                    set_global_session=True, allow_dup_login=_AUTO_LOGIN_ALLOW_DUP_LOGIN
-                )
-            except Exception:
-                # If login itself fails, surface original error
-                raise
+        # Use the session broker if configured, otherwise try to load
+        # session from file if not in memory
+        if get_http_session() is None:
+            from pykrx.website.krx.broker import get_broker_session
 
-            setattr(self, "_auto_login_retried", True)
-            return _do_request()
+            file_session = get_broker_session() or _load_session_from_file()
+            if file_session is not None:
+                set_http_session(file_session)
+
+        cache = get_response_cache()
+        params.update(bld=self.bld)
+        sent = False
+        for window in self._split_period(params):
+            with tracing.span(
+                    f"KRX {self.bld.rsplit('/', 1)[-1]}", layer="window",
+                    **{"pykrx.bld": self.bld,
+                       "pykrx.window.start": window.get("strtDd", window.get("trdDd")),
+                       "pykrx.window.end": window.get("endDd", window.get("trdDd"))}
+            ) as span:
+                data = cache.get(self.url, window) if cache is not None else None
+                span.set_attribute("pykrx.cache_hit", data is not None)
+                if data is None:
+                    if sent:
+                        # 초당 2년 데이터 조회
+                        time.sleep(1)
+                    data = self._read_window_with_login(window)
+                    sent = True
+                    if cache is not None:
+                        cache.put(self.url, window, data)
+            yield data
+
+    def read(self, **params):
+        result = None
+        for data in self.iter_read(**params):
+            if result is None:
+                result = data
+            else:
+                result["output"] += data["output"]
+        return result
 
     @property
     def url(self):
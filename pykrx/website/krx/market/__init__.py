@@ -1,2 +1,3 @@
 from .wrap import *
 from .ticker import *
+from .panel import *
@@ -114,6 +114,16 @@ class 개별종목시세(KrxWebIo):
         result = self.read(isuCd=isuCd, strtDd=strtDd, endDd=endDd, adjStkPrc=adjStkPrc)
         return DataFrame(result['output'])
 
+    def iter_fetch(self, strtDd: str, endDd: str, isuCd: str, adjStkPrc: int):
+        """fetch()와 같은 조회를 2년 단위 구간의 DataFrame으로 나누어 반환
+
+        Yields:
+            DataFrame: 구간별 일자별 시세 조회 결과 (fetch()와 같은 column)
+        """
+        for result in self.iter_read(isuCd=isuCd, strtDd=strtDd, endDd=endDd,
+                                     adjStkPrc=adjStkPrc):
+            yield DataFrame(result['output'])
+
 
 class 전종목시세(KrxWebIo):
     @property
@@ -766,6 +776,16 @@ class 개별지수시세(KrxWebIo):
                            endDd=todate)
         return DataFrame(result['output'])
 
+    def iter_fetch(self, ticker: str, group_id: str, fromdate: str, todate: str):
+        """fetch()와 같은 조회를 2년 단위 구간의 DataFrame으로 나누어 반환
+
+        Yields:
+            DataFrame: 구간별 지수 시세 조회 결과 (fetch()와 같은 column)
+        """
+        for result in self.iter_read(indIdx2=ticker, indIdx=group_id,
+                                     strtDd=fromdate, endDd=todate):
+            yield DataFrame(result['output'])
+
 
 class 전체지수시세(KrxWebIo):
     @property
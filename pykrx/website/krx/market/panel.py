@@ -0,0 +1,303 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx.website.comm import Checkpoint, parallel_map
+from pykrx.website.krx.market.wrap import (
+    get_index_ohlcv_by_date, get_index_portfolio_deposit_file,
+    get_shorting_balance_by_ticker,
+    get_shorting_trading_value_and_volume_by_ticker
+)
+
+
+_TRADING_DAYS_CACHE = {}
+
+
+def _get_trading_days(fromdate: str, todate: str) -> tuple:
+    key = (fromdate, todate)
+    days = _TRADING_DAYS_CACHE.get(key)
+    if days is None:
+        df = get_index_ohlcv_by_date(fromdate, todate, "1001")
+        days = tuple(x.strftime("%Y%m%d") for x in df.index)
+        # 조회 실패로 비어 있는 결과는 캐시하지 않는다
+        if days:
+            _TRADING_DAYS_CACHE[key] = days
+    return days
+
+
+def get_trading_days(fromdate: str, todate: str) -> list:
+    """기간 내 영업일 목록
+
+    코스피 지수의 일자별 시세로 영업일을 판단하며, 같은 기간을 반복해서 조회하면
+    네트워크 요청 없이 캐시된 결과를 반환한다.
+
+    Args:
+        fromdate (str): 조회 시작 일자 (YYYYMMDD)
+        todate   (str): 조회 종료 일자 (YYYYMMDD)
+
+    Returns:
+        list: ['20210125', '20210126', '20210127', ...]
+    """
+    return list(_get_trading_days(fromdate, todate))
+
+
+def build_panel(frames: dict, fields: dict) -> dict:
+    """일자별 티커 DataFrame을 필드별 (일자 × 티커) DataFrame으로 변환
+
+    Args:
+        frames (dict): {일자(YYYYMMDD): 티커를 index로 갖는 DataFrame}
+        fields (dict): {필드명: dtype}
+
+    Returns:
+        dict: {필드명: 일자 index, 티커 column의 DataFrame}
+              해당 일자에 존재하지 않는 티커는 NaN으로 채워진다.
+    """
+    frames = {k: v for k, v in frames.items() if not v.empty}
+    dates = pd.to_datetime(sorted(frames), format='%Y%m%d')
+    tickers = sorted(set().union(*[v.index for v in frames.values()]))
+    dindex = {d: i for i, d in enumerate(sorted(frames))}
+    tindex = {t: i for i, t in enumerate(tickers)}
+
+    panel = {}
+    for field, dtype in fields.items():
+        arr = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+        for date, df in frames.items():
+            if field not in df.columns:
+                continue
+            cols = [tindex[t] for t in df.index]
+            arr[dindex[date], cols] = df[field].to_numpy(dtype=dtype)
+        panel[field] = DataFrame(arr, index=dates, columns=tickers)
+        panel[field].index.name = "날짜"
+        panel[field].columns.name = "티커"
+    return panel
+
+
+def _fetch_shorting_snapshot(date: str, market: str) -> DataFrame:
+    balance = get_shorting_balance_by_ticker(date, market)
+    trading = get_shorting_trading_value_and_volume_by_ticker(
+        date, market, ["주식"])
+    if not trading.empty:
+        trading = trading[[("거래량", "공매도"), ("거래대금", "공매도"),
+                           ("거래량", "비중"), ("거래대금", "비중")]]
+        trading.columns = ['공매도거래량', '공매도거래대금', '거래량비중',
+                           '거래대금비중']
+    return pd.concat([balance, trading], axis=1)
+
+
+def get_shorting_balance_panel(fromdate: str, todate: str,
+                               market: str = "KOSPI", cache_dir: str = None,
+                               max_workers: int = 4) -> dict:
+    """기간 내 영업일별 전종목 공매도 잔고/거래 패널
+
+    [33001] 전종목 공매도 잔고와 [32001] 개별종목 공매도 거래를 영업일 단위로
+    동시에 조회해 (일자 × 티커) 배열로 정리한다. cache_dir을 지정하면 조회가 끝난
+    일자의 결과를 저장하므로, 중단된 작업을 같은 인자로 다시 호출하면 남은 일자만
+    조회한다.
+
+    Args:
+        fromdate    (str          ): 조회 시작 일자 (YYYYMMDD)
+        todate      (str          ): 조회 종료 일자 (YYYYMMDD)
+        market      (str          ): 조회 시장 (KOSPI/KOSDAQ/KONEX)
+        cache_dir   (str, optional): 일자별 결과를 저장할 디렉터리 (pyarrow 필요)
+        max_workers (int, optional): 동시에 조회할 일자 수
+
+    Returns:
+        dict: 필드별 (일자 × 티커) DataFrame
+
+            >> panel = get_shorting_balance_panel("20210125", "20210129")
+            >> panel["공매도잔고"]
+
+            티커         000020  000040  000050  000060  000070  ...
+            날짜
+            2021-01-25  10521.0     0.0   157.0  6711.0   402.0  ...
+            2021-01-26  10521.0     0.0   157.0  6533.0   402.0  ...
+            2021-01-27  10390.0     0.0   157.0  6551.0   392.0  ...
+
+            필드: 공매도잔고, 상장주식수, 공매도금액, 시가총액, 비중,
+                  공매도거래량, 공매도거래대금, 거래량비중, 거래대금비중
+    """
+    days = get_trading_days(fromdate, todate)
+    checkpoint = Checkpoint(cache_dir) if cache_dir is not None else None
+
+    def _fetch(date):
+        if checkpoint is None:
+            return _fetch_shorting_snapshot(date, market)
+        return checkpoint.run(f"shorting_{market}_{date}",
+                              _fetch_shorting_snapshot, date, market)
+
+    frames = dict(zip(days, parallel_map(_fetch, days, max_workers)))
+    fields = {
+        "공매도잔고": np.float64,
+        "상장주식수": np.float64,
+        "공매도금액": np.float64,
+        "시가총액": np.float64,
+        "비중": np.float32,
+        "공매도거래량": np.float64,
+        "공매도거래대금": np.float64,
+        "거래량비중": np.float32,
+        "거래대금비중": np.float32,
+    }
+    return build_panel(frames, fields)
+
+
+class IndexConstituentHistory:
+    """지수 구성종목 이력
+
+    구성종목을 (티커, 편입일, 편출일) 구간으로 저장하고 특정 일자의 구성종목을
+    네트워크 조회 없이 구간 index에서 찾는다. 편출일은 해당 종목이 처음으로
+    빠진 영업일이며, 조회 종료일까지 편입되어 있으면 NaT이다.
+    """
+
+    def __init__(self, ticker: str, intervals: DataFrame, fromdate: str,
+                 todate: str):
+        self.ticker = ticker
+        self.intervals = intervals
+        self.fromdate = fromdate
+        self.todate = todate
+        right = intervals['편출일'].fillna(pd.Timestamp.max)
+        self._index = pd.IntervalIndex.from_arrays(
+            intervals['편입일'], right, closed='left')
+
+    @classmethod
+    def from_snapshots(cls, ticker: str, snapshots: dict, fromdate: str,
+                       todate: str) -> "IndexConstituentHistory":
+        """{일자(YYYYMMDD): 구성종목 리스트}로부터 이력 생성
+
+        인접한 두 스냅샷이 같으면 그 사이의 구성종목도 같다고 가정한다.
+        """
+        rows = []
+        opened = {}
+        for date in sorted(snapshots):
+            members = set(snapshots[date])
+            for t in members - opened.keys():
+                opened[t] = date
+            for t in opened.keys() - members:
+                rows.append([t, opened.pop(t), date])
+        rows += [[t, d, None] for t, d in opened.items()]
+
+        df = DataFrame(rows, columns=['티커', '편입일', '편출일'])
+        df['편입일'] = pd.to_datetime(df['편입일'], format='%Y%m%d')
+        df['편출일'] = pd.to_datetime(df['편출일'], format='%Y%m%d')
+        df = df.sort_values(['편입일', '티커'], ignore_index=True)
+        return cls(ticker, df, fromdate, todate)
+
+    def get(self, date: str) -> list:
+        """date 시점의 구성종목. 조회 기간 밖의 일자는 빈 리스트를 반환한다.
+
+        Args:
+            date (str): 조회 일자 (YYYYMMDD, YYYY-MM-DD 또는 datetime)
+        """
+        if isinstance(date, datetime.datetime):
+            date = date.strftime("%Y%m%d")
+        date = date.replace("-", "")
+        if not (self.fromdate <= date <= self.todate) or self.intervals.empty:
+            return []
+        mask = self._index.contains(pd.Timestamp(date))
+        return sorted(self.intervals.loc[mask, '티커'].tolist())
+
+    def changes(self) -> DataFrame:
+        """조회 기간 중의 편입/편출 내역
+
+        Returns:
+            DataFrame:
+                         티커    구분
+                날짜
+                2021-06-11  003670  편입
+                2021-06-11  000990  편출
+        """
+        # 첫 스냅샷의 구성종목은 조회 시작 전부터 편입되어 있던 종목이다
+        start = self.intervals['편입일'].min()
+        df_in = self.intervals[self.intervals['편입일'] > start]
+        df_out = self.intervals[self.intervals['편출일'].notna()]
+        df = pd.concat([
+            DataFrame({'날짜': df_in['편입일'], '티커': df_in['티커'],
+                       '구분': '편입'}),
+            DataFrame({'날짜': df_out['편출일'], '티커': df_out['티커'],
+                       '구분': '편출'}),
+        ])
+        return df.sort_values(['날짜', '구분', '티커']).set_index('날짜')
+
+
+def get_index_constituent_history(fromdate: str, todate: str, ticker: str,
+                                  step: int = 20, max_workers: int = 4) \
+        -> IndexConstituentHistory:
+    """기간 내 지수 구성종목 이력
+
+    step 영업일 간격의 스냅샷을 동시에 조회한 뒤, 구성종목이 달라진 구간만
+    이분 탐색으로 좁혀 변경 일자를 찾는다. 정기 변경이 드문 지수는 영업일
+    전체를 조회하는 것보다 훨씬 적은 요청으로 이력을 만든다.
+
+    NOTE: 한 구간 안에서 편출 후 다시 편입되어 양 끝 스냅샷이 같아지는 경우는
+          찾지 못한다. 변경이 잦은 지수는 step을 줄여서 조회한다.
+    NOTE: 빈 스냅샷(조회 실패)은 구성종목을 모르는 일자로 보고 구간의 경계로
+          사용하지 않는다. 이분 탐색 중에는 구간 안의 다른 영업일을 대신 조회한다.
+
+    Args:
+        fromdate    (str): 조회 시작 일자 (YYYYMMDD)
+        todate      (str): 조회 종료 일자 (YYYYMMDD)
+        ticker      (str): 인덱스 티커
+        step        (int): 스냅샷 간격 (영업일)
+        max_workers (int): 동시에 조회할 일자 수
+
+    Returns:
+        IndexConstituentHistory:
+
+            >> h = get_index_constituent_history("20210104", "20211230", "1028")
+            >> h.get("20210615")
+            ['000060', '000080', '000100', ...]
+    """
+    days = get_trading_days(fromdate, todate)
+    if not days:
+        return IndexConstituentHistory.from_snapshots(ticker, {}, fromdate,
+                                                      todate)
+
+    step = max(int(step), 1)
+    snapshots = {}
+    unknown = set()
+
+    def _fetch_all(positions):
+        positions = [p for p in positions
+                     if days[p] not in snapshots and p not in unknown]
+        results = parallel_map(
+            lambda p: get_index_portfolio_deposit_file(days[p], ticker),
+            positions, max_workers)
+        for p, members in zip(positions, results):
+            if len(members) == 0:
+                unknown.add(p)
+            else:
+                snapshots[days[p]] = frozenset(members)
+
+    def _midpoint(a, b):
+        # 구성종목을 모르는 영업일을 건너뛰고 가운데에 가장 가까운 영업일
+        candidates = [p for p in range(a + 1, b) if p not in unknown]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda p: abs(2 * p - a - b))
+
+    positions = sorted(set(range(0, len(days), step)) | {len(days) - 1})
+    _fetch_all(positions)
+    positions = [p for p in positions if p not in unknown]
+
+    pending = [(a, b) for a, b in zip(positions, positions[1:])
+               if snapshots[days[a]] != snapshots[days[b]]]
+    while pending:
+        pending = [(a, b, m) for a, b in pending
+                   for m in [_midpoint(a, b)] if m is not None]
+        _fetch_all([m for _, _, m in pending])
+
+        narrowed = []
+        for a, b, m in pending:
+            if m in unknown:
+                # 다른 영업일로 다시 나눈다
+                narrowed.append((a, b))
+                continue
+            if snapshots[days[a]] != snapshots[days[m]]:
+                narrowed.append((a, m))
+            if snapshots[days[m]] != snapshots[days[b]]:
+                narrowed.append((m, b))
+        pending = narrowed
+
+    return IndexConstituentHistory.from_snapshots(ticker, snapshots, fromdate,
+                                                  todate)
@@ -1,4 +1,4 @@
-from pykrx.website.comm import dataframe_empty_handler
+from pykrx.website.comm import dataframe_empty_handler, tracing
 from pykrx.website.krx.market.ticker import get_stock_ticker_isin
 from pykrx.website.krx.market.core import (
     개별종목시세, 전종목등락률, PER_PBR_배당수익률_전종목,
@@ -50,7 +50,37 @@ def get_market_ohlcv_by_date(fromdate: str, todate: str, ticker: str,
     isin = get_stock_ticker_isin(ticker)
     adjusted = 2 if adjusted else 1
     df = 개별종목시세().fetch(fromdate, todate, isin, adjusted)
+    return _parse_market_ohlcv_by_date(df)
 
+
+def iter_market_ohlcv_by_date(fromdate: str, todate: str, ticker: str,
+                              adjusted: bool = True):
+    """get_market_ohlcv_by_date()의 결과를 2년 단위 구간으로 나누어 반환
+
+    구간의 응답이 도착하는 대로 파싱해 반환하므로 장기간 조회에서도 전체 기간의
+    응답을 메모리에 모아 두지 않는다. 데이터가 없는 구간은 건너뛴다.
+
+    Args:
+        fromdate    (str): 조회 시작 일자 (YYYYMMDD)
+        todate      (str): 조회 종료 일자 (YYYYMMDD)
+        ticker      (str): 조회 종목의 ticker
+        adjusted    (bool, optional): 수정 종가 여부 (True/False)
+
+    Yields:
+        DataFrame: 구간별 OHLCV (get_market_ohlcv_by_date()와 같은 형식)
+
+        >> for df in iter_market_ohlcv_by_date("20000101", "20221231", "005930"):
+        ..     df.to_csv("005930.csv", mode="a")
+    """
+    isin = get_stock_ticker_isin(ticker)
+    adjusted = 2 if adjusted else 1
+    for df in 개별종목시세().iter_fetch(fromdate, todate, isin, adjusted):
+        if df.empty:
+            continue
+        yield _parse_market_ohlcv_by_date(df)
+
+
+def _parse_market_ohlcv_by_date(df: DataFrame) -> DataFrame:
     df = df[['TRD_DD', 'TDD_OPNPRC', 'TDD_HGPRC', 'TDD_LWPRC', 'TDD_CLSPRC',
              'ACC_TRDVOL', 'ACC_TRDVAL', 'FLUC_RT']]
     df.columns = ['날짜', '시가', '고가', '저가', '종가', '거래량', '거래대금',
@@ -818,6 +848,27 @@ def get_index_ohlcv_by_date(fromdate: str, todate: str, ticker: str) \
     """  # pylint: disable=line-too-long # noqa: E501
 
     df = 개별지수시세().fetch(ticker[1:], ticker[0], fromdate, todate)
+    return _parse_index_ohlcv_by_date(df)
+
+
+def iter_index_ohlcv_by_date(fromdate: str, todate: str, ticker: str):
+    """get_index_ohlcv_by_date()의 결과를 2년 단위 구간으로 나누어 반환
+
+    Args:
+        fromdate (str): 조회 시작 일자 (YYYYMMDD)
+        todate   (str): 조회 종료 일자 (YYYYMMDD)
+        ticker   (str): 인덱스 티커
+
+    Yields:
+        DataFrame: 구간별 지수 OHLCV (get_index_ohlcv_by_date()와 같은 형식)
+    """
+    for df in 개별지수시세().iter_fetch(ticker[1:], ticker[0], fromdate, todate):
+        if df.empty:
+            continue
+        yield _parse_index_ohlcv_by_date(df)
+
+
+def _parse_index_ohlcv_by_date(df: DataFrame) -> DataFrame:
     df = df[['TRD_DD', 'OPNPRC_IDX', 'HGPRC_IDX', 'LWPRC_IDX',
              'CLSPRC_IDX', 'ACC_TRDVOL', 'ACC_TRDVAL', 'MKTCAP']]
     df.columns = [
@@ -1514,6 +1565,9 @@ def get_stock_major_changes(ticker: str) -> DataFrame:
     return df.sort_index()
 
 
+tracing.trace_module(globals(), "wrap")
+
+
 if __name__ == "__main__":
     pd.set_option('display.expand_frame_repr', False)
     # df = get_market_price_change_by_ticker(
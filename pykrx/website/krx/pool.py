@@ -0,0 +1,228 @@
+"""여러 KRX 계정의 로그인 세션을 묶어 요청을 분산하는 세션 풀
+
+하나의 로그인 세션으로는 KRX가 허용하는 호출량에 처리량이 묶인다. 세션 풀은 여러
+계정으로 각각 로그인한 세션을 보유하고, KrxWebIo의 요청을 round-robin 또는
+least-loaded 방식으로 나누어 보낸다.
+
+- 계정별 호출 빈도 제한 (rate)
+- 계정별 상태 추적: 연속 실패(예외, LOGOUT, 403/429 응답)가 max_failures에
+  이르면 cooldown 동안 제외
+- 세션 만료(LOGOUT) 시 해당 계정만 재로그인 후 한 번 더 시도
+
+    >> from pykrx.website import krx
+    >> krx.use_session_pool([("id1", "pw1"), ("id2", "pw2")], rate=2)
+"""
+import threading
+import time
+from itertools import count
+
+import pykrx.website.krx.krxio as krxio
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.webio import get_thread_session
+from pykrx.website.krx.krxio import _is_logout_response, krx_login
+
+_STRATEGIES = ("round_robin", "least_loaded")
+# 계정이 차단/제한되었음을 나타내는 HTTP 상태 코드
+_FAILURE_STATUS_CODES = (403, 429)
+
+
+class _PoolMember:
+    def __init__(self, mbr_id: str, password: str, rate: float = None,
+                 burst: int = 1):
+        self.mbr_id = mbr_id
+        self.password = password
+        self.session = None
+        self.limiter = RateLimiter(rate, burst) if rate else None
+        self.generation = 0
+        self.inflight = 0
+        self.requests = 0
+        self.failures = 0
+        self.disabled_until = 0.0
+        self.login_lock = threading.Lock()
+
+    def healthy(self, now: float) -> bool:
+        return self.disabled_until <= now
+
+    def status(self, now: float) -> dict:
+        return {
+            "mbr_id": self.mbr_id,
+            "logged_in": self.session is not None,
+            "healthy": self.healthy(now),
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "generation": self.generation,
+        }
+
+
+def _parse_account(account):
+    if isinstance(account, dict):
+        return account["mbr_id"], account["password"]
+    mbr_id, password = account
+    return mbr_id, password
+
+
+class KrxSessionPool:
+    """여러 계정의 KRX 세션을 보유하고 요청을 분산하는 session 객체
+
+    get/post 인터페이스가 requests/curl-cffi의 Session과 같아 webio의 전역 HTTP
+    세션으로 그대로 주입할 수 있다. 로그인은 첫 요청 시점에 계정별로 수행한다.
+
+    Args:
+        accounts         (list          ): (mbr_id, password) 또는
+                                           {"mbr_id": .., "password": ..} 목록
+        strategy         (str,  optional): round_robin / least_loaded
+        rate             (float, optional): 계정별 초당 요청 수
+        burst            (int,  optional): 계정별 최대 연속 요청 수
+        max_failures     (int,  optional): 계정을 제외하기까지의 연속 실패 횟수
+        cooldown_seconds (float, optional): 제외된 계정을 다시 사용하기까지의 시간
+        allow_dup_login  (bool, optional): 중복 로그인(CD011) 시 강제 로그인.
+                                           생략하면 enable_auto_login 설정을 따른다.
+    """
+
+    # KrxWebIo가 세션 만료 시 전역 세션을 지우지 않고 relogin()을 호출하도록 한다.
+    manages_login = True
+
+    def __init__(self, accounts, *, strategy: str = "round_robin",
+                 rate: float = None, burst: int = 1, max_failures: int = 3,
+                 cooldown_seconds: float = 60, allow_dup_login: bool = None):
+        if strategy not in _STRATEGIES:
+            raise ValueError(f"strategy must be one of {_STRATEGIES}")
+        self.members = [_PoolMember(*_parse_account(a), rate=rate, burst=burst)
+                        for a in accounts]
+        if not self.members:
+            raise ValueError("at least one account is required")
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.cooldown_seconds = cooldown_seconds
+        self.allow_dup_login = allow_dup_login
+        self._lock = threading.Lock()
+        self._cursor = count()
+        self._local = threading.local()
+
+    # -- selection ------------------------------------------------------------
+    def _select(self) -> _PoolMember:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [m for m in self.members if m.healthy(now)]
+            if not candidates:
+                # 모두 제외된 상태라면 가장 먼저 복귀할 계정을 사용한다.
+                candidates = [min(self.members,
+                                  key=lambda m: m.disabled_until)]
+
+            if self.strategy == "least_loaded":
+                member = min(candidates,
+                             key=lambda m: (m.inflight, m.requests))
+            else:
+                member = candidates[next(self._cursor) % len(candidates)]
+            member.inflight += 1
+            return member
+
+    def _release(self, member: _PoolMember, ok: bool):
+        with self._lock:
+            member.inflight -= 1
+            member.requests += 1
+            if ok:
+                member.failures = 0
+                member.disabled_until = 0.0
+            else:
+                member.failures += 1
+                if member.failures >= self.max_failures:
+                    member.disabled_until = (time.monotonic()
+                                             + self.cooldown_seconds)
+
+    # -- login ----------------------------------------------------------------
+    def _login(self, member: _PoolMember):
+        allow_dup_login = self.allow_dup_login
+        if allow_dup_login is None:
+            allow_dup_login = krxio._AUTO_LOGIN_ALLOW_DUP_LOGIN
+        session, _ = krx_login(member.mbr_id, member.password,
+                               set_global_session=False,
+                               save_session_file=False,
+                               allow_dup_login=allow_dup_login)
+        return session
+
+    def _ensure_session(self, member: _PoolMember):
+        if member.session is None:
+            with member.login_lock:
+                if member.session is None:
+                    member.session = self._login(member)
+                    member.generation += 1
+        return member.session, member.generation
+
+    def _relogin(self, member: _PoolMember, generation: int):
+        """member가 아직 generation의 세션이면 재로그인. 이미 다른 요청이
+        재로그인했다면 그 세션을 사용한다."""
+        with member.login_lock:
+            if generation == member.generation:
+                member.session = self._login(member)
+                member.generation += 1
+        return member.session, member.generation
+
+    def relogin(self):
+        """이 스레드가 마지막으로 사용한 계정을 재로그인한다.
+
+        요청에 사용한 세션이 이미 교체되었다면(요청 중 LOGOUT으로 재로그인한 경우
+        등) 다시 로그인하지 않는다. 이 스레드가 풀로 요청한 적이 없으면 아무 계정도
+        재로그인하지 않는다.
+        """
+        bound = getattr(self._local, "bound", None)
+        if bound is None:
+            return
+        member, generation = bound
+        self._relogin(member, generation)
+
+    # -- session interface ----------------------------------------------------
+    def _send(self, session, method: str, url: str, **kwargs):
+        session = get_thread_session(session)
+        if method == "GET":
+            return session.get(url, **kwargs)
+        return session.post(url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs):
+        method = method.upper()
+        member = self._select()
+        self._local.bound = None
+        ok = False
+        try:
+            session, generation = self._ensure_session(member)
+            # relogin()은 요청 전에 확인한 세션 세대를 기준으로 판단한다
+            self._local.bound = (member, generation)
+            if member.limiter is not None:
+                member.limiter.acquire()
+            resp = self._send(session, method, url, **kwargs)
+            if _is_logout_response(resp):
+                session, _ = self._relogin(member, generation)
+                resp = self._send(session, method, url, **kwargs)
+            ok = (not _is_logout_response(resp)
+                  and getattr(resp, "status_code", 200)
+                  not in _FAILURE_STATUS_CODES)
+            return resp
+        finally:
+            self._release(member, ok)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def status(self) -> list:
+        """계정별 상태 (로그인 여부, 사용 가능 여부, 처리 중/누적 요청 수 등)"""
+        now = time.monotonic()
+        with self._lock:
+            return [m.status(now) for m in self.members]
+
+
+def use_session_pool(accounts, **kwargs) -> KrxSessionPool:
+    """이 프로세스의 KRX 요청을 세션 풀을 통해 수행하도록 설정
+
+    Args:
+        accounts (list): (mbr_id, password) 목록
+        kwargs         : KrxSessionPool 옵션 (strategy, rate 등)
+    """
+    from pykrx.website.comm.webio import set_http_session
+
+    pool = KrxSessionPool(accounts, **kwargs)
+    set_http_session(pool)
+    return pool
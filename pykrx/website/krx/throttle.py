@@ -0,0 +1,367 @@
+"""KRX 요청의 우선순위별 호출 빈도 제어
+
+대화형 조회와 백그라운드 수집이 같은 프로세스에서 하나의 호출 빈도 한도를 나누어
+쓸 때, 대화형 조회가 수천 건의 수집 요청 뒤에 줄 서지 않도록 한다.
+
+- 우선순위: high / normal / low. 현재 context의 우선순위는 request_priority()로 지정
+- 예약 몫: 전체 호출 빈도 중 reserved_share 만큼은 high 요청만 사용
+- 기아 방지: starvation_seconds 이상 기다린 요청은 한 단계씩 우선순위가 올라간다
+- 동시성 제어: 응답 지연과 차단 신호에 따라 동시 요청 수를 AIMD로 조절
+
+    >> from pykrx.website import krx
+    >> krx.enable_request_dispatcher(rate=2, reserved_share=0.3)
+    >> with krx.request_priority("low"):
+    ..     run_backfill()
+    >> limiter = krx.enable_adaptive_concurrency(initial=4, max_limit=16)
+    >> limiter.limit
+    4
+"""
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+PRIORITIES = ("high", "normal", "low")
+
+_PRIORITY = contextvars.ContextVar("pykrx_request_priority", default="normal")
+
+
+def _priority_level(priority: str) -> int:
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        raise ValueError(f"priority must be one of {PRIORITIES}") from None
+
+
+def get_request_priority() -> str:
+    return _PRIORITY.get()
+
+
+@contextmanager
+def request_priority(priority: str):
+    """with 블록(현재 스레드/asyncio task의 context) 안의 KRX 요청 우선순위 지정"""
+    _priority_level(priority)
+    token = _PRIORITY.set(priority)
+    try:
+        yield priority
+    finally:
+        _PRIORITY.reset(token)
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+
+    def refill(self, elapsed: float):
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+
+    def wait_time(self) -> float:
+        if self.rate <= 0:
+            return float("inf")
+        return max(1 - self.tokens, 0) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("level", "seq", "since")
+
+    def __init__(self, level: int, seq: int):
+        self.level = level
+        self.seq = seq
+        self.since = time.monotonic()
+
+
+class RequestDispatcher:
+    """우선순위와 예약 몫을 지원하는 호출 빈도 제한
+
+    Args:
+        rate               (float          ): 전체 초당 요청 수
+        reserved_share     (float, optional): high 요청만 사용할 수 있는 비율 (0~1)
+        starvation_seconds (float, optional): 이 시간 이상 기다린 요청은 우선순위를
+                                              한 단계 올린다
+        burst              (int,   optional): 한 번에 몰아서 허용할 최대 요청 수
+    """
+
+    def __init__(self, rate: float, *, reserved_share: float = 0.2,
+                 starvation_seconds: float = 30, burst: int = 1):
+        if rate is None or rate <= 0:
+            raise ValueError("rate must be a positive number")
+        if not 0 <= reserved_share < 1:
+            raise ValueError("reserved_share must be in [0, 1)")
+        self.rate = float(rate)
+        self.reserved_share = reserved_share
+        self.starvation_seconds = starvation_seconds
+        self._reserved = _Bucket(rate * reserved_share, max(burst, 1))
+        self._shared = _Bucket(rate * (1 - reserved_share), max(burst, 1))
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self.stats = {p: {"requests": 0, "wait_seconds": 0.0} for p in PRIORITIES}
+
+    def _effective_level(self, waiter: _Waiter, now: float) -> int:
+        if not self.starvation_seconds:
+            return waiter.level
+        promoted = int((now - waiter.since) // self.starvation_seconds)
+        return max(waiter.level - promoted, 0)
+
+    def _refill(self, now: float):
+        elapsed = now - self._last
+        self._last = now
+        self._reserved.refill(elapsed)
+        self._shared.refill(elapsed)
+
+    def _try_take(self, waiter: _Waiter, now: float) -> bool:
+        # 예약 몫은 원래 우선순위가 high인 요청만 사용한다
+        if waiter.level == 0 and self._reserved.tokens >= 1:
+            self._reserved.tokens -= 1
+            return True
+        if self._shared.tokens < 1:
+            return False
+
+        # 공유 몫은 (유효 우선순위, 도착 순서)가 가장 앞선 요청에 준다
+        key = (self._effective_level(waiter, now), waiter.seq)
+        for other in self._waiters:
+            if other is not waiter and \
+                    (self._effective_level(other, now), other.seq) < key:
+                return False
+        self._shared.tokens -= 1
+        return True
+
+    def acquire(self, priority: str = None, timeout: float = None) -> bool:
+        """요청 하나를 보낼 수 있을 때까지 기다린다. timeout 내에 얻지 못하면 False"""
+        if priority is None:
+            priority = get_request_priority()
+        waiter = _Waiter(_priority_level(priority), next(self._seq))
+        deadline = None if timeout is None else waiter.since + timeout
+
+        with self._cond:
+            self._waiters.append(waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._try_take(waiter, now):
+                        stats = self.stats[priority]
+                        stats["requests"] += 1
+                        stats["wait_seconds"] += now - waiter.since
+                        return True
+
+                    wait = self._shared.wait_time()
+                    if waiter.level == 0:
+                        wait = min(wait, self._reserved.wait_time())
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait, deadline - now)
+                    # 앞선 요청이 토큰을 가져가면 깨어나 다시 확인한다
+                    self._cond.wait(min(wait, 1.0))
+            finally:
+                self._waiters.remove(waiter)
+                self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str = None):
+        """요청 하나를 보내는 동안 사용하는 context manager"""
+        self.acquire(priority)
+        yield
+
+    def pending(self) -> dict:
+        """우선순위별 대기 중인 요청 수"""
+        with self._cond:
+            counts = {p: 0 for p in PRIORITIES}
+            for w in self._waiters:
+                counts[PRIORITIES[w.level]] += 1
+            return counts
+
+
+class AdaptiveConcurrencyLimiter:
+    """KRX 응답 지연과 차단 신호로 동시 요청 수를 조절하는 AIMD 제어기
+
+    응답 지연이 latency_target 이하이고 최근 오류율이 error_threshold 이하이면
+    limit개의 요청이 성공할 때마다 limit을 1씩 늘린다(additive increase).
+    403/429, 비JSON(HTML) 응답이나 LOGOUT 같은 차단 신호를 받으면 limit에
+    decrease_factor를 곱해 줄인다(multiplicative decrease). 한 번의 차단으로 동시에
+    실패한 요청들이 limit을 여러 번 줄이지 않도록 cooldown_seconds 동안은 다시 줄이지
+    않는다.
+
+    Args:
+        initial          (int,   optional): 초기 동시 요청 수
+        min_limit        (int,   optional): 최소 동시 요청 수
+        max_limit        (int,   optional): 최대 동시 요청 수
+        latency_target   (float, optional): 정상으로 볼 응답 지연 (초)
+        error_threshold  (float, optional): 정상으로 볼 최근 오류율 (0~1)
+        decrease_factor  (float, optional): 차단 시 limit에 곱할 값
+        cooldown_seconds (float, optional): 연속 감소를 막는 시간 (초)
+    """
+
+    def __init__(self, initial: int = 4, *, min_limit: int = 1,
+                 max_limit: int = 32, latency_target: float = 2.0,
+                 error_threshold: float = 0.1, decrease_factor: float = 0.5,
+                 cooldown_seconds: float = 1.0):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("require 1 <= min_limit <= initial <= max_limit")
+        self._limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.inflight = 0
+        self.error_rate = 0.0
+        self.latency = None
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self.stats = {"successes": 0, "errors": 0, "blocks": 0,
+                      "increases": 0, "decreases": 0}
+
+    @property
+    def limit(self) -> int:
+        """현재 허용하는 동시 요청 수"""
+        return int(self._limit + 1e-9)
+
+    def acquire(self, timeout: float = None) -> bool:
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self.inflight < self.limit,
+                                     timeout=timeout)
+            if ok:
+                self.inflight += 1
+            return ok
+
+    def release(self, outcome: str, latency: float = None):
+        """요청 하나의 결과를 기록한다.
+
+        Args:
+            outcome (str  ): success / error / blocked
+            latency (float): 응답 지연 (초)
+        """
+        with self._cond:
+            self.inflight -= 1
+            # 최근 요청 20개 정도를 반영하는 지수 이동 평균
+            failed = outcome != "success"
+            self.error_rate += (float(failed) - self.error_rate) / 20
+            if latency is not None:
+                self.latency = latency if self.latency is None else \
+                    self.latency + (latency - self.latency) / 5
+
+            if outcome == "blocked":
+                self.stats["blocks"] += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown_seconds:
+                    self._last_decrease = now
+                    self._limit = max(self.min_limit,
+                                      self._limit * self.decrease_factor)
+                    self.stats["decreases"] += 1
+            elif outcome == "error":
+                self.stats["errors"] += 1
+            else:
+                self.stats["successes"] += 1
+                healthy = (self.error_rate <= self.error_threshold and
+                           (self.latency is None or
+                            self.latency <= self.latency_target))
+                if healthy and self._limit < self.max_limit:
+                    before = self.limit
+                    self._limit = min(self.max_limit,
+                                      self._limit + 1 / self._limit)
+                    if self.limit > before:
+                        self.stats["increases"] += 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        """현재 limit, 처리 중인 요청 수, 평균 지연, 오류율과 누적 통계"""
+        with self._cond:
+            return {"limit": self.limit, "inflight": self.inflight,
+                    "latency": self.latency, "error_rate": self.error_rate,
+                    **self.stats}
+
+
+class _Slot:
+    def __init__(self):
+        self.outcome = "success"
+
+    def record(self, *, blocked: bool = False, error: bool = False):
+        if blocked:
+            self.outcome = "blocked"
+        elif error:
+            self.outcome = "error"
+
+
+_DISPATCHER = None
+_CONCURRENCY = None
+
+
+def set_request_dispatcher(dispatcher):
+    """KrxWebIo의 모든 HTTP 요청이 거칠 dispatcher 설정 (None이면 해제)"""
+    global _DISPATCHER
+    _DISPATCHER = dispatcher
+
+
+def get_request_dispatcher():
+    return _DISPATCHER
+
+
+def enable_request_dispatcher(rate: float, **kwargs) -> RequestDispatcher:
+    """우선순위 dispatcher를 만들어 KRX 요청에 적용한다.
+
+    Args:
+        rate   (float): 전체 초당 요청 수
+        kwargs        : RequestDispatcher 옵션 (reserved_share, starvation_seconds 등)
+    """
+    dispatcher = RequestDispatcher(rate, **kwargs)
+    set_request_dispatcher(dispatcher)
+    return dispatcher
+
+
+def set_concurrency_limiter(limiter):
+    """KrxWebIo의 모든 HTTP 요청에 적용할 동시성 제어기 설정 (None이면 해제)"""
+    global _CONCURRENCY
+    _CONCURRENCY = limiter
+
+
+def get_concurrency_limiter():
+    return _CONCURRENCY
+
+
+def enable_adaptive_concurrency(initial: int = 4,
+                                **kwargs) -> AdaptiveConcurrencyLimiter:
+    """AIMD 동시성 제어기를 만들어 KRX 요청에 적용한다.
+
+    Args:
+        initial (int): 초기 동시 요청 수
+        kwargs       : AdaptiveConcurrencyLimiter 옵션 (max_limit 등)
+
+    Returns:
+        AdaptiveConcurrencyLimiter: limit / snapshot()으로 현재 상태를 확인한다.
+    """
+    limiter = AdaptiveConcurrencyLimiter(initial, **kwargs)
+    set_concurrency_limiter(limiter)
+    return limiter
+
+
+@contextmanager
+def request_slot():
+    """설정된 동시성 제어기와 dispatcher에 따라 요청 하나를 보낸다.
+
+    yield된 객체의 record()로 응답이 차단 신호였는지 알린다. 블록 안에서 예외가
+    발생하면 오류로 기록한다.
+    """
+    limiter, dispatcher = _CONCURRENCY, _DISPATCHER
+    slot = _Slot()
+    # 호출 빈도 토큰을 먼저 얻는다. 동시성 slot을 먼저 잡으면 토큰을 기다리는 low
+    # 요청들이 slot을 모두 차지해 high 요청이 예약 몫을 쓰지 못한다.
+    if dispatcher is not None:
+        dispatcher.acquire()
+    if limiter is not None:
+        limiter.acquire()
+    started = time.monotonic()
+    try:
+        yield slot
+    except BaseException:
+        slot.record(error=True)
+        raise
+    finally:
+        if limiter is not None:
+            limiter.release(slot.outcome, time.monotonic() - started)
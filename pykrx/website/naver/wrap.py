@@ -1,3 +1,4 @@
+from pykrx.website.comm import tracing
 from pykrx.website.naver.core import Sise
 import xml.etree.ElementTree as et
 from pandas import DataFrame
@@ -70,6 +71,9 @@ def get_index_ohlcv_by_date(fromdate, todate, symbol):
         return DataFrame()
 
 
+tracing.trace_module(globals(), "wrap")
+
+
 if __name__ == "__main__":
     # df = get_market_ohlcv_by_date("20010101", "20190820", "005930")
     # df = get_market_ohlcv_by_date("20191220", "20200227", "000020")
@@ -1,7 +1,14 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
-from pykrx.website.krx.krxio import KrxWebIo, enable_auto_login
+from pykrx.website.krx import krxio
+from pykrx.website.krx.krxio import (
+    KrxWebIo, enable_auto_login, get_login_metrics, reset_login_metrics
+)
 from pykrx.website.comm.util import PykrxRequestError
 
 
@@ -113,5 +120,88 @@ class AutoLoginOnFailureTest(unittest.TestCase):
                 io.read()
 
 
+class SingleFlightLoginTest(unittest.TestCase):
+    def setUp(self):
+        reset_login_metrics()
+        self.logged_in = threading.Event()
+        self.resp = MagicMock()
+        self.resp.status_code = 200
+        self.resp.headers = {"content-type": "application/json"}
+        self.resp.text = "{}"
+
+    def tearDown(self):
+        enable_auto_login(True)
+
+    def _parse(self, resp):
+        return {"output": []} if self.logged_in.is_set() else {}
+
+    def _slow_login(self, *args, **kwargs):
+        time.sleep(0.2)
+        self.logged_in.set()
+        return None, {"MBR_NO": "1"}
+
+    def test_concurrent_failures_login_once(self):
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            io = _DummyIo()
+            io._parse_json = self._parse
+            barrier.wait()
+            results.append(io.read())
+
+        with patch("pykrx.website.comm.webio.Post.read", return_value=self.resp):
+            with patch("pykrx.website.krx.krxio.krx_login",
+                       side_effect=self._slow_login) as mlogin:
+                enable_auto_login(True)
+                threads = [threading.Thread(target=worker) for _ in range(8)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+        self.assertEqual(mlogin.call_count, 1)
+        self.assertEqual(results, [{"output": []}] * 8)
+        metrics = get_login_metrics()
+        self.assertEqual(metrics["logins"], 1)
+        self.assertEqual(metrics["joined"], 7)
+        self.assertGreaterEqual(metrics["last_recovery_seconds"], 0.2)
+
+    def test_cross_process_reuses_newer_session_file(self):
+        fresh = MagicMock()
+        real_lock = krxio._file_lock
+
+        with tempfile.TemporaryDirectory() as d:
+            session_file = os.path.join(d, "session.json")
+
+            def lock_after_other_process_login(*args, **kwargs):
+                # 락을 기다리는 동안 다른 프로세스가 로그인해 세션 파일을 갱신했다.
+                with open(session_file, "w") as f:
+                    f.write("{}")
+                return real_lock(*args, **kwargs)
+
+            def set_session(session):
+                if session is fresh:
+                    self.logged_in.set()
+
+            io = _DummyIo()
+            io._parse_json = self._parse
+
+            with patch.dict(os.environ, {"KRX_SESSION_FILE": session_file}), \
+                    patch("pykrx.website.comm.webio.Post.read",
+                          return_value=self.resp), \
+                    patch.object(krxio, "_file_lock",
+                                 side_effect=lock_after_other_process_login), \
+                    patch.object(krxio, "_load_session_from_file",
+                                 side_effect=[None, fresh]), \
+                    patch.object(krxio, "set_http_session",
+                                 side_effect=set_session), \
+                    patch.object(krxio, "krx_login") as mlogin:
+                enable_auto_login(True, cross_process=True)
+                self.assertEqual(io.read(), {"output": []})
+
+        self.assertEqual(mlogin.call_count, 0)
+        self.assertEqual(get_login_metrics()["session_file_reuses"], 1)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from pykrx import backfill, stock
+
+
+def _ohlcv(fromdate, todate, ticker, adjusted=True):
+    index = pd.date_range(fromdate, todate, freq="D", name="날짜")
+    return pd.DataFrame({"종가": range(len(index))}, index=index)
+
+
+class BackfillJobTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmpdir.name, "backfill.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _job(self, **kwargs):
+        return backfill.BackfillJob(
+            self.db, "get_market_ohlcv_by_date", "20220101", "20220110",
+            tickers=["005930", "000660"], chunk_days=5, **kwargs)
+
+    def test_expand_and_load(self):
+        with patch.object(stock, "get_market_ohlcv_by_date",
+                          side_effect=_ohlcv) as mfetch:
+            with self._job(kwargs={"adjusted": False}) as job:
+                reports = []
+                result = job.run(max_workers=2, progress=reports.append)
+                df = job.load()
+
+        self.assertEqual(mfetch.call_count, 4)
+        self.assertEqual(mfetch.call_args.kwargs, {"adjusted": False})
+        self.assertEqual(result["done"], 4)
+        self.assertEqual(result["pending"], 0)
+        self.assertEqual(len(reports), 4)
+        self.assertEqual(len(df.loc["005930"]), 10)
+        self.assertEqual(df.index.names, ["티커", "날짜"])
+
+    def test_results_are_stored_as_arrow(self):
+        with patch.object(stock, "get_market_ohlcv_by_date",
+                          side_effect=_ohlcv):
+            with self._job() as job:
+                job.run()
+                blobs = [row[0] for row in job._conn.execute(
+                    "SELECT result FROM units")]
+
+        self.assertEqual(len(blobs), 4)
+        for blob in blobs:
+            self.assertEqual(bytes(blob[:6]), b"ARROW1")
+
+    def test_resume_after_failures_and_crash(self):
+        calls = []
+
+        def flaky(fromdate, todate, ticker):
+            calls.append((ticker, fromdate))
+            if ticker == "000660":
+                raise ConnectionError("network blip")
+            return _ohlcv(fromdate, todate, ticker)
+
+        with patch.object(stock, "get_market_ohlcv_by_date", side_effect=flaky):
+            with self._job(max_attempts=2, retry_backoff=0) as job:
+                result = job.run()
+                self.assertEqual(result["done"], 2)
+                self.assertEqual(result["failed"], 2)
+                self.assertEqual(len(job.failures()), 2)
+                # 실패 단위는 max_attempts만큼 시도된다
+                self.assertEqual(len(calls), 2 + 2 * 2)
+
+        # 다른 프로세스가 실행 중 종료되어 running 상태가 남은 경우
+        with self._job() as job:
+            job._conn.execute("UPDATE units SET status = 'running' "
+                              "WHERE ticker = '005930' AND fromdate = '20220106'")
+
+        calls.clear()
+        with patch.object(stock, "get_market_ohlcv_by_date",
+                          side_effect=_ohlcv) as mfetch:
+            with self._job() as job:
+                job.reset_failed()
+                result = job.run()
+
+        self.assertEqual(mfetch.call_count, 3)
+        self.assertEqual(result["done"], 4)
+
+    def test_live_lease_is_not_claimed_again(self):
+        with self._job() as job:
+            job._conn.execute(
+                "UPDATE units SET status = 'running', worker = 'other', "
+                "lease_until = ? WHERE seq = 0", (time.time() + 600,))
+
+        with patch.object(stock, "get_market_ohlcv_by_date",
+                          side_effect=_ohlcv) as mfetch:
+            with self._job() as job:
+                result = job.run()
+
+        # 다른 실행이 수집 중인 단위는 건드리지 않는다
+        self.assertEqual(mfetch.call_count, 3)
+        self.assertEqual(result["done"], 3)
+        self.assertEqual(result["pending"], 1)
+
+    def test_each_unit_is_claimed_once(self):
+        with self._job() as first, self._job() as second:
+            claimed = [first._claim(), second._claim(), first._claim(),
+                       second._claim(), first._claim()]
+
+        seqs = [u[0] for u in claimed if u is not None]
+        self.assertEqual(sorted(seqs), [0, 1, 2, 3])
+        self.assertIsNone(claimed[-1])
+
+    def test_failed_unit_waits_for_backoff(self):
+        calls = []
+
+        def flaky(fromdate, todate, ticker):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise ConnectionError("network blip")
+            return _ohlcv(fromdate, todate, ticker)
+
+        with patch.object(stock, "get_market_ohlcv_by_date", side_effect=flaky):
+            with backfill.BackfillJob(
+                    self.db, "get_market_ohlcv_by_date", "20220101",
+                    "20220105", tickers=["005930"], chunk_days=5,
+                    retry_backoff=0.3) as job:
+                result = job.run()
+
+        self.assertEqual(result["done"], 1)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.3)
+
+    def test_snapshot_mode(self):
+        def snapshot(date, market="KOSPI"):
+            return pd.DataFrame({"종가": [1, 2]},
+                                index=pd.Index(["005930", "000660"], name="티커"))
+
+        with patch("pykrx.website.krx.get_trading_days",
+                   return_value=["20220103", "20220104"]), \
+                patch.object(stock, "get_market_ohlcv_by_ticker",
+                             side_effect=snapshot):
+            with backfill.BackfillJob(self.db, "get_market_ohlcv_by_ticker",
+                                      "20220101", "20220104",
+                                      kwargs={"market": "ALL"}) as job:
+                job.run()
+                df = job.load()
+
+        self.assertEqual(df.index.names, ["날짜", "티커"])
+        self.assertEqual(len(df), 4)
+
+    def test_unknown_dataset(self):
+        with self.assertRaises(ValueError):
+            backfill.BackfillJob(self.db, "no_such_function", "20220101",
+                                 "20220110", tickers=["005930"])
+
+
+if __name__ == "__main__":
+    unittest.main()
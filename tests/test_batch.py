@@ -0,0 +1,198 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+import unittest
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pandas as pd
+
+from unittest.mock import MagicMock
+
+from pykrx import batch
+from pykrx.website.comm.shm import export_shared, import_shared
+from pykrx.website.comm.webio import get_http_session, use_http_session
+from pykrx.website.krx import hooks
+from pykrx.website.krx.krxio import KrxWebIo
+
+
+def _module(**funcs):
+    return types.SimpleNamespace(__name__="fake", **funcs)
+
+
+def make_frame(n, name="종가"):
+    return pd.DataFrame({name: np.arange(n, dtype=np.int64),
+                         "티커": [f"{i:06d}" for i in range(n)]})
+
+
+class 전종목시세(KrxWebIo):
+    @property
+    def bld(self):
+        return "dbms/MDC/STAT/standard/MDCSTAT01501"
+
+    def fetch(self, trdDd: str):
+        return self.read(trdDd=trdDd)["output"]
+
+
+def parse_snapshot(date):
+    df = pd.DataFrame(전종목시세().fetch(date))
+    return df.assign(pid=os.getpid())
+
+
+def _krx_session(output):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.json.return_value = {"output": output}
+    session = MagicMock()
+    session.post.return_value = resp
+    return session
+
+
+class BatchExecutorTest(unittest.TestCase):
+    def test_results_in_order_with_errors(self):
+        def echo(x, scale=1):
+            time.sleep(0.01 * (5 - x))
+            if x == 2:
+                raise ValueError("bad")
+            return x * scale
+
+        results = batch.BatchExecutor(
+            [("echo", i, {"scale": 10}) for i in range(5)],
+            max_workers=3, module=_module(echo=echo)).run()
+
+        self.assertEqual([r.value for r in results], [0, 10, None, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertFalse(results[2].ok)
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(_):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+
+        batch.BatchExecutor([("work", i) for i in range(10)], max_workers=2,
+                            module=_module(work=work)).run()
+        self.assertLessEqual(state["peak"], 2)
+
+    def test_rate_limit(self):
+        started = time.monotonic()
+        batch.BatchExecutor([("f",)] * 3, max_workers=3, rate=10,
+                            module=_module(f=lambda: None)).run()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_timeout(self):
+        results = batch.BatchExecutor(
+            [("sleep", 1.0), ("sleep", 0)], timeout=0.1,
+            module=_module(sleep=time.sleep)).run()
+        self.assertIsInstance(results[0].error, TimeoutError)
+        self.assertTrue(results[1].ok)
+
+    def test_cancel(self):
+        executor = batch.BatchExecutor(
+            [("sleep", 0.2)] * 4, max_workers=1,
+            module=_module(sleep=time.sleep)).start()
+        time.sleep(0.05)
+        executor.cancel()
+        results = executor.wait()
+        self.assertTrue(all(isinstance(r.error, CancelledError)
+                            for r in results[1:]))
+
+    def test_session_binding_is_propagated(self):
+        session = object()
+        with use_http_session(session):
+            results = batch.BatchExecutor(
+                [("get",)], module=_module(get=get_http_session)).run()
+        self.assertIs(results[0].value, session)
+
+    def test_unknown_function(self):
+        with self.assertRaises(ValueError):
+            batch.run([("no_such_function",)])
+        with self.assertRaises(ValueError):
+            batch.run([("_private",)])
+
+
+class ProcessModeTest(unittest.TestCase):
+    def test_shared_memory_round_trip(self):
+        df = make_frame(1000)
+        handle = export_shared(df)
+        self.assertIsNotNone(handle[1])
+        pd.testing.assert_frame_equal(import_shared(handle), df)
+
+    @unittest.skipUnless(os.name == "posix", "POSIX shared memory only")
+    def test_unimported_block_is_removed_with_creator(self):
+        # 받는 쪽이 가져가지 않은 블록은 만든 프로세스가 끝나면 지워진다
+        code = ("import numpy as np; from pykrx.website.comm.shm import "
+                "export_shared; print(export_shared(np.arange(1000))[1])")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                             text=True, check=True)
+        name = out.stdout.strip().lstrip("/")
+        deadline = time.monotonic() + 5
+        while os.path.exists(f"/dev/shm/{name}") and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(os.path.exists(f"/dev/shm/{name}"))
+
+    def test_process_mode(self):
+        module = sys.modules[__name__]
+        results = batch.BatchExecutor(
+            [("make_frame", 10), ("make_frame", 20, {"name": "시가"}),
+             ("make_frame", "x")],
+            max_workers=2, module=module, mode="process").run()
+
+        pd.testing.assert_frame_equal(results[0].value, make_frame(10))
+        self.assertEqual(list(results[1].value.columns), ["시가", "티커"])
+        self.assertIsInstance(results[2].error, TypeError)
+
+    def test_process_mode_fetches_in_parent(self):
+        sent = []
+        hook = hooks.add_hook("before_request",
+                              lambda **info: sent.append(info["params"]))
+        self.addCleanup(hooks.remove_hook, "before_request", hook)
+
+        session = _krx_session([{"ISU_SRT_CD": "005930"}])
+        with use_http_session(session):
+            results = batch.BatchExecutor(
+                [("parse_snapshot", "20220902"),
+                 ("parse_snapshot", "20220905")],
+                max_workers=2, module=sys.modules[__name__],
+                mode="process").run()
+
+        # 요청은 이 프로세스의 세션과 hook을 거치고, 파싱은 worker에서 한다
+        self.assertEqual(sorted(p["trdDd"] for p in sent),
+                         ["20220902", "20220905"])
+        self.assertEqual(session.post.call_count, 2)
+        for r in results:
+            self.assertEqual(r.value["ISU_SRT_CD"].tolist(), ["005930"])
+            self.assertNotEqual(r.value["pid"].iloc[0], os.getpid())
+
+    def test_timed_out_call_stops_serving_before_shutdown(self):
+        def slow_post(*args, **kwargs):
+            time.sleep(1.0)
+            return _krx_session([{"ISU_SRT_CD": "005930"}]).post()
+
+        session = _krx_session([])
+        session.post.side_effect = slow_post
+
+        with use_http_session(session):
+            executor = batch.BatchExecutor(
+                [("parse_snapshot", "20220902")], timeout=0.3,
+                module=sys.modules[__name__], mode="process")
+            results = executor.run()
+
+        self.assertIsInstance(results[0].error, TimeoutError)
+        # 조회를 대신하던 스레드는 manager가 닫히기 전에 끝난다
+        self.assertFalse(any(t.is_alive()
+                             for t in executor._executor._threads))
+
+
+if __name__ == "__main__":
+    unittest.main()
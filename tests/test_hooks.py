@@ -0,0 +1,140 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.comm.util import PykrxRequestError
+from pykrx.website.comm.webio import use_http_session
+from pykrx.website.krx import hooks, krxio
+from pykrx.website.krx.hooks import MetricsCollector, add_hook, remove_hook
+from pykrx.website.krx.krxio import KrxWebIo, enable_auto_login
+
+
+class 전종목시세(KrxWebIo):
+    @property
+    def bld(self):
+        return "dbms/MDC/STAT/standard/MDCSTAT01501"
+
+
+def _response(status=200, text='{"output": []}'):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = {"content-type": "application/json"}
+    resp.text = text
+    resp.content = text.encode()
+    resp.json.side_effect = lambda: json.loads(text)
+    return resp
+
+
+class HookTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        for event in hooks.EVENTS:
+            func = add_hook(event, lambda event=event, **info:
+                            self.events.append((event, info)))
+            self.addCleanup(remove_hook, event, func)
+
+    def test_request_events(self):
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      return_value=_response()):
+            전종목시세().read(trdDd="20220902", mktId="STK")
+
+        self.assertEqual([e for e, _ in self.events],
+                         ["before_request", "after_response"])
+        info = self.events[1][1]
+        self.assertEqual((info["bld"], info["dataset"], info["status"],
+                          info["bytes"], info["error"]),
+                         ("dbms/MDC/STAT/standard/MDCSTAT01501", "전종목시세",
+                          200, 14, None))
+        self.assertEqual(info["params"]["trdDd"], "20220902")
+
+    def test_retry_and_login_events(self):
+        # output이 없는 응답은 세션 만료로 보고 재로그인 후 재시도한다
+        responses = [_response(text="{}"), _response()]
+        self.addCleanup(enable_auto_login, False)
+        enable_auto_login(True)
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      side_effect=lambda *a, **k: responses.pop(0)), \
+                patch.object(krxio, "_resolve_krx_credentials",
+                             return_value=(None, None)):
+            with self.assertRaises(PykrxRequestError):
+                전종목시세().read(trdDd="20220902", mktId="STK")
+
+        events = dict(self.events)
+        self.assertIsInstance(events["on_retry"]["error"], PykrxRequestError)
+        self.assertFalse(events["on_login"]["ok"])
+
+    def test_hook_errors_do_not_break_requests(self):
+        def broken(**info):
+            raise RuntimeError("boom")
+
+        add_hook("before_request", broken)
+        self.addCleanup(remove_hook, "before_request", broken)
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      return_value=_response()), \
+                patch("logging.exception"):
+            self.assertEqual(전종목시세().read(trdDd="20220902"), {"output": []})
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            add_hook("on_cache", print)
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsCollector(latency_buckets=(0.1, 1.0),
+                                        size_buckets=(100,))
+        info = dict(bld="b/MDCSTAT01501", dataset="전종목시세", params={})
+        self.metrics.after_response(**info, status=200, bytes=50,
+                                    elapsed=0.05, error=None)
+        self.metrics.after_response(**info, status=200, bytes=500,
+                                    elapsed=0.5, error=None)
+        self.metrics.after_response(**info, status=None, bytes=0,
+                                    elapsed=2.0, error=OSError())
+        self.metrics.on_retry(**info, error=None)
+        self.metrics.on_login(ok=True, elapsed=1.5, error=None)
+
+    def test_to_dict(self):
+        snapshot = self.metrics.to_dict()
+        row = snapshot["requests"][0]
+        self.assertEqual((row["requests"], row["errors"], row["retries"]),
+                         (3, 1, 1))
+        self.assertEqual(row["status"], {"200": 2, "error": 1})
+        self.assertEqual(row["latency"]["buckets"],
+                         [(0.1, 1), (1.0, 2), (float("inf"), 3)])
+        self.assertEqual(row["bytes"]["sum"], 550)
+        self.assertEqual(snapshot["logins"],
+                         {"ok": 1, "failed": 0, "seconds": 1.5})
+
+    def test_to_prometheus(self):
+        text = self.metrics.to_prometheus()
+        labels = 'bld="b/MDCSTAT01501",dataset="전종목시세"'
+        self.assertIn("# TYPE pykrx_krx_request_duration_seconds histogram",
+                      text)
+        self.assertIn(
+            f'pykrx_krx_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3',
+            text)
+        self.assertIn(f'pykrx_krx_response_bytes_bucket{{{labels},le="100.0"}} 2',
+                      text)
+        self.assertIn(f'pykrx_krx_requests_total{{{labels},status="error"}} 1',
+                      text)
+        self.assertIn('pykrx_krx_logins_total{result="ok"} 1', text)
+
+    def test_enable_metrics(self):
+        self.addCleanup(hooks.set_metrics_collector, None)
+        metrics = hooks.enable_metrics()
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      return_value=_response()):
+            전종목시세().read(trdDd="20220902", mktId="STK")
+        self.assertEqual(metrics.to_dict()["requests"][0]["requests"], 1)
+
+        hooks.set_metrics_collector(None)
+        self.assertNotIn(metrics.after_response,
+                         hooks._HOOKS["after_response"])
+
+
+if __name__ == "__main__":
+    unittest.main()
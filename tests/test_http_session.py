@@ -0,0 +1,122 @@
+import contextvars
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.comm import webio
+from pykrx.website.comm.parallel import parallel_map
+from pykrx.website.comm.webio import (
+    get_http_session, get_thread_session, set_http_session, use_http_session
+)
+from pykrx.website.krx.krxio import KrxWebIo, enable_auto_login
+from pykrx.website.krx.throttle import get_request_priority, request_priority
+
+
+class _DummyIo(KrxWebIo):
+    @property
+    def bld(self):
+        return "dummy"
+
+    def fetch(self, **params):
+        return self.read(**params)
+
+
+class HttpSessionBindingTest(unittest.TestCase):
+    def tearDown(self):
+        set_http_session(None)
+
+    def test_context_binding_does_not_leak(self):
+        default, scoped = MagicMock(), MagicMock()
+        set_http_session(default)
+
+        seen = {}
+
+        def worker():
+            with use_http_session(scoped):
+                seen["inner"] = get_http_session()
+                # 블록 안에서의 교체는 블록의 바인딩에만 적용된다.
+                set_http_session(None)
+                seen["replaced"] = get_http_session()
+            seen["outer"] = get_http_session()
+
+        t = threading.Thread(target=contextvars.copy_context().run,
+                             args=(worker,))
+        t.start()
+        t.join()
+
+        self.assertIs(seen["inner"], scoped)
+        self.assertIsNone(seen["replaced"])
+        self.assertIs(seen["outer"], default)
+        self.assertIs(get_http_session(), default)
+
+    def test_curl_session_is_cloned_per_thread(self):
+        try:
+            from curl_cffi import requests as crequests
+        except Exception:
+            self.skipTest("curl-cffi is not installed")
+
+        base = crequests.Session()
+        base.cookies.set("JSESSIONID", "abc", domain="data.krx.co.kr")
+
+        clones = []
+
+        def worker():
+            first = get_thread_session(base)
+            self.assertIs(get_thread_session(base), first)
+            clones.append(first)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertIsNot(clones[0], clones[1])
+        for clone in clones:
+            self.assertIsNot(clone, base)
+            self.assertEqual(clone.cookies.get("JSESSIONID"), "abc")
+
+    def test_plain_session_is_shared(self):
+        session = MagicMock()
+        self.assertIs(get_thread_session(session), session)
+
+    def test_logout_keeps_session_installed_by_other_thread(self):
+        expired, fresh = MagicMock(), MagicMock()
+        set_http_session(expired)
+
+        def post_read(io, **params):
+            # 이 요청이 진행되는 동안 다른 스레드가 재로그인했다.
+            webio._HTTP_SESSION = fresh
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.headers = {"content-type": "text/plain"}
+            resp.text = "LOGOUT"
+            return resp
+
+        with patch("pykrx.website.comm.webio.Post.read", post_read):
+            with patch("pykrx.website.krx.krxio.clear_session_file") as mclear:
+                enable_auto_login(False)
+                try:
+                    with self.assertRaises(Exception):
+                        _DummyIo().read()
+                finally:
+                    enable_auto_login(True)
+
+        self.assertEqual(mclear.call_count, 0)
+        self.assertIs(get_http_session(), fresh)
+
+
+class ParallelMapContextTest(unittest.TestCase):
+    def test_workers_inherit_caller_context(self):
+        session = MagicMock()
+
+        def observe(_):
+            return get_http_session() is session, get_request_priority()
+
+        with use_http_session(session), request_priority("low"):
+            seen = parallel_map(observe, range(4), max_workers=4)
+        self.assertEqual(seen, [(True, "low")] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 import unittest
@@ -14,6 +15,7 @@ from pykrx.website.krx.krxio import (
     krx_extend_session,
     _save_session_to_file,
 )
+from pykrx.website.krx import krxio
 
 
 class KrxLoginTest(unittest.TestCase):
@@ -192,6 +194,144 @@ class KrxLoginTest(unittest.TestCase):
         self.assertIs(call_args[0][0], session)
         self.assertEqual(call_args[1]["mbr_no"], "12345")
 
+        mock_save.reset_mock()
+        krx_login("id", "pw", session=session, set_global_session=False,
+                  save_session_file=False)
+        mock_save.assert_not_called()
+
+
+class SessionFileStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["KRX_SESSION_DIR"] = self.tmpdir.name
+        krxio._reset_session_file_cache()
+
+    def tearDown(self):
+        os.environ.pop("KRX_SESSION_DIR", None)
+        os.environ.pop("KRX_SESSION_FORMAT", None)
+        krxio._reset_session_file_cache()
+        self.tmpdir.cleanup()
+
+    def _save(self):
+        session = requests.Session()
+        session.cookies.set(name="JSESSIONID", value="abc",
+                            domain="data.krx.co.kr", path="/")
+        _save_session_to_file(session, mbr_no="1", ttl_minutes=1)
+        return os.path.join(self.tmpdir.name, "session.json")
+
+    def test_load_does_not_rewrite_file_and_uses_cache(self):
+        path = self._save()
+        # 다른 프로세스가 저장한 것처럼 in-process 캐시를 비운다
+        krxio._reset_session_file_cache()
+        before = os.stat(path)
+
+        with patch.object(krxio, "_decode_session_data",
+                          wraps=krxio._decode_session_data) as mdecode:
+            first = _load_session_from_file()
+            second = _load_session_from_file()
+
+        after = os.stat(path)
+        self.assertIsNotNone(first)
+        self.assertIs(first, second)
+        self.assertEqual(mdecode.call_count, 1)
+        self.assertEqual(before.st_mtime_ns, after.st_mtime_ns)
+        self.assertEqual(before.st_ino, after.st_ino)
+
+    def test_replaced_file_is_reloaded(self):
+        self._save()
+        first = _load_session_from_file()
+        self._save()
+        krxio._SESSION_FILE_CACHE["session"] = None
+        self.assertIsNot(_load_session_from_file(), first)
+
+    def test_binary_format_round_trip(self):
+        os.environ["KRX_SESSION_FORMAT"] = "binary"
+        path = self._save()
+        krxio._reset_session_file_cache()
+        with open(path, "rb") as f:
+            self.assertNotEqual(f.read(1), b"{")
+        self.assertIsNotNone(_load_session_from_file())
+        self.assertEqual(os.listdir(self.tmpdir.name).count("session.json"), 1)
+
+    def test_pickled_session_file_is_not_loaded(self):
+        import pickle
+
+        path = self._save()
+        with open(path, "wb") as f:
+            f.write(pickle.dumps({"cookies": {}}))
+        krxio._reset_session_file_cache()
+        with patch("pickle.loads") as mloads:
+            self.assertIsNone(_load_session_from_file())
+        mloads.assert_not_called()
+
+
+class SessionRefresherTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["KRX_SESSION_DIR"] = self.tmpdir.name
+        krxio._reset_session_file_cache()
+
+    def tearDown(self):
+        set_http_session(None)
+        os.environ.pop("KRX_SESSION_DIR", None)
+        krxio._reset_session_file_cache()
+        self.tmpdir.cleanup()
+
+    def _session(self):
+        session = requests.Session()
+        _save_session_to_file(session, mbr_no="1", ttl_minutes=10)
+        set_http_session(session)
+        return session
+
+    def test_refresh_schedule_follows_session_file_expiry(self):
+        self._session()
+        refresher = krxio.KrxSessionRefresher(refresh_margin_seconds=60)
+        wait = refresher.seconds_until_refresh()
+        self.assertGreater(wait, 8 * 60)
+        self.assertLessEqual(wait, 9 * 60)
+
+    def test_extend_and_probe_update_expiry(self):
+        session = self._session()
+        refresher = krxio.KrxSessionRefresher(ttl_minutes=30)
+        with patch.object(krxio, "krx_extend_session") as mextend, \
+                patch.object(krxio, "_probe_session", return_value=True), \
+                patch.object(krxio, "krx_login") as mlogin:
+            self.assertTrue(refresher.refresh_now())
+
+        mextend.assert_called_once_with(session=session)
+        self.assertEqual(mlogin.call_count, 0)
+        krxio._reset_session_file_cache()
+        with open(os.path.join(self.tmpdir.name, "session.json")) as f:
+            self.assertEqual(json.load(f)["ttl_minutes"], 30)
+
+    def test_failed_probe_falls_back_to_relogin(self):
+        self._session()
+        refresher = krxio.KrxSessionRefresher()
+        with patch.object(krxio, "krx_extend_session"), \
+                patch.object(krxio, "_probe_session", return_value=False), \
+                patch.object(krxio, "krx_login",
+                             return_value=(MagicMock(), {})) as mlogin:
+            self.assertTrue(refresher.refresh_now())
+
+        self.assertEqual(mlogin.call_count, 1)
+        self.assertEqual(refresher.stats["extend_failures"], 1)
+        self.assertEqual(refresher.stats["relogins"], 1)
+
+    def test_relogin_keeps_explicit_session_object(self):
+        session = requests.Session()
+        session.cookies.set("JSESSIONID", "expired")
+        refresher = krxio.KrxSessionRefresher(session=session)
+        with patch.object(krxio, "krx_extend_session",
+                          side_effect=PykrxRequestError("expired")), \
+                patch.object(krxio, "krx_login",
+                             return_value=(session, {})) as mlogin:
+            self.assertTrue(refresher.refresh_now())
+
+        # 호출한 쪽이 들고 있는 세션 객체에서 다시 로그인한다
+        self.assertIs(mlogin.call_args.kwargs["session"], session)
+        self.assertIs(refresher._current_session(), session)
+        self.assertNotIn("JSESSIONID", session.cookies)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,155 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx.stock import stock_api
+from pykrx.website.comm.negcache import NegativeCache, is_past_date
+
+
+def _ohlcv(value):
+    return DataFrame({"시가": [value], "고가": [value], "저가": [value],
+                      "종가": [value], "거래량": [value]},
+                     index=pd.Index(["005930"], name="티커"))
+
+
+class NegativeCacheTest(unittest.TestCase):
+    def test_lru_eviction_and_copy(self):
+        cache = NegativeCache(maxsize=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        cache.get("a")[0] = 100
+        cache.put("c", [3])
+
+        self.assertEqual(cache.get("a"), [1])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"entries": 2, "hits": 2, "misses": 1})
+
+    def test_is_past_date(self):
+        today = datetime.date.today()
+        self.assertTrue(is_past_date("20240106"))
+        self.assertFalse(is_past_date(today.strftime("%Y%m%d")))
+        self.assertFalse(is_past_date("invalid"))
+
+
+class HolidaySnapshotTest(unittest.TestCase):
+    def setUp(self):
+        stock_api.clear_negative_cache()
+        self.addCleanup(stock_api.clear_negative_cache)
+
+    def _patch_krx(self, fetch, nearest="20240105"):
+        fetch_patch = patch.object(stock_api.krx, "get_market_ohlcv_by_ticker",
+                                   side_effect=fetch)
+        nearest_patch = patch.object(stock_api.krx,
+                                     "get_nearest_business_day_in_a_week",
+                                     return_value=nearest)
+        mfetch = fetch_patch.start()
+        mnearest = nearest_patch.start()
+        self.addCleanup(fetch_patch.stop)
+        self.addCleanup(nearest_patch.stop)
+        return mfetch, mnearest
+
+    def test_holiday_is_resolved_once(self):
+        mfetch, mnearest = self._patch_krx(
+            lambda date, market: _ohlcv(0 if date == "20240106" else 70000))
+
+        for _ in range(3):
+            df = stock_api.get_market_ohlcv_by_ticker("20240106",
+                                                      alternative=True)
+            self.assertEqual(df["종가"].iloc[0], 70000)
+
+        # 휴일 조회와 대체 영업일 조회는 처음 한 번만 한다
+        dates = [c.args[0] for c in mfetch.call_args_list]
+        self.assertEqual(dates, ["20240106", "20240105"])
+        self.assertEqual(mnearest.call_count, 1)
+
+    def test_holiday_without_alternative_costs_no_request(self):
+        mfetch, _ = self._patch_krx(lambda date, market: _ohlcv(0))
+
+        first = stock_api.get_market_ohlcv_by_ticker("20240106")
+        first.loc[:, "종가"] = 1
+        second = stock_api.get_market_ohlcv_by_ticker("20240106")
+
+        self.assertEqual(mfetch.call_count, 1)
+        self.assertEqual(second["종가"].iloc[0], 0)
+
+    def test_business_day_is_not_cached(self):
+        mfetch, _ = self._patch_krx(lambda date, market: _ohlcv(70000))
+
+        stock_api.get_market_ohlcv_by_ticker("20240105", alternative=True)
+        stock_api.get_market_ohlcv_by_ticker("20240105", alternative=True)
+
+        self.assertEqual(mfetch.call_count, 2)
+        self.assertEqual(stock_api.get_negative_cache_stats()["entries"], 0)
+
+    def test_today_is_not_cached(self):
+        today = datetime.date.today().strftime("%Y%m%d")
+        mfetch, _ = self._patch_krx(lambda date, market: _ohlcv(0))
+
+        stock_api.get_market_ohlcv_by_ticker(today)
+        stock_api.get_market_ohlcv_by_ticker(today)
+
+        self.assertEqual(mfetch.call_count, 2)
+
+    def test_empty_portfolio_deposit_file(self):
+        with patch.object(stock_api.krx, "get_index_portfolio_deposit_file",
+                          side_effect=lambda date, ticker:
+                          [] if date == "20240106" else ["005930"]) as mfetch, \
+                patch.object(stock_api.krx, "get_nearest_business_day_in_a_week",
+                             return_value="20240105"):
+            for _ in range(2):
+                pdf = stock_api.get_index_portfolio_deposit_file(
+                    "1028", "20240106", alternative=True)
+                self.assertEqual(pdf, ["005930"])
+
+        dates = [c.args[0] for c in mfetch.call_args_list]
+        self.assertEqual(dates, ["20240106", "20240105"])
+
+    def test_shorting_holiday(self):
+        columns = pd.MultiIndex.from_product([["거래량", "거래대금"],
+                                              ["공매도", "매수", "비중"]])
+        business_day = DataFrame([[1, 10, 0.1, 100, 1000, 0.1]],
+                                 columns=columns,
+                                 index=pd.Index(["005930"], name="티커"))
+        with patch.object(stock_api.krx,
+                          "get_shorting_trading_value_and_volume_by_ticker",
+                          side_effect=lambda date, market, include:
+                          DataFrame() if date == "20240106"
+                          else business_day) as mfetch, \
+                patch.object(stock_api.krx, "get_nearest_business_day_in_a_week",
+                             return_value="20240105") as mnearest:
+            # alternative가 아니면 이전 영업일의 결과를 0으로 채워 반환한다
+            zeros = stock_api.get_shorting_volume_by_ticker("20240106")
+            self.assertEqual(list(zeros.index), ["005930"])
+            self.assertEqual(list(zeros.columns), ["공매도", "매수", "비중"])
+            self.assertTrue((zeros == 0).all(axis=None))
+
+            volume = stock_api.get_shorting_volume_by_ticker(
+                "20240106", alternative=True)
+            value = stock_api.get_shorting_value_by_ticker(
+                "20240106", alternative=True)
+            zeros = stock_api.get_shorting_value_by_ticker("20240106")
+            self.assertTrue((zeros == 0).all(axis=None))
+
+        self.assertEqual(volume["공매도"].iloc[0], 1)
+        self.assertEqual(value["공매도"].iloc[0], 100)
+        dates = [c.args[0] for c in mfetch.call_args_list]
+        self.assertEqual(dates, ["20240106", "20240105"])
+        self.assertEqual(mnearest.call_count, 1)
+
+    def test_empty_result_on_business_day_is_not_cached(self):
+        # 영업일의 빈 결과(오류를 삼킨 결과 등)는 기억하지 않는다
+        with patch.object(stock_api.krx, "get_index_portfolio_deposit_file",
+                          return_value=[]) as mfetch, \
+                patch.object(stock_api.krx, "get_nearest_business_day_in_a_week",
+                             return_value="20240105"):
+            stock_api.get_index_portfolio_deposit_file("1028", "20240105")
+            stock_api.get_index_portfolio_deposit_file("1028", "20240105")
+
+        self.assertEqual(mfetch.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from pykrx.website.comm import Checkpoint
+from pykrx.website.krx.bond import panel as bond_panel
+from pykrx.website.krx.etx.panel import (
+    PortfolioDepositFileHistory, diff_portfolio
+)
+from pykrx.website.krx.market import panel
+
+
+def _balance(tickers, qty):
+    df = pd.DataFrame({
+        "공매도잔고": qty,
+        "상장주식수": [100] * len(tickers),
+        "공매도금액": qty,
+        "시가총액": [1e6] * len(tickers),
+        "비중": [0.1] * len(tickers),
+    }, index=pd.Index(tickers, name="티커"))
+    return df
+
+
+class ShortingBalancePanelTest(unittest.TestCase):
+    def test_build_panel_aligns_dates_and_tickers(self):
+        frames = {
+            "20210126": _balance(["000020", "000040"], [3, 4]),
+            "20210125": _balance(["000020"], [1]),
+        }
+        out = panel.build_panel(frames, {"공매도잔고": np.float64})
+        df = out["공매도잔고"]
+        self.assertEqual(df.columns.tolist(), ["000020", "000040"])
+        self.assertEqual(df.index[0], pd.Timestamp("2021-01-25"))
+        self.assertEqual(df.iloc[1].tolist(), [3.0, 4.0])
+        self.assertTrue(np.isnan(df.iloc[0, 1]))
+
+    def test_resume_skips_checkpointed_dates(self):
+        days = ["20210125", "20210126"]
+        snapshot = _balance(["000020"], [1])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(panel, "get_trading_days", return_value=days), \
+                 patch.object(panel, "_fetch_shorting_snapshot",
+                              return_value=snapshot) as mfetch:
+                panel.get_shorting_balance_panel(
+                    "20210125", "20210126", cache_dir=tmpdir)
+                self.assertEqual(mfetch.call_count, 2)
+
+                out = panel.get_shorting_balance_panel(
+                    "20210125", "20210126", cache_dir=tmpdir)
+                self.assertEqual(mfetch.call_count, 2)
+                self.assertEqual(out["공매도잔고"].shape, (2, 1))
+
+    def test_checkpoint_round_trip_without_pickle(self):
+        df = _balance(["000020", "000040"], [1, 2])
+        df["비중"] = np.array([0.5, 0.25], dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checkpoint = Checkpoint(tmpdir)
+            checkpoint.save("shorting_KOSPI_20210125", df)
+            path = os.path.join(tmpdir, "shorting_KOSPI_20210125.arrow")
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(6), b"ARROW1")
+            pd.testing.assert_frame_equal(
+                checkpoint.load("shorting_KOSPI_20210125"), df)
+
+
+def _pdf(rows):
+    df = pd.DataFrame(rows, columns=["티커", "계약수", "금액", "비중"])
+    df = df.set_index("티커")
+    return df.astype({"계약수": np.float64, "금액": np.int64,
+                      "비중": np.float32})
+
+
+class EtfPortfolioDepositFileHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.days = {
+            "20210104": _pdf([["005930", 10, 1000, 50.0],
+                              ["000660", 5, 500, 25.0],
+                              ["051910", 1, 500, 25.0]]),
+            "20210105": _pdf([["005930", 11, 1100, 55.0],
+                              ["000660", 5, 500, 25.0],
+                              ["051910", 1, 400, 20.0]]),
+            "20210106": _pdf([["005930", 11, 1100, 55.0],
+                              ["051910", 1, 400, 20.0],
+                              ["035420", 2, 500, 25.0]]),
+            "20210107": _pdf([["005930", 12, 1200, 60.0],
+                              ["035420", 2, 800, 40.0]]),
+        }
+        self.history = PortfolioDepositFileHistory("152100",
+                                                   keyframe_interval=3)
+        for date, df in self.days.items():
+            self.history.append(date, df)
+
+    def test_only_deltas_are_stored_between_keyframes(self):
+        self.assertEqual(list(self.history.keyframes),
+                         ["20210104", "20210107"])
+        delta = self.history.changes("20210106")
+        self.assertEqual(delta["변경"].to_dict(),
+                         {"000660": "삭제", "035420": "추가"})
+
+    def test_reconstruct_every_day(self):
+        for date, expected in self.days.items():
+            df = self.history.get(date)
+            pd.testing.assert_frame_equal(df.sort_index(),
+                                          expected.sort_index())
+
+    def test_holiday_returns_previous_business_day(self):
+        pd.testing.assert_frame_equal(
+            self.history.get("20210109").sort_index(),
+            self.days["20210107"].sort_index())
+        self.assertTrue(self.history.get("20210101").empty)
+
+    def test_nan_values_are_not_changes(self):
+        prev = _pdf([["005930", np.nan, 1000, 50.0],
+                     ["000660", 5, 500, 25.0]])
+        curr = _pdf([["005930", np.nan, 1000, 50.0],
+                     ["000660", np.nan, 500, 25.0]])
+        delta = diff_portfolio(prev, curr)
+        self.assertEqual(delta["변경"].to_dict(), {"000660": "변경"})
+
+    def test_removed_ticker_is_added_again(self):
+        history = PortfolioDepositFileHistory("152100", keyframe_interval=10)
+        days = [self.days["20210104"],
+                self.days["20210104"].drop(index="000660"),
+                self.days["20210104"]]
+        for date, df in zip(["20210104", "20210105", "20210106"], days):
+            history.append(date, df)
+        pd.testing.assert_frame_equal(history.get("20210106").sort_index(),
+                                      days[2].sort_index())
+
+
+    def test_save_and_load_as_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "152100.json")
+            self.history.save(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["ticker"], "152100")
+            loaded = PortfolioDepositFileHistory.load(path)
+
+        self.assertEqual(loaded.dates, self.history.dates)
+        pd.testing.assert_frame_equal(loaded.changes("20210106"),
+                                      self.history.changes("20210106"))
+        for date, expected in self.days.items():
+            pd.testing.assert_frame_equal(loaded.get(date).sort_index(),
+                                          expected.sort_index())
+
+        # 읽어 온 이력에 이어서 추가할 수 있다
+        nxt = _pdf([["005930", 12, 1200, 60.0]])
+        loaded.append("20210108", nxt)
+        self.assertEqual(loaded.changes("20210108")["변경"].to_dict(),
+                         {"035420": "삭제"})
+
+
+class IndexConstituentHistoryTest(unittest.TestCase):
+    def test_bisection_finds_change_date_with_few_requests(self):
+        days = [f"202101{d:02}" for d in range(4, 30)]
+
+        def _pdf(date, ticker):
+            return ["A", "B"] if date < "20210115" else ["A", "C"]
+
+        with patch.object(panel, "get_trading_days", return_value=days), \
+             patch.object(panel, "get_index_portfolio_deposit_file",
+                          side_effect=_pdf) as mfetch:
+            h = panel.get_index_constituent_history(
+                "20210104", "20210129", "1028", step=10)
+
+        self.assertLess(mfetch.call_count, len(days))
+        self.assertEqual(h.get("20210114"), ["A", "B"])
+        self.assertEqual(h.get("20210115"), ["A", "C"])
+        self.assertEqual(h.get("20210131"), [])
+        changes = h.changes()
+        self.assertEqual(changes.loc["2021-01-15", "티커"].tolist(),
+                         ["C", "B"])
+
+    def test_empty_snapshot_is_not_a_boundary(self):
+        days = [f"202101{d:02}" for d in range(4, 30)]
+        # 조회에 실패한 일자는 빈 리스트가 반환된다
+        failed = {"20210114", "20210124"}
+
+        def _pdf(date, ticker):
+            if date in failed:
+                return []
+            return ["A", "B"] if date < "20210115" else ["A", "C"]
+
+        with patch.object(panel, "get_trading_days", return_value=days), \
+             patch.object(panel, "get_index_portfolio_deposit_file",
+                          side_effect=_pdf):
+            h = panel.get_index_constituent_history(
+                "20210104", "20210129", "1028", step=10)
+
+        changes = h.changes()
+        self.assertEqual(changes.index.unique().tolist(),
+                         [pd.Timestamp("2021-01-15")])
+        self.assertEqual(h.get("20210113"), ["A", "B"])
+        self.assertEqual(h.get("2021-01-15"), ["A", "C"])
+        self.assertEqual(h.get(datetime.datetime(2021, 1, 29)), ["A", "C"])
+
+
+class TreasuryYieldCurveTest(unittest.TestCase):
+    def test_curve_is_cached_by_tenor(self):
+        index = pd.to_datetime(["2022-01-04", "2022-01-05"])
+        df = pd.DataFrame({"수익률": [1.5, 1.6], "대비": [0.0, 0.1]},
+                          index=index)
+        bond_panel._YIELDS_CACHE.clear()
+        with patch.object(bond_panel, "get_otc_treasury_yields_by_date",
+                          return_value=df) as mfetch:
+            curve = bond_panel.get_otc_treasury_yield_curve(
+                "20220104", "20220105")
+            bond_panel.get_otc_treasury_yield_curve("20220104", "20220105")
+
+        self.assertEqual(mfetch.call_count, len(bond_panel.TREASURY_TENORS))
+        self.assertEqual(curve.shape, (2, 7))
+        self.assertEqual(curve.columns.tolist()[:3], [1.0, 2.0, 3.0])
+        self.assertEqual(curve.dtypes.unique().tolist(), [np.float64])
+
+    def test_curve_is_rounded_and_today_is_not_cached(self):
+        today = datetime.date.today()
+        index = pd.to_datetime([today])
+        df = pd.DataFrame({"수익률": np.array([1.717], dtype=np.float32),
+                           "대비": np.array([0.007], dtype=np.float32)},
+                          index=index)
+        bond_panel._YIELDS_CACHE.clear()
+        with patch.object(bond_panel, "get_otc_treasury_yields_by_date",
+                          return_value=df) as mfetch:
+            fromdate = today.strftime("%Y%m%d")
+            curve = bond_panel.get_otc_treasury_yield_curve(fromdate, fromdate)
+            bond_panel.get_otc_treasury_yield_curve(fromdate, fromdate)
+
+        self.assertEqual(mfetch.call_count,
+                         2 * len(bond_panel.TREASURY_TENORS))
+        self.assertEqual(curve.iloc[0, 0], 1.717)
+
+    def test_public_api_accepts_datetime(self):
+        from pykrx import bond
+        with patch.object(bond.bond.krx.bond, "get_otc_treasury_yield_curve",
+                          return_value=pd.DataFrame()) as mcurve:
+            bond.get_otc_treasury_yield_curve(
+                datetime.datetime(2022, 1, 4), "2022-01-06")
+        self.assertEqual(mcurve.call_args.args, ("20220104", "20220106"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,342 @@
+import datetime
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.comm.webio import use_http_session
+from pykrx.website.krx import cache as cache_mod
+from pykrx.website.krx import krxio
+from pykrx.website.krx.cache import KrxResponseCache, set_response_cache
+from pykrx.website.krx.krxio import KrxWebIo
+
+URL = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+
+
+class _DummyIo(KrxWebIo):
+    @property
+    def bld(self):
+        return "dbms/MDC/STAT/standard/MDCSTAT01501"
+
+
+def _response(rows):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.text = ""
+    resp.json.return_value = {"OutBlock_1": rows, "output": rows}
+    return resp
+
+
+def _write_entries(path, worker, count):
+    cache = KrxResponseCache(path)
+    for i in range(count):
+        cache.put(URL, {"bld": "b", "trdDd": "20220902", "n": f"{worker}-{i}"},
+                  {"output": [{"ISU_SRT_CD": "005930", "n": i}]})
+
+
+class KrxResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+
+    def test_past_response_roundtrip(self):
+        cache = KrxResponseCache(self.path)
+        params = {"bld": "b", "trdDd": "20220902", "mktId": "STK"}
+        data = {"output": [{"ISU_ABBRV": "삼성전자", "TDD_CLSPRC": "57,000"}]}
+
+        self.assertIsNone(cache.get(URL, params))
+        self.assertTrue(cache.put(URL, params, data))
+        self.assertEqual(cache.get(URL, dict(reversed(params.items()))), data)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stores"]),
+                         (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+        row = cache._connect().execute(
+            "SELECT bld, fromdate, todate, expires FROM responses").fetchone()
+        self.assertEqual(row, ("b", "20220902", "20220902", None))
+
+    def test_today_is_stored_only_with_ttl(self):
+        today = datetime.date.today().strftime("%Y%m%d")
+        params = {"bld": "b", "trdDd": today}
+
+        cache = KrxResponseCache(self.path)
+        self.assertFalse(cache.put(URL, params, {"output": []}))
+        self.assertFalse(cache.put(URL, {"bld": "b"}, {"output": []}))
+
+        cache = KrxResponseCache(self.path, volatile_ttl=0.05)
+        self.assertTrue(cache.put(URL, params, {"output": []}))
+        self.assertEqual(cache.get(URL, params), {"output": []})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(URL, params))
+
+    def test_empty_and_recent_responses_expire(self):
+        cache = KrxResponseCache(self.path, recent_ttl=0.05)
+        recent = (datetime.date.today() -
+                  datetime.timedelta(days=2)).strftime("%Y%m%d")
+        rows = {"output": [{"ISU_SRT_CD": "005930"}]}
+        shorting = "dbms/MDC/STAT/srt/MDCSTAT30501"
+        # 공매도 잔고처럼 늦게 공개되는 데이터는 빈 응답이 올 수 있다
+        self.assertTrue(cache.put(URL, {"bld": "b", "trdDd": "20220902"},
+                                  {"output": []}))
+        self.assertTrue(cache.put(URL, {"bld": shorting, "trdDd": recent},
+                                  rows))
+        # 늦게 공개되지 않는 데이터는 최근 일자여도 만료 없이 저장한다
+        self.assertTrue(cache.put(URL, {"bld": "b", "trdDd": recent}, rows))
+        expires = cache._connect().execute(
+            "SELECT COUNT(*) FROM responses WHERE expires IS NOT NULL").fetchone()
+        self.assertEqual(expires[0], 2)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(URL, {"bld": "b", "trdDd": "20220902"}))
+        self.assertIsNone(cache.get(URL, {"bld": shorting, "trdDd": recent}))
+        self.assertEqual(cache.get(URL, {"bld": "b", "trdDd": recent}), rows)
+
+        cache = KrxResponseCache(self.path, recent_ttl=0)
+        self.assertFalse(cache.put(URL, {"bld": "b", "trdDd": "20220902"},
+                                   {"output": []}))
+
+    def test_ticker_column(self):
+        cache = KrxResponseCache(self.path)
+        cache.put(URL, {"bld": "b", "strtDd": "20200101", "endDd": "20201231",
+                        "indIdx": "1", "indIdx2": "001"}, {"output": []})
+        cache.put(URL, {"bld": "b", "strtDd": "20200101", "endDd": "20201231",
+                        "isuCd": "KR7005930003"}, {"output": []})
+        rows = cache._connect().execute(
+            "SELECT ticker FROM responses ORDER BY ticker").fetchall()
+        self.assertEqual(rows, [("1001",), ("KR7005930003",)])
+
+    def test_concurrent_processes(self):
+        ctx = multiprocessing.get_context("fork")
+        KrxResponseCache(self.path)
+        procs = [ctx.Process(target=_write_entries, args=(self.path, w, 30))
+                 for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+            self.assertEqual(p.exitcode, 0)
+
+        # 다른 프로세스가 저장한 응답을 바로 읽을 수 있다
+        cache = KrxResponseCache(self.path)
+        count = cache._connect().execute(
+            "SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(count, 120)
+        self.assertEqual(
+            cache.get(URL, {"bld": "b", "trdDd": "20220902", "n": "3-29"}),
+            {"output": [{"ISU_SRT_CD": "005930", "n": 29}]})
+
+
+def _snapshot(date, n=40):
+    return {"OutBlock_1": [
+        {"ISU_SRT_CD": f"{i:06d}", "ISU_ABBRV": f"종목{i}", "MKT_NM": "KOSPI",
+         "TDD_CLSPRC": f"{(i * 37 + int(date)) % 90000:,}", "FLUC_RT": "0.00"}
+        for i in range(n)]}
+
+
+class ContentAddressedStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+
+    def test_identical_payloads_are_stored_once(self):
+        cache = KrxResponseCache(self.path)
+        data = _snapshot("20220902")
+        # 휴일에는 이전 영업일과 같은 응답이 반환된다
+        for date in ("20220902", "20220903", "20220904"):
+            cache.put(URL, {"bld": "b", "trdDd": date}, data)
+
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["blobs"]), (3, 1))
+        self.assertEqual(cache.get(URL, {"bld": "b", "trdDd": "20220904"}), data)
+        self.assertGreater(stats["compression_ratio"], 1)
+
+    def _fill(self, cache, bld="b", count=6):
+        for day in range(1, count + 1):
+            date = f"202209{day:02d}"
+            cache.put(URL, {"bld": bld, "trdDd": date}, _snapshot(date))
+
+    def test_zlib_dictionary_per_bld(self):
+        cache = KrxResponseCache(self.path, codec="zlib", dictionary_samples=4)
+        self._fill(cache)
+        self._fill(cache, bld="other", count=2)
+
+        rows = cache._connect().execute(
+            "SELECT bld, codec FROM dictionaries").fetchall()
+        self.assertEqual(rows, [("b", "zlib")])
+        with_dict = cache._connect().execute(
+            "SELECT COUNT(*) FROM blobs WHERE dict_id IS NOT NULL").fetchone()
+        self.assertEqual(with_dict[0], 2)
+
+        # 다른 인스턴스(프로세스)에서도 사전으로 압축한 응답을 읽는다
+        other = KrxResponseCache(self.path, codec="zlib")
+        self.assertEqual(other.get(URL, {"bld": "b", "trdDd": "20220906"}),
+                         _snapshot("20220906"))
+
+    @unittest.skipIf(cache_mod.zstandard is None, "zstandard is not installed")
+    def test_zstd_roundtrip(self):
+        cache = KrxResponseCache(self.path, codec="zstd", dictionary_samples=4)
+        self._fill(cache, count=8)
+        for day in range(1, 9):
+            date = f"202209{day:02d}"
+            self.assertEqual(cache.get(URL, {"bld": "b", "trdDd": date}),
+                             _snapshot(date))
+        self.assertEqual(cache.stats()["codec"], "zstd")
+
+    def test_migrate_inline_payloads(self):
+        import json
+        import sqlite3
+        import zlib
+
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE responses (key TEXT PRIMARY KEY, bld TEXT NOT NULL, "
+            "params TEXT NOT NULL, fromdate TEXT, todate TEXT, ticker TEXT, "
+            "payload BLOB NOT NULL, created REAL NOT NULL, expires REAL)")
+        params = {"bld": "b", "trdDd": "20220902"}
+        conn.execute(
+            "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (KrxResponseCache.make_key(URL, params), "b", json.dumps(params),
+             "20220902", "20220902", None,
+             zlib.compress(json.dumps({"output": [1]}).encode()), 0.0, None))
+        conn.commit()
+        conn.close()
+
+        cache = KrxResponseCache(self.path)
+        self.assertEqual(cache.get(URL, params), {"output": [1]})
+        self.assertEqual(cache.stats()["blobs"], 1)
+
+    def test_prune_unreferenced_blobs(self):
+        cache = KrxResponseCache(self.path)
+        cache.put(URL, {"bld": "b", "trdDd": "20220902"}, {"output": [1]})
+        cache._connect().execute("DELETE FROM responses")
+        self.assertEqual(cache.prune(), 1)
+        self.assertEqual(cache.stats()["blobs"], 0)
+
+
+class CacheAdminTest(unittest.TestCase):
+    BLD = "dbms/MDC/STAT/standard/MDCSTAT01501"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+        self.cache = KrxResponseCache(self.path)
+        for date in ("20240103", "20240104", "20240105"):
+            self.cache.put(URL, {"bld": self.BLD, "trdDd": date, "mktId": "STK"},
+                           _snapshot(date))
+        self.cache.put(URL, {"bld": "dbms/MDC/STAT/standard/MDCSTAT01701",
+                             "strtDd": "20230101", "endDd": "20231231",
+                             "isuCd": "KR7005930003"}, {"output": [1]})
+        self.cache.put(URL, {"bld": "dbms/MDC/STAT/standard/MDCSTAT01701",
+                             "strtDd": "20230101", "endDd": "20231231",
+                             "isuCd": "KR7100593003"}, {"output": [2]})
+
+    def test_list_entries(self):
+        df = self.cache.list_entries()
+        self.assertEqual(len(df), 5)
+        self.assertGreater(df["raw_size"].min(), 0)
+
+        df = self.cache.list_entries("MDCSTAT01501", fromdate="20240104")
+        self.assertEqual(sorted(df["todate"]), ["20240104", "20240105"])
+        # 단축 코드는 ISIN의 일부가 아니라 종목 코드와 정확히 비교한다
+        df = self.cache.list_entries(ticker="005930")
+        self.assertEqual(list(df["ticker"]), ["KR7005930003"])
+        df = self.cache.list_entries(ticker="KR7100593003")
+        self.assertEqual(list(df["ticker"]), ["KR7100593003"])
+        df = self.cache.list_entries(params={"mktId": "STK"}, limit=2)
+        self.assertEqual(len(df), 2)
+
+    def test_invalidate(self):
+        with self.assertRaises(ValueError):
+            self.cache.invalidate()
+
+        # 클래스 이름으로 지정한 dataset의 하루치 응답만 지운다
+        removed = self.cache.invalidate("전종목시세", fromdate="20240105",
+                                        todate="20240105")
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.cache.get(
+            URL, {"bld": self.BLD, "trdDd": "20240105", "mktId": "STK"}))
+        self.assertEqual(self.cache.invalidate(ticker="005930"), 1)
+        self.assertEqual(self.cache.stats()["entries"], 3)
+        self.assertEqual(self.cache.stats()["blobs"], 3)
+
+        self.assertEqual(self.cache.invalidate(stored_before="2000-01-01"), 0)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_endpoint_stats_across_instances(self):
+        params = {"bld": self.BLD, "trdDd": "20240105", "mktId": "STK"}
+        self.cache.get(URL, params)
+        other = KrxResponseCache(self.path)
+        other.get(URL, params)
+        other.get(URL, {"bld": self.BLD, "trdDd": "20240108", "mktId": "STK"})
+        other.flush_stats()
+
+        df = self.cache.endpoint_stats()
+        row = df.loc[self.BLD]
+        self.assertEqual((row["hits"], row["misses"], row["stores"]), (2, 1, 3))
+        self.assertAlmostEqual(row["hit_ratio"], 2 / 3)
+        self.assertEqual(row["entries"], 3)
+        self.assertGreater(row["hit_bytes"], row["stored_bytes"] / 3)
+
+    def test_cli(self):
+        from pykrx import __main__ as cli
+
+        with patch("builtins.print") as mprint:
+            self.assertEqual(cli.main(["cache", "list", "--cache", self.path,
+                                       "--dataset", "MDCSTAT01501"]), 0)
+            self.assertEqual(cli.main(["cache", "invalidate", "--cache",
+                                       self.path, "--param", "mktId=STK",
+                                       "--to", "20240103"]), 0)
+            self.assertEqual(cli.main(["cache", "stats", "--cache",
+                                       self.path]), 0)
+        self.assertEqual(mprint.call_args_list[1].args, ("1 entries removed",))
+        self.assertEqual(self.cache.stats()["entries"], 4)
+
+
+class KrxWebIoCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = KrxResponseCache(
+            os.path.join(self.tmp.name, "responses.sqlite"))
+        set_response_cache(self.cache)
+        self.addCleanup(set_response_cache, None)
+
+    def test_read_through(self):
+        rows = [{"ISU_SRT_CD": "005930"}]
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      return_value=_response(rows)) as mread:
+            first = _DummyIo().read(trdDd="20220902", mktId="STK")
+            second = _DummyIo().read(trdDd="20220902", mktId="STK")
+
+        self.assertEqual(mread.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_cached_windows_do_not_sleep(self):
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      side_effect=lambda *a, **k: _response([])) as mread, \
+                patch.object(krxio.time, "sleep") as msleep:
+            _DummyIo().read(strtDd="20180101", endDd="20221231", isuCd="X")
+            self.assertEqual((mread.call_count, msleep.call_count), (3, 2))
+            _DummyIo().read(strtDd="20180101", endDd="20221231", isuCd="X")
+            self.assertEqual((mread.call_count, msleep.call_count), (3, 2))
+
+    def test_environment_variable(self):
+        path = os.path.join(self.tmp.name, "env.sqlite")
+        with patch.object(cache_mod, "_CACHE", None), \
+                patch.object(cache_mod, "_CACHE_FROM_ENV", True), \
+                patch.dict(os.environ, {"PYKRX_RESPONSE_CACHE": path}):
+            cache = cache_mod.get_response_cache()
+            self.assertEqual(str(cache.path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.util import PykrxRequestError
+from pykrx.website.krx.broker import KrxBrokerSession, KrxSessionBroker
+
+
+def _response(text, status_code=200):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = {"Content-Type": "application/json"}
+    resp.text = text
+    return resp
+
+
+@unittest.skipUnless(hasattr(__import__("socket"), "AF_UNIX"), "Unix only")
+class SessionBrokerTest(unittest.TestCase):
+    URL = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sock = os.path.join(self.tmpdir.name, "broker.sock")
+        self.session = MagicMock()
+        self.broker = KrxSessionBroker(self.sock, session=self.session,
+                                       keepalive_seconds=3600).start()
+        self.client = KrxBrokerSession(self.sock, timeout=5)
+
+    def tearDown(self):
+        self.broker.stop()
+        self.tmpdir.cleanup()
+
+    def test_request_is_proxied(self):
+        self.session.post.return_value = _response('{"output": []}')
+
+        resp = self.client.post(self.URL, headers={"X": "1"},
+                                data={"bld": "dummy"})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"output": []})
+        self.assertEqual(resp.headers["content-type"], "application/json")
+        _, kwargs = self.session.post.call_args
+        self.assertEqual(kwargs["data"], {"bld": "dummy"})
+
+    def test_logout_triggers_single_relogin(self):
+        self.session.post.return_value = _response("LOGOUT")
+        new_session = MagicMock()
+        new_session.post.return_value = _response('{"output": []}')
+
+        with patch("pykrx.website.krx.broker.krx_login",
+                   return_value=(new_session, {})) as mlogin:
+            resp = self.client.post(self.URL, data={})
+            # 이미 세대가 바뀐 뒤의 (오래된) 재로그인 요청은 무시된다.
+            self.client.generation = 0
+            self.assertEqual(self.client.relogin()["generation"], 1)
+
+        self.assertEqual(resp.json(), {"output": []})
+        self.assertEqual(mlogin.call_count, 1)
+        self.assertFalse(mlogin.call_args.kwargs["save_session_file"])
+        self.assertEqual(self.client.status()["logins"], 1)
+
+    def test_disallowed_url(self):
+        with self.assertRaises(PykrxRequestError):
+            self.client.get("https://example.com/")
+        self.session.get.assert_not_called()
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_burst(self):
+        limiter = RateLimiter(1, burst=2)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        self.assertFalse(limiter.acquire(timeout=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.comm import webio
+from pykrx.website.krx.krxio import KrxWebIo, enable_auto_login
+from pykrx.website.krx.pool import KrxSessionPool
+
+
+def _response(text):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.text = text
+    resp.json.side_effect = ValueError
+    return resp
+
+
+class _DummyIo(KrxWebIo):
+    @property
+    def bld(self):
+        return "dummy"
+
+    def fetch(self, **params):
+        return self.read(**params)
+
+
+class SessionPoolTest(unittest.TestCase):
+    URL = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+
+    def setUp(self):
+        self.sessions = {}
+
+        def fake_login(mbr_id, password, **kwargs):
+            session = MagicMock()
+            session.post.return_value = _response('{"output": []}')
+            self.sessions.setdefault(mbr_id, []).append(session)
+            return session, {"MBR_NO": mbr_id}
+
+        patcher = patch("pykrx.website.krx.pool.krx_login",
+                        side_effect=fake_login)
+        self.mlogin = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_robin(self):
+        pool = KrxSessionPool([("a", "x"), ("b", "y")])
+        for _ in range(4):
+            pool.post(self.URL, data={})
+
+        self.assertEqual(self.mlogin.call_count, 2)
+        self.assertEqual(self.sessions["a"][0].post.call_count, 2)
+        # 풀 멤버의 세션은 공유 세션 파일에 저장하지 않는다
+        self.assertFalse(self.mlogin.call_args.kwargs["save_session_file"])
+        self.assertEqual(self.sessions["b"][0].post.call_count, 2)
+
+    def test_least_loaded(self):
+        pool = KrxSessionPool([("a", "x"), ("b", "y")],
+                              strategy="least_loaded")
+        pool.members[0].inflight = 3
+        pool.post(self.URL, data={})
+        self.assertNotIn("a", self.sessions)
+        self.assertEqual(pool.status()[1]["requests"], 1)
+
+    def test_logout_relogins_only_that_member(self):
+        pool = KrxSessionPool([("a", "x"), ("b", "y")])
+        pool.post(self.URL, data={})
+        pool.post(self.URL, data={})
+        self.sessions["a"][0].post.return_value = _response("LOGOUT")
+
+        resp = pool.post(self.URL, data={})
+
+        self.assertEqual(resp.text, '{"output": []}')
+        self.assertEqual(len(self.sessions["a"]), 2)
+        self.assertEqual(len(self.sessions["b"]), 1)
+
+    def test_unhealthy_member_is_skipped(self):
+        pool = KrxSessionPool([("a", "x"), ("b", "y")], max_failures=1,
+                              cooldown_seconds=60)
+        pool.post(self.URL, data={})
+        self.sessions["a"][0].post.side_effect = ConnectionError
+        pool.post(self.URL, data={})
+        with self.assertRaises(ConnectionError):
+            pool.post(self.URL, data={})
+
+        for _ in range(3):
+            pool.post(self.URL, data={})
+        self.assertFalse(pool.status()[0]["healthy"])
+        self.assertEqual(self.sessions["b"][0].post.call_count, 4)
+
+    def test_relogin_without_bound_member_does_nothing(self):
+        pool = KrxSessionPool([("a", "x"), ("b", "y")])
+        pool.relogin()
+        self.assertEqual(self.mlogin.call_count, 0)
+
+    def test_relogin_after_logout_does_not_login_twice(self):
+        pool = KrxSessionPool([("a", "x")])
+        pool.post(self.URL, data={})
+        self.sessions["a"][0].post.return_value = _response("LOGOUT")
+        # 재로그인한 세션도 LOGOUT을 반환한다.
+        self.mlogin.side_effect = lambda *a, **k: (self.sessions["a"][0], {})
+
+        webio.set_http_session(pool)
+        try:
+            with self.assertRaises(Exception):
+                _DummyIo().read()
+        finally:
+            webio.set_http_session(None)
+
+        # 첫 로그인 + 요청마다 LOGOUT에 대한 재로그인 한 번씩 (요청 두 번)
+        # KrxWebIo의 relogin()은 이미 교체된 세션을 다시 로그인하지 않는다
+        self.assertEqual(self.mlogin.call_count, 3)
+
+    def test_throttled_responses_count_as_failures(self):
+        pool = KrxSessionPool([("a", "x")], max_failures=2)
+        pool.post(self.URL, data={})
+        for code in (429, 403):
+            resp = _response("")
+            resp.status_code = code
+            self.sessions["a"][0].post.return_value = resp
+            pool.post(self.URL, data={})
+
+        status = pool.status()[0]
+        self.assertEqual(status["failures"], 2)
+        self.assertFalse(status["healthy"])
+
+    def test_logout_does_not_drop_pool(self):
+        pool = KrxSessionPool([("a", "x")])
+        pool.post(self.URL, data={})
+        self.sessions["a"][0].post.return_value = _response("LOGOUT")
+        # 재로그인한 세션도 LOGOUT을 반환한다.
+        self.mlogin.side_effect = lambda *a, **k: (self.sessions["a"][0], {})
+
+        webio.set_http_session(pool)
+        try:
+            enable_auto_login(False)
+            with self.assertRaises(Exception):
+                _DummyIo().read()
+            self.assertIs(webio.get_http_session(), pool)
+        finally:
+            enable_auto_login(True)
+            webio.set_http_session(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
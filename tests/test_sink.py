@@ -0,0 +1,164 @@
+import importlib.util
+import os
+import tempfile
+import types
+import unittest
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from pykrx import sink
+from pykrx.sink import CsvSink, export, open_sink
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def _chunk(start, periods=3):
+    index = pd.date_range(start, periods=periods, name="날짜")
+    return DataFrame({"종가": np.arange(periods, dtype=np.int32) + 100,
+                      "등락률": np.zeros(periods, dtype=np.float32)},
+                     index=index)
+
+
+class SinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_csv_sink_appends_chunks_with_single_header(self):
+        path = self.path("out.csv")
+        with CsvSink(path) as s:
+            s.write(_chunk("2020-01-01"))
+            s.write(DataFrame())
+            s.write(_chunk("2020-01-04"))
+
+        self.assertEqual((s.chunks, s.rows), (2, 6))
+        df = pd.read_csv(path, encoding="utf-8-sig")
+        self.assertEqual(list(df.columns), ["날짜", "종가", "등락률"])
+        self.assertEqual(len(df), 6)
+
+    def test_chunk_is_cast_to_first_schema(self):
+        path = self.path("out.csv")
+        second = _chunk("2020-01-04")[["등락률", "종가"]].astype("int64")
+        with CsvSink(path) as s:
+            s.write(_chunk("2020-01-01"))
+            conformed = s._conform(second)
+        self.assertEqual(list(conformed.columns), ["날짜", "종가", "등락률"])
+        self.assertEqual(conformed["등락률"].dtype, np.float32)
+
+    def test_schema_mismatch_raises(self):
+        with CsvSink(self.path("out.csv")) as s:
+            s.write(_chunk("2020-01-01"))
+            with self.assertRaises(ValueError):
+                s.write(_chunk("2020-01-04").rename(columns={"종가": "시가"}))
+
+    def test_format_is_inferred_from_extension(self):
+        with self.assertRaises(ValueError):
+            open_sink(self.path("out.txt"))
+        with open_sink(self.path("out.csv")) as s:
+            self.assertIsInstance(s, CsvSink)
+
+    def test_export_call_specs_with_key_column(self):
+        module = types.SimpleNamespace(
+            __name__="dummy",
+            get_ohlcv=lambda date: _chunk(date, periods=2),
+            iter_ohlcv=lambda date: (_chunk(date, 1) for _ in range(3)),
+        )
+        path = self.path("out.csv")
+        info = export([("get_ohlcv", "2020-01-01"),
+                       ("iter_ohlcv", "2020-02-01")],
+                      path, key_column="조회일", module=module)
+
+        self.assertEqual(info, {"path": path, "format": "csv",
+                                "chunks": 4, "rows": 5})
+        df = pd.read_csv(path, encoding="utf-8-sig")
+        self.assertEqual(df["조회일"].tolist(),
+                         ["2020-01-01"] * 2 + ["2020-02-01"] * 3)
+
+    def test_endpoint_schema(self):
+        # 조회 일자마다 dtype이 달라도 endpoint의 schema로 기록한다
+        first = DataFrame({"종가": [100], "시가총액": [1000], "거래량": [1],
+                           "거래대금": [100], "상장주식수": [10]},
+                          index=pd.Index(["005930"], name="티커"))
+        second = first.astype("float64")[["시가총액", "종가", "거래량",
+                                          "거래대금", "상장주식수"]]
+        module = types.SimpleNamespace(
+            __name__="dummy",
+            get_market_cap_by_ticker=lambda date: {
+                "20220902": second, "20220905": first}[date],
+        )
+        path = self.path("out.csv")
+        export([("get_market_cap_by_ticker", "20220902"),
+                ("get_market_cap_by_ticker", "20220905")],
+               path, key_column="날짜", module=module)
+
+        df = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+        self.assertEqual(list(df.columns),
+                         list(sink.SCHEMAS["get_market_cap_by_ticker"]) + ["날짜"])
+        self.assertEqual(df["종가"].tolist(), ["100", "100"])
+
+    def test_unknown_endpoint_schema(self):
+        with self.assertRaises(ValueError):
+            open_sink(self.path("out.csv"), schema="get_unknown")
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        with self.assertRaises(ImportError):
+            open_sink(self.path("out.parquet"))
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet_writes_row_group_per_chunk(self):
+        import pyarrow.parquet as pq
+
+        path = self.path("out.parquet")
+        export(iter([_chunk("2020-01-01"), _chunk("2020-01-04")]), path)
+        meta = pq.ParquetFile(path).metadata
+        self.assertEqual(meta.num_row_groups, 2)
+        self.assertEqual(meta.num_rows, 6)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_arrow_ipc_file(self):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        for name in ("out.arrow", "out.feather"):
+            path = self.path(name)
+            info = export(iter([_chunk("2020-01-01"), _chunk("2020-01-04")]),
+                          path)
+            self.assertEqual(info["format"], "arrow")
+            with pa.ipc.open_file(path) as reader:
+                self.assertEqual(reader.num_record_batches, 2)
+            self.assertEqual(feather.read_table(path).num_rows, 6)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_arrow_ipc_stream(self):
+        import pyarrow as pa
+
+        path = self.path("out.arrows")
+        info = export(iter([_chunk("2020-01-01"), _chunk("2020-01-04")]), path)
+        self.assertEqual(info["format"], "arrows")
+        with pa.ipc.open_stream(path) as reader:
+            table = reader.read_all()
+        self.assertEqual(table.num_rows, 6)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_arrow_endpoint_schema(self):
+        import pyarrow as pa
+
+        schema = sink.SCHEMAS["iter_market_ohlcv_by_date"]
+        chunk = DataFrame({c: [1] for c in list(schema)[1:]},
+                          index=pd.DatetimeIndex(["2020-01-02"], name="날짜"))
+        path = self.path("out.arrow")
+        export(iter([chunk]), path, schema="iter_market_ohlcv_by_date")
+        with pa.ipc.open_file(path) as reader:
+            self.assertEqual(reader.schema.names, list(schema))
+            self.assertEqual(reader.schema.field("시가").type, pa.int32())
+            self.assertEqual(reader.schema.field("등락률").type, pa.float32())
+
+
+if __name__ == "__main__":
+    unittest.main()
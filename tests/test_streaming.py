@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx import stock
+from pykrx.website.comm.webio import use_http_session
+from pykrx.website.krx import krxio
+from pykrx.website.krx.krxio import KrxWebIo
+
+
+class _DummyIo(KrxWebIo):
+    @property
+    def bld(self):
+        return "dummy"
+
+
+def _response(rows):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.text = ""
+    resp.json.return_value = {"output": rows}
+    return resp
+
+
+def _ohlcv_row(date):
+    return {
+        "TRD_DD": date, "TDD_OPNPRC": "1,000", "TDD_HGPRC": "1,100",
+        "TDD_LWPRC": "900", "TDD_CLSPRC": "1,050", "ACC_TRDVOL": "10",
+        "ACC_TRDVAL": "10,500", "FLUC_RT": "5.00",
+    }
+
+
+class _WindowRecorder:
+    """요청한 구간을 기록하고 구간 시작일 row 하나를 응답한다."""
+
+    def __init__(self, row=_ohlcv_row):
+        self.windows = []
+        self.row = row
+
+    def __call__(self, *args, **params):
+        self.windows.append((params["strtDd"], params["endDd"]))
+        s = params["strtDd"]
+        return _response([self.row(f"{s[:4]}/{s[4:6]}/{s[6:]}")])
+
+
+class StreamingReadTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(krxio.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_split_period(self):
+        windows = KrxWebIo._split_period(
+            {"strtDd": "20180101", "endDd": "20221231", "isuCd": "X"})
+        self.assertEqual(
+            [(w["strtDd"], w["endDd"]) for w in windows],
+            [("20180101", "20200101"), ("20200102", "20220101"),
+             ("20220102", "20221231")])
+        self.assertTrue(all(w["isuCd"] == "X" for w in windows))
+
+    def test_split_period_without_range(self):
+        self.assertEqual(KrxWebIo._split_period({"mktId": "STK"}),
+                         [{"mktId": "STK"}])
+
+    def test_iter_read_yields_each_window(self):
+        recorder = _WindowRecorder()
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read", side_effect=recorder):
+            it = _DummyIo().iter_read(strtDd="20180101", endDd="20221231")
+            first = next(it)
+            # 다음 구간은 소비할 때 요청한다
+            self.assertEqual(len(recorder.windows), 1)
+            rest = list(it)
+
+        self.assertEqual(len(recorder.windows), 3)
+        self.assertEqual(first["output"][0]["TRD_DD"], "2018/01/01")
+        self.assertEqual(len(rest), 2)
+
+    def test_read_accumulates_windows(self):
+        recorder = _WindowRecorder()
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.comm.webio.Post.read", side_effect=recorder):
+            result = _DummyIo().read(strtDd="20180101", endDd="20221231")
+        self.assertEqual([r["TRD_DD"] for r in result["output"]],
+                         ["2018/01/01", "2020/01/02", "2022/01/02"])
+
+    def test_iter_market_ohlcv_by_date(self):
+        recorder = _WindowRecorder()
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.krx.market.wrap.get_stock_ticker_isin",
+                      return_value="KR7005930003"), \
+                patch("pykrx.website.comm.webio.Post.read", side_effect=recorder):
+            chunks = list(stock.iter_market_ohlcv_by_date(
+                "2018-01-01", "20221231", "005930"))
+
+        self.assertEqual(len(chunks), 3)
+        for df in chunks:
+            self.assertEqual(list(df.columns),
+                             ["시가", "고가", "저가", "종가", "거래량", "거래대금",
+                              "등락률"])
+            self.assertEqual(df["종가"].iloc[0], 1050)
+        self.assertEqual(str(chunks[1].index[0].date()), "2020-01-02")
+
+    def test_empty_window_is_skipped(self):
+        responses = [_response([_ohlcv_row("2018/01/02")]), _response([])]
+        with use_http_session(MagicMock()), \
+                patch("pykrx.website.krx.market.wrap.get_stock_ticker_isin",
+                      return_value="KR7005930003"), \
+                patch("pykrx.website.comm.webio.Post.read",
+                      side_effect=responses):
+            chunks = list(stock.iter_market_ohlcv_by_date(
+                "20180101", "20201231", "005930"))
+        self.assertEqual(len(chunks), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx.website.krx import throttle
+from pykrx.website.krx.krxio import KrxWebIo
+from pykrx.website.krx.throttle import (
+    AdaptiveConcurrencyLimiter, RequestDispatcher, get_request_priority,
+    request_priority
+)
+
+
+class _DummyIo(KrxWebIo):
+    @property
+    def bld(self):
+        return "dummy"
+
+    def fetch(self, **params):
+        return self.read(**params)
+
+
+def _drain(dispatcher):
+    # 처음 채워진 토큰을 모두 소비한다
+    while dispatcher._shared.tokens >= 1 or dispatcher._reserved.tokens >= 1:
+        dispatcher.acquire("high", timeout=0)
+
+
+class RequestDispatcherTest(unittest.TestCase):
+    def _race(self, dispatcher, priorities, delay=0.0):
+        order = []
+        lock = threading.Lock()
+
+        def worker(p):
+            dispatcher.acquire(p)
+            with lock:
+                order.append(p)
+
+        threads = []
+        for p in priorities:
+            t = threading.Thread(target=worker, args=(p,))
+            t.start()
+            threads.append(t)
+            time.sleep(delay)
+        for t in threads:
+            t.join()
+        return order
+
+    def test_high_priority_goes_first(self):
+        dispatcher = RequestDispatcher(20, reserved_share=0)
+        _drain(dispatcher)
+        order = self._race(dispatcher, ["low"] * 4 + ["high"], delay=0.005)
+        self.assertLess(order.index("high"), 2)
+
+    def test_reserved_share_is_not_used_by_low(self):
+        dispatcher = RequestDispatcher(10, reserved_share=0.5)
+        _drain(dispatcher)
+        time.sleep(0.25)
+        dispatcher.acquire("low")
+        # 예약 몫의 토큰이 남아 있어도 low는 공유 몫이 찰 때까지 기다린다
+        started = time.monotonic()
+        dispatcher.acquire("low")
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        self.assertTrue(dispatcher.acquire("high", timeout=0.01))
+
+    def test_starving_request_is_promoted(self):
+        dispatcher = RequestDispatcher(10, reserved_share=0,
+                                       starvation_seconds=0.05)
+        _drain(dispatcher)
+        waiter = throttle._Waiter(2, 0)
+        waiter.since -= 0.12
+        self.assertEqual(dispatcher._effective_level(waiter, time.monotonic()), 0)
+
+    def test_timeout(self):
+        dispatcher = RequestDispatcher(1, reserved_share=0)
+        _drain(dispatcher)
+        self.assertFalse(dispatcher.acquire("normal", timeout=0.05))
+        self.assertEqual(dispatcher.pending(), {"high": 0, "normal": 0, "low": 0})
+
+    def test_priority_context(self):
+        self.assertEqual(get_request_priority(), "normal")
+        with request_priority("low"):
+            self.assertEqual(get_request_priority(), "low")
+        with self.assertRaises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+    def test_krx_requests_go_through_dispatcher(self):
+        dispatcher = MagicMock()
+        resp = MagicMock(status_code=200, text='{"output": []}',
+                         headers={"content-type": "application/json"})
+        throttle.set_request_dispatcher(dispatcher)
+        try:
+            with patch("pykrx.website.comm.webio.Post.read", return_value=resp):
+                _DummyIo().read()
+        finally:
+            throttle.set_request_dispatcher(None)
+        dispatcher.acquire.assert_called_once_with()
+
+
+def _resp(status_code=200, text='{"output": []}'):
+    return MagicMock(status_code=status_code, text=text,
+                     headers={"content-type": "application/json"})
+
+
+class AdaptiveConcurrencyTest(unittest.TestCase):
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(2, max_limit=4)
+        for _ in range(2):
+            limiter.acquire()
+            limiter.release("success", 0.1)
+        # limit개의 요청이 성공할 때마다 대략 1씩 늘어난다
+        self.assertEqual(limiter.limit, 2)
+        for _ in range(6):
+            limiter.acquire()
+            limiter.release("success", 0.1)
+        self.assertEqual(limiter.limit, 4)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release("success", 0.1)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_slow_responses_hold_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(2, latency_target=0.5)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release("success", 3.0)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        limiter = AdaptiveConcurrencyLimiter(16, cooldown_seconds=60)
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release("blocked")
+        self.assertEqual(limiter.limit, 8)
+        self.assertEqual(limiter.snapshot()["blocks"], 3)
+
+        limiter.cooldown_seconds = 0
+        limiter.acquire()
+        limiter.release("blocked")
+        self.assertEqual(limiter.limit, 4)
+
+    def test_limit_bounds_inflight(self):
+        limiter = AdaptiveConcurrencyLimiter(1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        limiter.release("success")
+        self.assertTrue(limiter.acquire(timeout=0.01))
+
+    def test_krx_responses_drive_limiter(self):
+        limiter = AdaptiveConcurrencyLimiter(8, cooldown_seconds=0)
+        throttle.set_concurrency_limiter(limiter)
+        try:
+            for resp in (_resp(403), _resp(text="<html>blocked</html>"),
+                         _resp(text="LOGOUT")):
+                with patch("pykrx.website.comm.webio.Post.read",
+                           return_value=resp):
+                    _DummyIo()._send()
+            with patch("pykrx.website.comm.webio.Post.read",
+                       side_effect=ConnectionError):
+                with self.assertRaises(ConnectionError):
+                    _DummyIo()._send()
+        finally:
+            throttle.set_concurrency_limiter(None)
+
+        snapshot = limiter.snapshot()
+        self.assertEqual(snapshot["limit"], 1)
+        self.assertEqual(snapshot["blocks"], 3)
+        self.assertEqual(snapshot["errors"], 1)
+        self.assertEqual(snapshot["inflight"], 0)
+
+
+class DispatcherWithLimiterTest(unittest.TestCase):
+    def test_low_requests_do_not_hold_slots_while_waiting_for_tokens(self):
+        dispatcher = RequestDispatcher(2, reserved_share=0.5)
+        while dispatcher._shared.tokens >= 1:
+            dispatcher.acquire("low", timeout=0)
+        limiter = AdaptiveConcurrencyLimiter(1, max_limit=1)
+        throttle.set_request_dispatcher(dispatcher)
+        throttle.set_concurrency_limiter(limiter)
+        self.addCleanup(throttle.set_request_dispatcher, None)
+        self.addCleanup(throttle.set_concurrency_limiter, None)
+
+        def send(priority, waits=None):
+            started = time.monotonic()
+            with request_priority(priority), throttle.request_slot():
+                if waits is not None:
+                    waits.append(time.monotonic() - started)
+                time.sleep(0.01)
+
+        lows = [threading.Thread(target=send, args=("low",)) for _ in range(3)]
+        for t in lows:
+            t.start()
+        time.sleep(0.05)
+        waits = []
+        send("high", waits)
+        # high는 예약 몫의 토큰으로 바로 보낸다 (low는 공유 몫을 1초에 하나씩 기다린다)
+        self.assertLess(waits[0], 0.5)
+        for t in lows:
+            t.join()
+        self.assertEqual(limiter.snapshot()["inflight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
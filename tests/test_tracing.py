@@ -0,0 +1,177 @@
+import datetime
+import inspect
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from pykrx import stock
+from pykrx.website.comm import tracing
+from pykrx.website.comm.tracing import InMemorySpanExporter, traced
+from pykrx.website.comm.webio import use_http_session
+from pykrx.website.krx.krxio import KrxWebIo
+from pykrx.website.krx.market import core, wrap
+
+
+class 전종목시세(KrxWebIo):
+    @property
+    def bld(self):
+        return "dbms/MDC/STAT/standard/MDCSTAT01501"
+
+    def fetch(self, trdDd: str):
+        return self.read(trdDd=trdDd)["output"]
+
+
+@traced("wrap")
+def _snapshots(dates):
+    return [전종목시세().fetch(d) for d in dates]
+
+
+@traced("api")
+def _price_change(fromdate, todate):
+    return _snapshots([fromdate, "20240103", todate])
+
+
+@traced("api")
+def _iter_snapshots(dates):
+    for d in dates:
+        yield 전종목시세().fetch(d)
+
+
+@traced("api")
+def _describe(*args, **kwargs):
+    return None
+
+
+def _session():
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.json.return_value = {"output": []}
+    session = MagicMock()
+    session.post.return_value = resp
+    return session
+
+
+class TracingTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(tracing.set_span_exporter, None)
+
+    def test_noop_by_default(self):
+        self.assertIsNone(tracing.get_span_exporter())
+        with tracing.span("noop", layer="api") as span:
+            span.set_attribute("k", "v")
+            self.assertIsNone(tracing.get_current_span())
+        with use_http_session(_session()):
+            self.assertEqual(_price_change("20240102", "20240104"),
+                             [[], [], []])
+
+    def test_nested_layers(self):
+        exporter = tracing.enable_tracing()
+        with use_http_session(_session()):
+            _price_change("20240102", "20240104")
+
+        root, = exporter.roots()
+        self.assertEqual(root.name, "_price_change")
+        self.assertEqual(root.attributes["pykrx.args"], "'20240102', '20240104'")
+        layers = []
+        span = root
+        while span is not None:
+            layers.append(span.attributes["pykrx.layer"])
+            children = exporter.children(span)
+            span = children[0] if children else None
+        self.assertEqual(layers, ["api", "wrap", "core", "window", "http"])
+
+        window = exporter.find(layer="window")[0]
+        self.assertEqual(window.attributes["pykrx.bld"],
+                         "dbms/MDC/STAT/standard/MDCSTAT01501")
+        self.assertFalse(window.attributes["pykrx.cache_hit"])
+        http = exporter.find(layer="http")[0]
+        self.assertEqual((http.kind, http.attributes["http.request.method"],
+                          http.attributes["http.response.status_code"]),
+                         ("CLIENT", "POST", 200))
+        self.assertEqual({s.trace_id for s in exporter.spans}, {root.trace_id})
+        self.assertIn("    전종목시세.fetch [core]", exporter.format_tree())
+
+    def test_fan_out(self):
+        exporter = tracing.enable_tracing()
+        with use_http_session(_session()):
+            _price_change("20240102", "20240104")
+
+        report = exporter.fan_out(min_count=3)
+        self.assertEqual([(r["parent"], r["child"], r["count"]) for r in report],
+                         [("_snapshots", "전종목시세.fetch", 3)])
+
+    def test_errors(self):
+        exporter = tracing.enable_tracing()
+        session = _session()
+        session.post.side_effect = ConnectionError("reset")
+        with use_http_session(session), self.assertRaises(ConnectionError):
+            _price_change("20240102", "20240104")
+
+        self.assertTrue(all(s.status == "ERROR" for s in exporter.spans))
+        data = exporter.roots()[0].to_dict()
+        self.assertEqual(data["attributes"]["exception.type"], "ConnectionError")
+        self.assertEqual((len(data["context"]["trace_id"]),
+                          len(data["context"]["span_id"])), (32, 16))
+
+    def test_maxlen(self):
+        exporter = tracing.enable_tracing(InMemorySpanExporter(maxlen=2))
+        for name in ("a", "b", "c"):
+            with tracing.span(name):
+                pass
+        self.assertEqual([s.name for s in exporter.spans], ["b", "c"])
+
+    def test_public_modules_are_instrumented(self):
+        self.assertTrue(stock.get_market_price_change_by_ticker.__traced__)
+        self.assertTrue(wrap.get_market_ohlcv_by_ticker.__traced__)
+        self.assertTrue(core.전종목시세.fetch.__traced__)
+        # generator 함수도 generator 그대로 감싼다
+        self.assertTrue(stock.iter_market_ohlcv_by_date.__traced__)
+        self.assertTrue(
+            inspect.isgeneratorfunction(stock.iter_market_ohlcv_by_date))
+
+    def test_generator_span_covers_iteration(self):
+        exporter = tracing.enable_tracing()
+        with use_http_session(_session()):
+            items = []
+            for item in _iter_snapshots(["20240102", "20240103"]):
+                # 반복 사이에 호출한 함수는 generator의 하위 span이 아니다
+                with tracing.span("consumer"):
+                    items.append(item)
+
+        self.assertEqual(items, [[], []])
+        root = exporter.find(name="_iter_snapshots")[0]
+        self.assertEqual(root.status, "OK")
+        self.assertEqual(root.attributes["pykrx.layer"], "api")
+        self.assertEqual([c.name for c in exporter.children(root)],
+                         ["전종목시세.fetch", "전종목시세.fetch"])
+        for consumer in exporter.find(name="consumer"):
+            self.assertIsNone(consumer.parent_id)
+            self.assertLess(root.start_time, consumer.start_time)
+            self.assertGreater(root.end_time, consumer.end_time)
+
+    def test_generator_closed_early(self):
+        exporter = tracing.enable_tracing()
+        with use_http_session(_session()):
+            gen = _iter_snapshots(["20240102", "20240103"])
+            next(gen)
+            gen.close()
+
+        root = exporter.find(name="_iter_snapshots")[0]
+        self.assertEqual(root.status, "OK")
+        self.assertEqual(len(exporter.children(root)), 1)
+        self.assertIsNone(tracing.get_current_span())
+
+    def test_only_scalar_args_are_formatted(self):
+        exporter = tracing.enable_tracing()
+        _describe(pd.DataFrame({"a": range(1000)}), "20240102", 3,
+                  tickers=["005930"], date=datetime.date(2024, 1, 2))
+
+        self.assertEqual(exporter.spans[0].attributes["pykrx.args"],
+                         "<DataFrame>, '20240102', 3, tickers=<list>, "
+                         "date=datetime.date(2024, 1, 2)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pykrx import __main__ as cli
+from pykrx import stock, warmup
+from pykrx.batch import BatchResult
+from pykrx.website.krx import cache as cache_mod
+from pykrx.website.comm.webio import use_http_session
+from pykrx.website.krx.cache import set_response_cache
+
+
+def _results(calls, failed=()):
+    results = []
+    for spec in calls:
+        r = BatchResult(spec)
+        if spec[0] in failed:
+            r.error = RuntimeError("blocked")
+        results.append(r)
+    return results
+
+
+def _ohlcv_session():
+    row = {"ISU_SRT_CD": "005930", "TDD_OPNPRC": "70,000",
+           "TDD_HGPRC": "71,000", "TDD_LWPRC": "69,000",
+           "TDD_CLSPRC": "70,500", "ACC_TRDVOL": "1,000",
+           "ACC_TRDVAL": "70,500,000", "FLUC_RT": "0.5",
+           "MKTCAP": "1,000,000"}
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {"content-type": "application/json"}
+    resp.text = ""
+    resp.json.return_value = {"OutBlock_1": [row], "output": [row]}
+    session = MagicMock()
+    session.post.return_value = resp
+    return session
+
+
+class WarmupTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+        self.addCleanup(set_response_cache, None)
+
+    def test_make_calls(self):
+        calls = warmup.make_calls(["ohlcv", "shorting", "etf"], "20240105",
+                                  markets=["KOSPI", "ALL"])
+        self.assertEqual(calls, [
+            ("get_market_ohlcv_by_ticker", "20240105", "KOSPI"),
+            ("get_market_ohlcv_by_ticker", "20240105", "ALL"),
+            ("get_shorting_volume_by_ticker", "20240105", "KOSPI"),
+            ("get_etf_ohlcv_by_ticker", "20240105"),
+        ])
+        with self.assertRaises(ValueError):
+            warmup.make_calls(["nav"], "20240105")
+
+    def test_previous_trading_day(self):
+        with patch.object(warmup.stock, "get_nearest_business_day_in_a_week",
+                          return_value="20240105") as mnearest:
+            self.assertEqual(warmup.previous_trading_day("20240108"), "20240105")
+        mnearest.assert_called_once_with("20240107", prev=True)
+
+    def test_run_fills_given_cache(self):
+        with patch.object(warmup.batch, "run",
+                          side_effect=lambda calls, **kw: _results(
+                              calls, failed={"get_market_cap_by_ticker"})) \
+                as mrun:
+            summary = warmup.run(["ohlcv", "cap"], "20240105", cache=self.path,
+                                 max_workers=16, rate=5)
+
+        self.assertEqual(mrun.call_args.kwargs["max_workers"], 16)
+        self.assertEqual(str(cache_mod.get_response_cache().path), self.path)
+        self.assertEqual((summary["date"], summary["calls"], summary["ok"]),
+                         ("20240105", 4, 2))
+        self.assertEqual(len(summary["failed"]), 2)
+        self.assertIn("hit_ratio", summary["cache"])
+
+    def test_warmed_snapshot_is_used_hours_later(self):
+        yesterday = (datetime.date.today() -
+                     datetime.timedelta(days=1)).strftime("%Y%m%d")
+        with use_http_session(_ohlcv_session()):
+            summary = warmup.run(["ohlcv"], yesterday, markets=["KOSPI"],
+                                 cache=self.path)
+        self.assertEqual(summary["ok"], 1)
+
+        # warmup 두 시간 뒤에 시작한 작업은 KRX에 요청하지 않는다
+        offline = MagicMock()
+        offline.post.side_effect = ConnectionError("offline")
+        later = time.time() + 2 * 3600
+        with use_http_session(offline), \
+                patch.object(cache_mod.time, "time", return_value=later):
+            df = stock.get_market_ohlcv_by_ticker(yesterday)
+        self.assertEqual(df.loc["005930", "종가"], 70500)
+        offline.post.assert_not_called()
+
+    def test_cli(self):
+        summary = {"failed": [], "date": "20240105"}
+        with patch.object(warmup, "run", return_value=summary) as mrun, \
+                patch("builtins.print"):
+            code = cli.main(["warmup", "--datasets", "ohlcv, cap",
+                             "--date", "20240105", "--cache", self.path,
+                             "--workers", "4"])
+        self.assertEqual(code, 0)
+        args, kwargs = mrun.call_args
+        self.assertEqual(args, (["ohlcv", "cap"], "20240105"))
+        self.assertEqual(kwargs["markets"], ["KOSPI", "KOSDAQ"])
+        self.assertEqual(kwargs["max_workers"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()